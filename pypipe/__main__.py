@@ -1,7 +1,101 @@
 import sys
+import json
+import asyncio
 import argparse
+from itertools import islice
 
-from pypipe.core.pipeline.pipeline import Pipeline
+
+def serve(argv) -> None:
+    """
+    Pypipe pipeline server CLI.
+    
+    Keeps a pipeline and its loaded processes warm, and processes normalize 
+    and featurize requests read as JSON lines from a Unix socket or from 
+    stdin (see 'PipelineServer').
+    
+    Usage:
+    python -m pypipe serve <config_alias or config_path> [--socket <path>] 
+                [--workers <n>] [--max-pending <n>]
+    
+    args:
+        <config_alias or config_path>: Alias of configuration file or path to 
+            configuration file.
+        
+        --socket <path>: Path of the Unix socket to listen on. If not given, 
+            requests are read from stdin and responses written to stdout.
+        
+        --workers <n>: Number of threads where the processes run.
+        
+        --max-pending <n>: Maximum number of requests being processed.
+    """
+    from pypipe.core.pipeline.pipeline import Pipeline
+    from pypipe.core.pipeline.server import PipelineServer
+    
+    parser = argparse.ArgumentParser(prog="pypipe serve", description="Pipeline server")
+    parser.add_argument("config", help="Alias of configuration file or path to configuration file")
+    parser.add_argument("--socket", default=None, help="Path of the Unix socket to listen on (stdin/stdout if not given)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of threads where the processes run")
+    parser.add_argument("--max-pending", type=int, default=1024, help="Maximum number of requests being processed")
+    args = parser.parse_args(argv)
+    
+    server = PipelineServer(
+        Pipeline(args.config), 
+        workers=args.workers, 
+        max_pending=args.max_pending
+    )
+    try:
+        if args.socket is None:
+            asyncio.run(server.serve_stdio())
+        else:
+            asyncio.run(server.serve_unix_socket(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+def client(argv) -> None:
+    """
+    Pypipe pipeline thin client CLI.
+    
+    Sends the texts of a data file (or stdin), one per line, in batches to 
+    a pipeline server, and writes the result of each batch as a JSON line 
+    to stdout. It doesn't import the pipeline processes, so it starts fast.
+    
+    Usage:
+    python -m pypipe client --socket <path> [--method normalize|featurize] 
+                [--data <path_to_data>] [--batch-size <n>] [--stages <alias> ...]
+    
+    args:
+        --socket <path>: Path of the Unix socket of the server.
+        
+        --method: 'normalize' or 'featurize'.
+        
+        --data <path_to_data>: Path to data corpus file. If not given, texts 
+            are read from stdin.
+        
+        --batch-size <n>: Number of texts per request.
+        
+        --stages <alias> ...: Aliases of the stages whose outputs are returned.
+    """
+    from pypipe.core.pipeline.client import PipelineClient
+    
+    parser = argparse.ArgumentParser(prog="pypipe client", description="Pipeline client")
+    parser.add_argument("--socket", required=True, help="Path of the Unix socket of the server")
+    parser.add_argument("--method", choices=("normalize", "featurize"), default="featurize", help="Request method")
+    parser.add_argument("--data", "-d", default=None, help="Path to data file (stdin if not given)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Number of texts per request")
+    parser.add_argument("--stages", nargs="+", default=None, help="Aliases of the stages whose outputs are returned")
+    args = parser.parse_args(argv)
+    
+    lines = open(args.data, encoding="utf-8") if args.data else sys.stdin
+    texts = (line.rstrip("\r\n") for line in lines)
+    batches = iter(lambda: list(islice(texts, args.batch_size)), [])
+    try:
+        with PipelineClient(args.socket) as pipeline_client:
+            for result in pipeline_client.request_batches(args.method, batches, stages=args.stages):
+                sys.stdout.write(json.dumps(result) + "\n")
+    finally:
+        if args.data:
+            lines.close()
 
 
 def main() -> None:
@@ -12,8 +106,10 @@ def main() -> None:
     specified or sequentially pipeline processes.
 
     Usage:
+    python -m pypipe serve ... (see 'serve')
+    python -m pypipe client ... (see 'client')
     python -m pypipe <config_alias or config_path> [--data <path_to_data>] [--store] 
-                [--process <alias_of_pipeline_process> --method <method_to_execute>] 
+                [--dag | --concurrent] [--process <alias_of_pipeline_process> --method <method_to_execute>] 
 
     args:
         <config_alias or config_path>: Alias of configuration file or path to 
@@ -23,6 +119,13 @@ def main() -> None:
         
         --store: Persist output of each process.
         
+        --dag: Run the pipeline processes as a graph, where the normalized 
+            data corpus is shared by all the featurizers.
+        
+        --concurrent: Run the pipeline processes sequentially, but with 
+            reading and each normalizer in its own worker thread, 
+            connected by bounded queues.
+        
         --process <alias_of_pipeline_process>: Alias of the pipeline process 
             to run.
             
@@ -32,10 +135,19 @@ def main() -> None:
     Returns:
         None
     """    
+    if sys.argv[1:2] == ["serve"]:
+        return serve(sys.argv[2:])
+    if sys.argv[1:2] == ["client"]:
+        return client(sys.argv[2:])
+    
+    from pypipe.core.pipeline.pipeline import Pipeline
+    
     parser = argparse.ArgumentParser(description="Pipeline CLI")
     parser.add_argument("config",help="Alias of configuration file or path to configuration file")
     parser.add_argument("--data", "-d", default=None, help="Path to data file")
     parser.add_argument("--store", "-s", action="store_true", help="Persist output of each process")
+    parser.add_argument("--dag", action="store_true", help="Run processes as a graph that shares the normalized data corpus among featurizers")
+    parser.add_argument("--concurrent", action="store_true", help="Run reading and normalizers in worker threads connected by bounded queues")
     parser.add_argument("--process", "-p", help="Alias of the pipeline process to run")
     parser.add_argument("--method", "-m", required="--process" in sys.argv, help="Method to execute for the specified pipeline process")
     args = parser.parse_args()
@@ -48,6 +160,10 @@ def main() -> None:
             getattr(process, args.method)(data=args.data, persist=args.store)
         except TypeError:
             getattr(process, args.method)(data=args.data)
+    elif args.dag:
+        pipeline.run_processes_as_dag(persist=args.store)
+    elif args.concurrent:
+        pipeline.run_processes_concurrently(persist=args.store)
     else:
         pipeline.run_processes_sequentially(persist=args.store)
 
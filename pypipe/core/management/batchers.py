@@ -0,0 +1,230 @@
+"""
+The module groups batchers used by processes to serve asyncio requests.
+"""
+from __future__ import annotations
+from typing import (
+    List,
+    Set,
+    Dict,
+    Tuple,
+    Any,
+    Union,
+    Optional,
+    Callable,
+    Iterable,
+    Sequence,
+    AsyncIterable,
+    AsyncGenerator
+)
+
+import uuid
+import pickle
+import asyncio
+from itertools import chain
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+
+# State of each worker process built by 'WorkerState', by key. Only the 
+# most recent states are kept, since long-lived workers receive a new 
+# state each time a process is retrained.
+_worker_states: Dict[str, Any] = OrderedDict()
+_max_worker_states = 16
+
+
+async def achunk_iterable(
+    data: AsyncIterable,
+    chunk_size: int
+) -> AsyncGenerator[List, None]:
+    """
+    Lazily splits the given async iterable into lists of at most
+    'chunk_size' consecutive elements, keeping their original order.
+    """
+    chunk = []
+    async for element in data:
+        chunk.append(element)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def concat_lists(outputs: List[List]) -> List:
+    """Concatenates the lists returned by a batch function."""
+    return list(chain.from_iterable(outputs))
+
+
+def check_if_executor_uses_processes(executor: Optional[Executor]) -> bool:
+    """Checks if the executor runs the batch functions in worker processes, 
+    so they must be picklable."""
+    return isinstance(executor, ProcessPoolExecutor)
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _load_worker_state(key: str, payload: bytes) -> Any:
+    """Returns the state of the key, built from the payload the first time 
+    the key is received by the worker process."""
+    if key in _worker_states:
+        _worker_states.move_to_end(key)
+    else:
+        factory, args = pickle.loads(payload)
+        _worker_states[key] = factory(*args)
+        if len(_worker_states) > _max_worker_states:
+            _worker_states.popitem(last=False)
+    return _worker_states[key]
+
+
+class WorkerState:
+    """
+    Picklable recipe of the state of a batch function run in a process 
+    pool executor, e.g. a trained model. 
+    
+    Batch functions can't be bound methods of processes, since pickling 
+    them pickles the whole process with its micro-batcher. Instead, a 
+    module-level function is given the WorkerState (e.g. by 
+    'functools.partial'), that is unpickled into the state: 'factory(*args)' 
+    is pickled once, and built once per worker process. 
+    """
+    def __init__(self, factory: Callable[..., Any], *args: Any) -> None:
+        """
+        Builds a WorkerState object.
+
+        args:
+            factory: Picklable function that builds the state in a worker 
+                process, e.g. a function that loads a model from a path.
+            args: Picklable arguments of the factory.
+        """
+        self.key = uuid.uuid4().hex
+        self._payload = pickle.dumps((factory, args), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def of(cls, obj: Any) -> WorkerState:
+        """Returns the WorkerState of a picklable object."""
+        return cls(_identity, obj)
+
+    def __reduce__(self) -> Tuple[Callable[[str, bytes], Any], Tuple[str, bytes]]:
+        return _load_worker_state, (self.key, self._payload)
+
+
+class AsyncMicroBatcher:
+    """
+    Groups the inputs of concurrent asyncio requests into micro-batches,
+    each processed by a single call of a batch function in an executor.
+    So the event loop is never blocked by the processing, and the
+    per-call overhead is paid once per micro-batch and not once per
+    request.
+
+    A micro-batch is processed when it reaches 'max_batch_size' elements,
+    or 'max_delay' seconds after its first request, whichever happens
+    first. The batch function must return one output per input element
+    in a sliceable object (e.g. a list, a numpy array or a scipy sparse
+    matrix), which is sliced back into the output of each request.
+    """
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        concat: Callable[[List[Sequence[Any]]], Sequence[Any]] = concat_lists,
+        executor: Optional[Executor] = None,
+        max_batch_size: int = 10000,
+        max_delay: float = 0.002
+    ) -> None:
+        """
+        Builds an AsyncMicroBatcher object.
+
+        args:
+            fn: Batch function, that takes a list of elements and returns
+                one output per element.
+            concat: Function that concatenates the outputs of 'fn' for the
+                chunks of an async iterable. Defaults to 'concat_lists'.
+            executor: Executor where 'fn' runs. If None, the default
+                executor of the event loop is used. Defaults to None.
+            max_batch_size: Number of elements that makes a micro-batch
+                be processed without waiting for 'max_delay'. Defaults to
+                10000.
+            max_delay: Maximum number of seconds a request waits for other
+                requests to be grouped with. Defaults to 0.002.
+        """
+        self._fn = fn
+        self._concat = concat
+        self._executor = executor
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+
+        self._pending: List[Tuple[List[Any], asyncio.Future]] = []
+        self._n_pending = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, data: Union[Iterable, AsyncIterable]) -> Sequence[Any]:
+        """
+        Returns the output of the batch function for the elements of the
+        data, processed together with the elements of other concurrent
+        requests.
+
+        args:
+            data: Iterable or async iterable of elements. Async iterables
+                are submitted in chunks of 'max_batch_size' elements as
+                they are read.
+        """
+        if not isinstance(data, AsyncIterable):
+            return await self._submit_chunk(list(data))
+
+        chunks = [
+            asyncio.ensure_future(self._submit_chunk(chunk))
+            async for chunk in achunk_iterable(data, self._max_batch_size)
+        ]
+        if not chunks:
+            return await self._submit_chunk([])
+        return self._concat(await asyncio.gather(*chunks))
+
+    async def _submit_chunk(self, chunk: List[Any]) -> Sequence[Any]:
+        """Adds the chunk to the pending micro-batch and waits for its
+        output."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((chunk, future))
+        self._n_pending += len(chunk)
+
+        if self._n_pending >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Processes the pending micro-batch in a new task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending, self._n_pending = self._pending, [], 0
+        if pending:
+            task = asyncio.ensure_future(self._process_batch(pending))
+            # the event loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process_batch(self, pending: List[Tuple[List[Any], asyncio.Future]]) -> None:
+        """Runs the batch function in the executor over the concatenated
+        chunks, and sets the output (or the exception raised) of each
+        request. Requests that were cancelled are skipped."""
+        batch = [element for chunk, _ in pending for element in chunk]
+        loop = asyncio.get_running_loop()
+        try:
+            outputs = await loop.run_in_executor(self._executor, self._fn, batch)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for chunk, future in pending:
+            end = start + len(chunk)
+            if not future.done():
+                future.set_result(outputs[start:end])
+            start = end
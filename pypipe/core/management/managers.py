@@ -7,6 +7,7 @@ from types import GeneratorType
 from typing import (
     List, 
     Dict, 
+    Tuple,
     Any, 
     Union, 
     Optional, 
@@ -15,10 +16,27 @@ from typing import (
     Generator
 )
 
+import os
+import glob
+import json
+import shutil
+import hashlib
 import logging
+import tempfile
+from itertools import chain, filterfalse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from omegaconf import OmegaConf, DictConfig
 
 from pypipe import settings
 from pypipe.core.processes import utils
+from pypipe.core.management.readers import (
+    MmapLineReader, 
+    LineOffsetIndex, 
+    CompressedLineReader
+)
 from pypipe.core.processes.normalization.norm_utils import (
     punctuaction_handler, 
     lowercase_diacritic_handler
@@ -38,16 +56,37 @@ class DataLazyManager:
     but rather reads them upon first access, meaning you might 
     experience some delay for initial loading time when accessing 
     data corpus elements.
+    
+    File data corpora support 'len()', indexing and slicing through 
+    a line offset index persisted next to the file (see 
+    'LineOffsetIndex'), which is built on first use and reused while 
+    the file doesn't change.
+    
+    Files compressed with gzip ('.gz'), bzip2 ('.bz2'), xz ('.xz') or 
+    zstd ('.zst') are decompressed on the fly (see 
+    'CompressedLineReader'), but can only be read sequentially.
     """
-    def __init__(self, data: Union[List[str], str]) -> None:
+    def __init__(
+        self, 
+        data: Union[List[str], str],
+        byte_range: Tuple[int, int] = None
+    ) -> None:
         """
         Returns a DataLazyManager object.
         
+        Files are read through a memory map in blocks of lines (see 
+        'MmapLineReader').
+        
         args:
             data: lists of strings or path to files containing 
                 the data corpus.
+            byte_range: If data is a path, restricts the data corpus 
+                to the lines that start in the (start, end) byte range 
+                of the file. Defaults to None.
         """
         self._data = data
+        self._byte_range = byte_range
+        self._line_index: LineOffsetIndex = None
         
     def __iter__(self) -> Generator:
         """
@@ -71,6 +110,169 @@ class DataLazyManager:
         
         yield from generator
         
+    def __getstate__(self) -> Dict[str, Any]:
+        """The line offset index is not pickled, since it can be 
+        memory-mapped; it is loaded again when needed."""
+        state = self.__dict__.copy()
+        state["_line_index"] = None
+        return state
+    
+    def __len__(self) -> int:
+        """Returns the number of elements of the data corpus. File data 
+        corpora are counted through their line offset index."""
+        if isinstance(self._data, str) and not CompressedLineReader.supports(self._data):
+            first, last = self._get_line_span()
+            return last - first
+        if isinstance(self._data, list):
+            return len(self._data)
+        raise TypeError(
+            f"Length is not supported by a DataLazyManager of {type(self._data)}"
+        )
+    
+    def __getitem__(
+        self, 
+        key: Union[int, slice]
+    ) -> Union[str, List[str], DataLazyManager]:
+        """
+        Returns the element at the given position of the data corpus. 
+        Contiguous slices return a DataLazyManager object over the 
+        sliced elements (a byte range for file data corpora), so they 
+        can be used as shards; other slices return a list.
+        """
+        if isinstance(self._data, list):
+            if isinstance(key, slice):
+                return DataLazyManager(self._data[key])
+            return self._data[key]
+        
+        if not isinstance(self._data, str):
+            raise TypeError(
+                f"Indexing is not supported by a DataLazyManager of {type(self._data)}"
+            )
+        
+        index = self._get_line_index()
+        first, last = self._get_line_span()
+        
+        if isinstance(key, slice):
+            start, stop, step = key.indices(last - first)
+            if step != 1:
+                return [
+                    index.read_line(first + i) for i in range(start, stop, step)
+                ]
+            stop = max(start, stop)
+            return DataLazyManager(
+                self._data,
+                byte_range=(
+                    index.byte_offset(first + start), 
+                    index.byte_offset(first + stop)
+                )
+            )
+        
+        if key < 0:
+            key += last - first
+        if not 0 <= key < last - first:
+            raise IndexError("DataLazyManager index out of range")
+        return index.read_line(first + key)
+    
+    def _check_if_data_is_seekable(self) -> None:
+        """Raises ValueError if the data corpus is a compressed file, 
+        which can only be read sequentially."""
+        if CompressedLineReader.supports(self._data):
+            raise ValueError(
+                f"Compressed data corpus '{self._data}' can only be read "
+                f"sequentially"
+            )
+    
+    def _get_line_index(self) -> LineOffsetIndex:
+        """Returns the line offset index of the file data corpus, loading 
+        or building it on first use."""
+        self._check_if_data_is_seekable()
+        if self._line_index is None:
+            self._line_index = LineOffsetIndex.load_or_build(self._data)
+        return self._line_index
+    
+    def _get_line_span(self) -> Tuple[int, int]:
+        """Returns the numbers of the first line and one past the last line 
+        of the file data corpus that belong to its byte range."""
+        index = self._get_line_index()
+        if self._byte_range is None:
+            return 0, len(index)
+        start, end = self._byte_range
+        return index.line_number(start), index.line_number(end)
+    
+    def get_file_path(self) -> Optional[str]:
+        """Returns the path of the data corpus if it is a whole uncompressed 
+        file, that can be read directly by other tools, or None otherwise."""
+        if (
+            isinstance(self._data, str) 
+            and self._byte_range is None 
+            and not CompressedLineReader.supports(self._data)
+        ):
+            return self._data
+        return None
+    
+    def check_if_can_be_reread(self) -> bool:
+        """Checks if the data corpus can be iterated more than once, i.e. 
+        it is not a generator."""
+        return not isinstance(self._data, GeneratorType)
+    
+    def split(self, n: int) -> List[DataLazyManager]:
+        """
+        Splits a file data corpus into 'n' DataLazyManager objects over 
+        byte ranges of similar size, that together yield every line once. 
+        The file is not read to find the ranges, so each part can be 
+        read by a different worker.
+        
+        args:
+            n: Number of parts.
+        """
+        if not isinstance(self._data, str):
+            raise ValueError(
+                f"Only file data corpus can be split. Received {type(self._data)}"
+            )
+        self._check_if_data_is_seekable()
+        
+        start, end = 0, None
+        if self._byte_range is not None:
+            start, end = self._byte_range
+        
+        ranges = MmapLineReader.split_ranges(self._data, n, start=start, end=end)
+        
+        return [DataLazyManager(self._data, byte_range=r) for r in ranges]
+    
+    def iter_batches(self, batch_size: int = 1000) -> Generator[List[str], None, None]:
+        """
+        Yields the data corpus as lists of at most 'batch_size' consecutive 
+        elements. Files are decoded in blocks by their reader, so lines are 
+        not yielded one by one.
+        
+        args:
+            batch_size: Maximum number of elements per batch. Defaults 
+                to 1000.
+        """
+        if isinstance(self._data, list):
+            for i in range(0, len(self._data), batch_size):
+                yield self._data[i:i + batch_size]
+        elif isinstance(self._data, str):
+            yield from utils.chunk_iterable(
+                chain.from_iterable(self._get_file_reader().iter_batches()), 
+                batch_size
+            )
+        else:
+            yield from utils.chunk_iterable(self, batch_size)
+    
+    def _get_file_reader(self) -> Union[MmapLineReader, CompressedLineReader]:
+        """Returns the reader of the file data corpus, according to its 
+        extension and byte range."""
+        if CompressedLineReader.supports(self._data):
+            if self._byte_range is not None:
+                self._check_if_data_is_seekable()
+            return CompressedLineReader(self._data)
+        
+        start, end = 0, None
+        if self._byte_range is not None:
+            start, end = self._byte_range
+        return MmapLineReader(self._data, start=start, end=end)
+    
     def _yield_data_from_list(self) -> Generator:
         """Yields over data corpus list."""
         for line in self._data:
@@ -78,14 +280,23 @@ class DataLazyManager:
     
     def _yield_data_from_file(self) -> Generator:
         """Yields over data corpus static file."""
-        with open(self._data, "r") as f:
-            for line in f:
-                yield line.strip()
+        yield from self._get_file_reader()
 
 
 class VocabularyManager:
-    """Class to process text and extract vocabulary for mapping 
-    by implementing standard int2text-text2int bijection."""
+    """
+    Class to process text and extract vocabulary for mapping 
+    by implementing standard int2text-text2int bijection.
+    
+    The text2idx direction is the only hash map. The idx2text direction 
+    is dense (0..N-1), so it is kept as a list that references the same 
+    text objects used as keys, and it is persisted as a string table: 
+    one offsets array plus one UTF-8 buffer (see 'save' and 'load').
+    
+    Optionally, the number of times each text is added is counted in 
+    an array aligned with the indices, so the vocabulary can be pruned 
+    by frequency and used as a text-frequency dict.
+    """
     def __init__(
         self, 
         data: Union[List[str], str],
@@ -96,7 +307,10 @@ class VocabularyManager:
         diacritic: bool = False,
         lower_case: bool = False,
         norm_punct: bool = False,
-        data_iterator: Callable[[Union[List[str], str]], Iterable] = DataLazyManager
+        data_iterator: Callable[[Union[List[str], str]], Iterable] = DataLazyManager,
+        workers: int = 1,
+        count_freq: bool = False,
+        max_size: Optional[int] = None
         ) -> None:
         """
         Builds a VocabularyManager object.
@@ -124,8 +338,22 @@ class VocabularyManager:
                 to False.
             data_iterator: Object in charge of managing the lazy creation 
                 of a data generator. Defaults to DataLazyManager.
+            workers: Number of processes that build partial vocabularies 
+                from shards of the data corpus (lists and uncompressed 
+                files), which are then merged. Defaults to 1.
+            count_freq: Whether to count the frequency of each text. 
+                Defaults to False.
+            max_size: If 'count_freq' is True, maximum number of texts 
+                kept while the vocabulary is built. When it is exceeded, 
+                the least frequent texts are pruned, so their counts 
+                restart if they are added again. If None, the vocabulary 
+                is not pruned. Defaults to None.
         """
         self._data_iterator = data_iterator
+        self._workers = workers
+        
+        self._count_freq = count_freq
+        self._max_size = max_size
         
         self._data2sent = data2sent
         
@@ -137,10 +365,11 @@ class VocabularyManager:
             text2idx = {}
         self._text2idx = text2idx
 
-        self._idx2text = {
-            idx: text
-            for text, idx in self._text2idx.items()
-        }
+        self._idx2text = self._get_idx2text_from_text2idx(text2idx)
+        
+        self._counts = None
+        if count_freq:
+            self._counts = np.zeros(len(text2idx), dtype=np.int64)
         
         self._add_unk = add_unk
                 
@@ -156,6 +385,9 @@ class VocabularyManager:
                 
         if unk_text is not None:
             self.unk_idx = self.add_text(unk_text)
+            if count_freq:
+                # the unknown text is not part of the data corpus
+                self._counts[self.unk_idx] = 0
         
         self.__init_vocab_from_iterable(
             self._data_iterator(data)
@@ -175,11 +407,29 @@ class VocabularyManager:
         unique text in the vocabulary, it yields the text itself 
         or a list of individual tokens if '_data2sent' is True.
         """
-        for text in self._text2idx.keys():
+        for text in self._idx2text:
             if self._data2sent:
                 text = text.split()
             yield text
 
+    @staticmethod
+    def _get_idx2text_from_text2idx(text2idx: Dict[str, int]) -> List[str]:
+        """Returns the dense idx2text list of a text2idx mapping, whose 
+        indices must be 0..N-1."""
+        idx2text = list(text2idx)
+        if all(idx == i for i, idx in enumerate(text2idx.values())):
+            return idx2text
+        
+        idx2text = [None] * len(text2idx)
+        for text, idx in text2idx.items():
+            if not 0 <= idx < len(idx2text) or idx2text[idx] is not None:
+                raise ValueError(
+                    "Invalid text2idx mapping. Expected unique indices "
+                    f"from 0 to {len(text2idx) - 1} but {idx} was received"
+                )
+            idx2text[idx] = text
+        return idx2text
+
     def __init_vocab_from_iterable(
         self, 
         iterable: Iterable[List[str]]
@@ -194,14 +444,159 @@ class VocabularyManager:
         Args:
             iterable: Iterable with data corpus of texts.
         """
-        for text in iterable:
-            self.add_text(text)
+        if isinstance(iterable, DataLazyManager):
+            shards = self._get_shards(iterable, self._workers)
+            if len(shards) > 1:
+                self._merge_partial_vocabs(shards)
+            else:
+                for batch in iterable.iter_batches():
+                    self.add_texts(batch)
+        else:
+            for text in iterable:
+                self.add_text(text)
+
+    @staticmethod
+    def _get_shards(data: DataLazyManager, n: int) -> List[DataLazyManager]:
+        """Splits the data corpus into 'n' contiguous shards if it is a list 
+        or an uncompressed file, or returns it as the only shard otherwise."""
+        if n > 1:
+            if isinstance(data._data, list):
+                bounds = [len(data) * i // n for i in range(n + 1)]
+                return [data[i:j] for i, j in zip(bounds[:-1], bounds[1:])]
+            if isinstance(data._data, str) and not CompressedLineReader.supports(data._data):
+                return data.split(n)
+        return [data]
+    
+    def _get_configs(self) -> Dict[str, Any]:
+        """Returns the configurations that define how texts are stored."""
+        return {
+            "data2sent": self._data2sent,
+            "add_unk": self._add_unk,
+            "unk_text": self._unk_text,
+            "diacritic": self._diacritic,
+            "lower_case": self._lower_case,
+            "norm_punct": self._norm_punct,
+            "count_freq": self._count_freq,
+            "max_size": self._max_size
+        }
+    
+    def _merge_partial_vocabs(self, shards: List[DataLazyManager]) -> None:
+        """Builds a partial vocabulary from each shard in a worker process 
+        and merges them in shard order, so indices are the same as in a 
+        serial build."""
+        configs = self._get_configs()
+        configs.update({"add_unk": False, "unk_text": None})
+        
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            partial_vocabs = executor.map(
+                _build_partial_vocab, shards, [configs] * len(shards)
+            )
+            for partial_vocab in partial_vocabs:
+                self.merge(partial_vocab)
+    
+    def merge(self, other: VocabularyManager) -> VocabularyManager:
+        """
+        Adds the texts of other vocabulary that are not in this one, in 
+        the order of their indices in the other vocabulary, and returns 
+        this vocabulary. Texts are added as stored in the other vocabulary, 
+        without processing them again.
+        
+        Merging the vocabularies of consecutive shards of a data corpus, 
+        in order, gives the same indices as building the vocabulary of 
+        the whole data corpus.
+        
+        args:
+            other: Vocabulary whose texts will be added.
+        """
+        self._add_unique_texts(other._idx2text)
+        
+        if self._count_freq and other._count_freq:
+            self._add_counts(other._idx2text, other._counts[:len(other)])
+            self._prune_if_max_size_is_exceeded()
+        return self
+    
+    def _add_unique_texts(self, texts: Iterable[str]) -> None:
+        """Adds the texts that are not in the vocabulary, which must be 
+        unique, without processing them."""
+        new_texts = list(filterfalse(self._text2idx.__contains__, texts))
+        first_idx = len(self._text2idx)
+        self._text2idx.update(
+            zip(new_texts, range(first_idx, first_idx + len(new_texts)))
+        )
+        self._idx2text.extend(new_texts)
+        
+        if self._count_freq and len(self._counts) < len(self._idx2text):
+            # grows geometrically, the counts of the vocabulary are the 
+            # first len(self) items
+            counts = np.zeros(
+                max(len(self._idx2text), 2 * len(self._counts)), dtype=np.int64
+            )
+            counts[:len(self._counts)] = self._counts
+            self._counts = counts
+    
+    def _add_counts(self, texts: Iterable[str], counts: Iterable[int]) -> None:
+        """Adds the counts of the texts, which must be unique and present 
+        in the vocabulary."""
+        idxs = np.fromiter(map(self._text2idx.__getitem__, texts), dtype=np.int64)
+        self._counts[idxs] += np.fromiter(counts, dtype=np.int64, count=len(idxs))
+    
+    def _prune_if_max_size_is_exceeded(self) -> None:
+        """Prunes the least frequent texts if the vocabulary has more 
+        than 'max_size' texts."""
+        if self._max_size is not None and len(self) > self._max_size:
+            # leaves room so that the vocabulary is not pruned on each 
+            # new text
+            self.prune(top_k=self._max_size * 3 // 4)
+    
+    def prune(
+        self, 
+        min_count: Optional[int] = None, 
+        top_k: Optional[int] = None
+    ) -> None:
+        """
+        Removes the texts with a frequency lower than 'min_count' and then 
+        keeps the 'top_k' most frequent ones, breaking ties by first-seen 
+        order. The unknown text is always kept. The remaining texts are 
+        re-indexed in their first-seen order.
+        
+        args:
+            min_count: Minimum frequency of the texts to keep. If None, 
+                no text is removed by frequency. Defaults to None.
+            top_k: Maximum number of texts to keep, besides the unknown 
+                text. If None, all texts are kept. Defaults to None.
+        """
+        if not self._count_freq:
+            raise ValueError(
+                "Only vocabularies created with 'count_freq=True' can be pruned"
+            )
+        
+        counts = self._counts[:len(self)]
+        keep = np.ones(len(counts), dtype=bool)
+        if self.unk_idx >= 0:
+            keep[self.unk_idx] = False
+        
+        if min_count is not None:
+            keep &= counts >= min_count
+        if top_k is not None and np.count_nonzero(keep) > top_k:
+            candidates = np.flatnonzero(keep)
+            order = np.argsort(-counts[candidates], kind="stable")
+            keep[:] = False
+            keep[candidates[order[:top_k]]] = True
+        
+        if self.unk_idx >= 0:
+            keep[self.unk_idx] = True
+            self.unk_idx = int(np.count_nonzero(keep[:self.unk_idx]))
+        
+        kept_idxs = np.flatnonzero(keep)
+        self._idx2text = list(map(self._idx2text.__getitem__, kept_idxs.tolist()))
+        self._text2idx = dict(zip(self._idx2text, range(len(self._idx2text))))
+        self._counts = counts[kept_idxs]
 
-    def add_text(self, text: str) -> None:
+    def add_text(self, text: str) -> int:
         """
         Adds a new text to the vocabulary by checking if the text 
         is already present in the vocabulary, and if not, it assigns 
-        a new index to it.
+        a new index to it. Returns the index of the text.
         
         args:
             text: Sentence or token present in the data corpus.
@@ -212,12 +607,50 @@ class VocabularyManager:
         if self._norm_punct:
             text = punctuaction_handler(text=text, repl="")
 
-        if text in self._text2idx:
-            idx = self._text2idx[text]
+        if text not in self._text2idx:
+            self._add_unique_texts([text])
+        idx = self._text2idx[text]
+        
+        if self._count_freq:
+            self._counts[idx] += 1
+            self._prune_if_max_size_is_exceeded()
+            idx = self._text2idx.get(text, self.unk_idx)
+        return idx
+    
+    def add_texts(self, texts: List[str]) -> None:
+        """
+        Adds a batch of texts to the vocabulary. Equivalent to calling 
+        'add_text' on each text in order, but with the per-text work 
+        reduced to a dict lookup.
+        
+        args:
+            texts: Sentences or tokens present in the data corpus.
+        """
+        if self._lower_case or self._diacritic:
+            texts = map(lowercase_diacritic_handler, texts)
+        
+        if self._norm_punct:
+            texts = [punctuaction_handler(text=text, repl="") for text in texts]
+        
+        if self._count_freq:
+            text2count = Counter(texts)
+            self._add_unique_texts(text2count)
+            self._add_counts(text2count, text2count.values())
+            self._prune_if_max_size_is_exceeded()
         else:
-            idx = len(self._text2idx)
-            self._text2idx[text] = idx
-            self._idx2text[idx] = text
+            self._add_unique_texts(dict.fromkeys(texts))
+    
+    def get_idxs_by_texts(self, texts: Iterable[str]) -> List[int]:
+        """
+        Looks up the integer indices of the given texts, as 
+        'get_idx_by_text' does for each one.
+        
+        args:
+            texts: Pieces of text whose indices you want to find.
+        """
+        if self._add_unk:
+            return [self._text2idx.get(text, self.unk_idx) for text in texts]
+        return list(map(self._text2idx.__getitem__, texts))
     
     def get_idx_by_text(self, text: str) -> int:
         """
@@ -244,9 +677,277 @@ class VocabularyManager:
                 Must already exist in the vocabulary; otherwise a 
                 key error exception will be raised.
         """
-        if index not in self._idx2text:
+        if not 0 <= index < len(self._idx2text):
             raise KeyError(f"The index {index} is not in the Vocabulary")
         return self._idx2text[index]
+    
+    def get_freq_by_text(self, text: str) -> int:
+        """
+        Returns the frequency of a given piece of text, or 0 if it is not 
+        in the vocabulary. The vocabulary must be created with 
+        'count_freq=True'.
+        
+        args:
+            text: The piece of text whose frequency you want to find.
+        """
+        if not self._count_freq:
+            raise ValueError(
+                "Only vocabularies created with 'count_freq=True' have frequencies"
+            )
+        idx = self._text2idx.get(text)
+        return 0 if idx is None else int(self._counts[idx])
+    
+    def get_text2freq(self) -> Dict[str, int]:
+        """Returns a dict that maps each text to its frequency, in index 
+        order, as expected by 'Word2Vec.build_vocab_from_freq'. The 
+        vocabulary must be created with 'count_freq=True'."""
+        if not self._count_freq:
+            raise ValueError(
+                "Only vocabularies created with 'count_freq=True' have frequencies"
+            )
+        return dict(zip(self._idx2text, self._counts[:len(self)].tolist()))
+    
+    def save(self, path: str) -> None:
+        """
+        Saves the vocabulary as a '.npz' string table: the 'offsets' array 
+        holds the byte offset where each text starts in the UTF-8 'buffer' 
+        array, followed by the end of the last text. The index of a text 
+        is its position in the table. Frequencies, if counted, are stored 
+        in the 'counts' array.
+        
+        args:
+            path: Path to the file where the vocabulary will be stored.
+        """
+        texts = "".join(self._idx2text)
+        lengths = np.fromiter(
+            map(len, self._idx2text), dtype=np.int64, count=len(self._idx2text)
+        )
+        if not texts.isascii():
+            for i, text in enumerate(self._idx2text):
+                if not text.isascii():
+                    lengths[i] = len(text.encode("utf-8"))
+        
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        
+        arrays = {}
+        if self._count_freq:
+            arrays["counts"] = self._counts[:len(self)]
+        
+        configs = self._get_configs()
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                offsets=offsets,
+                buffer=np.frombuffer(texts.encode("utf-8"), dtype=np.uint8),
+                configs=np.array(json.dumps(configs)),
+                **arrays
+            )
+    
+    @classmethod
+    def load(
+        cls, 
+        path: str,
+        data_iterator: Callable[[Union[List[str], str]], Iterable] = DataLazyManager
+    ) -> VocabularyManager:
+        """
+        Loads a vocabulary stored with 'save', with the same indices and 
+        configurations.
+        
+        args:
+            path: Path to the file where the vocabulary is stored.
+            data_iterator: Object in charge of managing the lazy creation 
+                of a data generator. Defaults to DataLazyManager.
+        """
+        with np.load(path) as stored:
+            offsets = stored["offsets"].tolist()
+            buffer = stored["buffer"].tobytes()
+            configs = json.loads(stored["configs"].item())
+            counts = stored["counts"] if "counts" in stored else None
+        
+        bounds = zip(offsets[:-1], offsets[1:])
+        if buffer.isascii():
+            # byte offsets are also str offsets, so the buffer is decoded once
+            buffer = buffer.decode("ascii")
+            texts = [buffer[start:end] for start, end in bounds]
+        else:
+            texts = [buffer[start:end].decode("utf-8") for start, end in bounds]
+        
+        vocab = cls(
+            [],
+            text2idx=dict(zip(texts, range(len(texts)))),
+            data_iterator=data_iterator,
+            **configs
+        )
+        if counts is not None:
+            vocab._counts = counts
+        return vocab
+
+
+class TokenizedCorpusManager:
+    """
+    The class manages a data corpus tokenized once into token ids, so it 
+    can be iterated many times (e.g. once per training epoch) without 
+    reading and splitting the texts again.
+    
+    Token ids are stored as a flat int32 array and sentence boundaries as 
+    an int64 array of offsets into it (sentence 'i' is ids[offsets[i]: 
+    offsets[i + 1]]). Both arrays are files memory-mapped from a directory, 
+    so memory doesn't grow with the size of the data corpus, only with the 
+    size of its vocabulary, that maps ids to tokens and counts their 
+    frequency (see VocabularyManager).
+    """
+    ids_file_name = "token_ids.bin"
+    offsets_file_name = "offsets.bin"
+    vocab_file_name = "vocab.npz"
+    
+    def __init__(
+        self, 
+        path: str, 
+        vocab: VocabularyManager,
+        batch_size: int = 10000
+    ) -> None:
+        """
+        Builds a TokenizedCorpusManager object from a directory written 
+        by 'TokenizedCorpusManager.build'.
+        
+        args:
+            path: Directory of the tokenized data corpus.
+            vocab: Vocabulary of the tokens, indexed by token id.
+            batch_size: Number of sentences whose tokens are looked up at 
+                once while iterating. Defaults to 10000.
+        """
+        self.path = path
+        self.vocab = vocab
+        self._batch_size = batch_size
+        self._ids = self._open_array(self.ids_file_name, np.int32)
+        self._offsets = self._open_array(self.offsets_file_name, np.int64)
+    
+    def __len__(self) -> int:
+        """Returns the number of sentences of the data corpus."""
+        return len(self._offsets) - 1
+    
+    def __iter__(self) -> Generator[List[str], None, None]:
+        """Yields the tokens of each sentence of the data corpus."""
+        for ids, offsets in self.iter_id_batches():
+            tokens = list(map(self.vocab._idx2text.__getitem__, ids.tolist()))
+            bounds = offsets.tolist()
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                yield tokens[start:end]
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Memory maps are not pickled; they are opened again from the 
+        directory."""
+        state = self.__dict__.copy()
+        state["_ids"] = state["_offsets"] = None
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._ids = self._open_array(self.ids_file_name, np.int32)
+        self._offsets = self._open_array(self.offsets_file_name, np.int64)
+    
+    @property
+    def n_tokens(self) -> int:
+        """Returns the number of tokens of the data corpus."""
+        return int(self._offsets[-1])
+    
+    def _open_array(self, file_name: str, dtype: np.dtype) -> np.ndarray:
+        """Memory-maps an array file of the directory."""
+        path = os.path.join(self.path, file_name)
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+    
+    @classmethod
+    def build(
+        cls, 
+        data: Union[Iterable[str], DataLazyManager],
+        path: Optional[str] = None,
+        batch_size: int = 10000
+    ) -> TokenizedCorpusManager:
+        """
+        Splits each sentence of the data corpus into tokens by whitespace, 
+        and writes their ids and the sentence offsets to a directory, in 
+        a single pass over the data corpus.
+        
+        args:
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object.
+            path: Directory where the tokenized data corpus is written. If 
+                None, a temporary directory is created (see 'remove'). 
+                Defaults to None.
+            batch_size: Number of sentences tokenized at once. Defaults 
+                to 10000.
+        """
+        if path is None:
+            path = tempfile.mkdtemp(suffix="_tokenized_corpus")
+        else:
+            utils.create_dir_if_not_exists(path)
+        
+        if isinstance(data, DataLazyManager):
+            batches = data.iter_batches(batch_size=batch_size)
+        else:
+            batches = utils.chunk_iterable(data, batch_size)
+        
+        vocab = VocabularyManager([], unk_text=None, count_freq=True)
+        n_tokens = 0
+        with open(os.path.join(path, cls.ids_file_name), "wb") as ids_file, \
+             open(os.path.join(path, cls.offsets_file_name), "wb") as offsets_file:
+            offsets_file.write(np.zeros(1, dtype=np.int64).tobytes())
+            for batch in batches:
+                sents = list(map(str.split, batch))
+                tokens = list(chain.from_iterable(sents))
+                vocab.add_texts(tokens)
+                ids_file.write(
+                    np.array(vocab.get_idxs_by_texts(tokens), dtype=np.int32).tobytes()
+                )
+                offsets = np.fromiter(map(len, sents), dtype=np.int64, count=len(sents))
+                offsets = np.cumsum(offsets) + n_tokens
+                offsets_file.write(offsets.tobytes())
+                n_tokens += len(tokens)
+        
+        vocab.save(os.path.join(path, cls.vocab_file_name))
+        return cls(path, vocab, batch_size=batch_size)
+    
+    @classmethod
+    def load(cls, path: str, batch_size: int = 10000) -> TokenizedCorpusManager:
+        """
+        Loads a tokenized data corpus written by 'TokenizedCorpusManager.build'.
+        
+        args:
+            path: Directory of the tokenized data corpus.
+            batch_size: Number of sentences whose tokens are looked up at 
+                once while iterating. Defaults to 10000.
+        """
+        vocab = VocabularyManager.load(os.path.join(path, cls.vocab_file_name))
+        return cls(path, vocab, batch_size=batch_size)
+    
+    def iter_id_batches(self) -> Generator[Tuple[np.ndarray, np.ndarray], None, None]:
+        """Yields the token ids of batches of 'batch_size' consecutive 
+        sentences, together with the sentence offsets relative to the 
+        first token of the batch (one more than the sentences)."""
+        for first in range(0, len(self), self._batch_size):
+            last = min(first + self._batch_size, len(self))
+            offsets = self._offsets[first:last + 1]
+            yield self._ids[offsets[0]:offsets[-1]], offsets - offsets[0]
+    
+    def remove(self) -> None:
+        """Removes the directory of the tokenized data corpus."""
+        self._ids = self._offsets = None
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _build_partial_vocab(
+    shard: DataLazyManager, 
+    configs: Dict[str, Any]
+) -> VocabularyManager:
+    """Builds the vocabulary of a shard of the data corpus in a worker 
+    process."""
+    vocab = VocabularyManager([], **configs)
+    for batch in shard.iter_batches():
+        vocab.add_texts(batch)
+    return vocab
 
 
 class DataStorageManager:
@@ -400,4 +1101,170 @@ class DataStorageManager:
         else:
             return
         
-       
\ No newline at end of file
+       
+
+
+class StageCacheManager:
+    """
+    The class manages a content-addressed cache of the outputs of pipeline 
+    stages (normalized data corpora and trained featurizers), persisted in 
+    a directory.
+    
+    Each output is stored under a key that hashes the key of the stage 
+    input together with the stage alias and configurations. The input key 
+    of the first stage is a fingerprint of the data corpus content, and 
+    the input key of each next stage is the key of the previous one, so a 
+    stage is only recomputed if its configurations or any earlier input 
+    change. The key also holds the size and modification time of the 
+    files the configurations read ('path_to_get_...' keys), so replacing a 
+    trained model or a stored vocabulary in the same path recomputes the 
+    stage.
+    """
+    corpus_file_name = "corpus.txt"
+    model_file_name = "model.pkl"
+    input_path_prefix = "path_to_get_"
+    
+    def __init__(self, path: str) -> None:
+        """
+        Builds a StageCacheManager object.
+        
+        args:
+            path: Directory of the cache. It is created if it doesn't 
+                exist.
+        """
+        self.path = path
+        utils.create_dir_if_not_exists(path)
+    
+    @staticmethod
+    def fingerprint_data(
+        data: Union[List[str], str], 
+        block_size: int = 1 << 20
+    ) -> Optional[str]:
+        """
+        Returns a hash of the content of a data corpus file or list of 
+        sentences, or None for other data corpora (e.g. generators, that 
+        can't be read twice).
+        
+        args:
+            data: Path to a data corpus file or list of sentences.
+            block_size: Number of bytes (or sentences) hashed at once. 
+                Defaults to 1 MiB.
+        """
+        digest = hashlib.sha256()
+        if isinstance(data, str) and os.path.isfile(data):
+            digest.update(b"file\0")
+            with open(data, "rb") as f:
+                for block in iter(lambda: f.read(block_size), b""):
+                    digest.update(block)
+        elif isinstance(data, list):
+            digest.update(b"list\0")
+            for sents in utils.chunk_iterable(data, block_size):
+                digest.update("\0".join(sents).encode("utf-8"))
+                digest.update(b"\0")
+        else:
+            return None
+        return digest.hexdigest()
+    
+    @staticmethod
+    def fingerprint_path(path: str) -> List[Tuple[str, int, int]]:
+        """
+        Returns the name, size and modification time of each file of the 
+        path: the file and the files saved next to it with its name as 
+        prefix (e.g. arrays saved separately by Gensim), or the files of a 
+        directory. Returns an empty list if the path doesn't exist.
+        
+        args:
+            path: Path to a file or directory.
+        """
+        if os.path.isdir(path):
+            paths = [
+                os.path.join(root, file_name)
+                for root, _, file_names in os.walk(path)
+                for file_name in file_names
+            ]
+        else:
+            paths = glob.glob(glob.escape(path) + "*")
+        fingerprint = []
+        for file_path in sorted(paths):
+            stat = os.stat(file_path)
+            fingerprint.append((file_path, stat.st_size, stat.st_mtime_ns))
+        return fingerprint
+    
+    @classmethod
+    def get_key(cls, input_key: str, alias: str, configs: DictConfig) -> str:
+        """
+        Returns the key of a stage output.
+        
+        args:
+            input_key: Fingerprint of the data corpus, or key of the 
+                previous stage.
+            alias: Alias of the stage process.
+            configs: Configurations of the stage process.
+        """
+        configs = OmegaConf.to_container(configs, resolve=True)
+        stage = {
+            "input": input_key,
+            "alias": alias,
+            "configs": configs,
+            "files": {
+                name: cls.fingerprint_path(path)
+                for name, path in configs.items()
+                if name.startswith(cls.input_path_prefix) and isinstance(path, str)
+            }
+        }
+        return hashlib.sha256(
+            json.dumps(stage, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+    
+    def _get_file_path(self, key: str, file_name: str) -> str:
+        """Returns the path of a file of the output with the given key."""
+        return os.path.join(self.path, key, file_name)
+    
+    def _write_entry(self, key: str, file_name: str, write_fn: Callable[[str], None]) -> None:
+        """Writes the file of an output in a temporary directory that is 
+        then renamed to the key, so concurrent runs never read a partially 
+        written output."""
+        tmp_dir = tempfile.mkdtemp(dir=self.path, prefix=".tmp_")
+        try:
+            write_fn(os.path.join(tmp_dir, file_name))
+            os.replace(tmp_dir, os.path.join(self.path, key))
+        except OSError:
+            if not self.contains_corpus(key) and not self.contains_model(key):
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def contains_corpus(self, key: str) -> bool:
+        """Checks if there is a data corpus stored with the given key."""
+        return os.path.isfile(self._get_file_path(key, self.corpus_file_name))
+    
+    def contains_model(self, key: str) -> bool:
+        """Checks if there is a model stored with the given key."""
+        return os.path.isfile(self._get_file_path(key, self.model_file_name))
+    
+    def load_corpus(self, key: str) -> DataLazyManager:
+        """Returns the data corpus stored with the given key."""
+        return DataLazyManager(self._get_file_path(key, self.corpus_file_name))
+    
+    def save_corpus(self, key: str, data: Iterable[str]) -> DataLazyManager:
+        """Stores the data corpus with the given key, reading it once, and 
+        returns the stored data corpus."""
+        def write_corpus(path: str) -> None:
+            with open(path, "w", encoding="utf-8") as f:
+                for batch in utils.chunk_iterable(data, 10000):
+                    f.write("".join(sent + "\n" for sent in batch))
+        
+        self._write_entry(key, self.corpus_file_name, write_corpus)
+        return self.load_corpus(key)
+    
+    def load_model(self, key: str) -> Any:
+        """Returns the model stored with the given key."""
+        return utils.load_data_with_pickle("rb", self._get_file_path(key, self.model_file_name))
+    
+    def save_model(self, key: str, model: Any) -> None:
+        """Stores the model with the given key."""
+        self._write_entry(
+            key, 
+            self.model_file_name, 
+            lambda path: utils.persist_data_with_pickle(model, "wb", path)
+        )
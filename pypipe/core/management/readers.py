@@ -0,0 +1,382 @@
+"""
+The module groups reader backends used by managers to read data
+corpus files.
+"""
+from __future__ import annotations
+from typing import IO, List, Tuple, Union, Optional, Generator
+
+import os
+import bz2
+import gzip
+import lzma
+import mmap
+import logging
+import threading
+from queue import Queue, Empty, Full
+
+import numpy as np
+
+from pypipe import settings
+
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+def _split_lines(block: bytes, encoding: str) -> List[str]:
+    """Decodes a block of whole lines, without the newline that ends it, 
+    and returns its lines stripped."""
+    text = block.decode(encoding)
+    if "\r" in text:
+        # universal newlines, as in text mode 'open'
+        if text.endswith("\r"):
+            text = text[:-1]
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return list(map(str.strip, text.split("\n")))
+
+
+class MmapLineReader:
+    """
+    Reads the lines of a text file through a memory map. Newline offsets
+    are searched in blocks of 'block_size' bytes and each block is decoded
+    and split into lines at once, so the per-line cost is a single strip.
+
+    A reader can be restricted to a byte range of the file. A line belongs
+    to the range in which its first byte lies, so the readers of adjacent
+    ranges (see 'MmapLineReader.split_ranges') read every line exactly
+    once without having to read the file beforehand.
+    """
+    def __init__(
+        self,
+        path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        block_size: int = 1 << 22,
+        encoding: str = "utf-8"
+    ) -> None:
+        """
+        Builds a MmapLineReader object.
+
+        args:
+            path: Path to the text file.
+            start: Byte offset where the range to read starts. If it falls
+                inside a line, that line is left to the previous range.
+                Defaults to 0.
+            end: Byte offset where the range to read ends. Lines that start
+                before it are read entirely. If None, reads up to the end
+                of the file. Defaults to None.
+            block_size: Approximate number of bytes decoded at once.
+                Defaults to 4 MiB.
+            encoding: Encoding of the file. Defaults to 'utf-8'.
+        """
+        self._path = path
+        self._start = start
+        self._end = end
+        self._block_size = block_size
+        self._encoding = encoding
+
+    def __iter__(self) -> Generator:
+        """Yields each line in the range, stripped."""
+        for lines in self.iter_batches():
+            yield from lines
+
+    @staticmethod
+    def split_ranges(
+        path: str,
+        n: int,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Splits the (start, end) byte range of the file into 'n' ranges of
+        similar size that can be read by independent readers.
+
+        args:
+            path: Path to the text file.
+            n: Number of ranges.
+            start: Byte offset where the range to split starts.
+                Defaults to 0.
+            end: Byte offset where the range to split ends. If None,
+                the end of the file. Defaults to None.
+        """
+        if end is None:
+            end = os.path.getsize(path)
+        bounds = [start + (end - start) * i // n for i in range(n + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def iter_batches(self) -> Generator[List[str], None, None]:
+        """Yields the lines in the range, stripped, as one list per
+        decoded block."""
+        for block in self._iter_blocks():
+            yield _split_lines(block, self._encoding)
+
+    def _iter_blocks(self) -> Generator[bytes, None, None]:
+        """Yields blocks of whole lines in the range, without the newline
+        that ends each block."""
+        if os.path.getsize(self._path) == 0:
+            return
+
+        with open(self._path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                end = size if self._end is None else min(self._end, size)
+
+                pos = self._start
+                if pos > 0:
+                    pos = self._find_newline(mm, pos - 1, size) + 1
+
+                while pos < end:
+                    limit = min(pos + self._block_size, end)
+                    # the last line in the block is the one holding the
+                    # byte before 'limit'
+                    newline = self._find_newline(mm, limit - 1, size)
+                    yield mm[pos:newline]
+                    pos = newline + 1
+
+    @staticmethod
+    def _find_newline(mm: mmap.mmap, pos: int, size: int) -> int:
+        """Returns the offset of the first newline at or after 'pos', or the
+        size of the file if there is none."""
+        newline = mm.find(b"\n", pos)
+        return size if newline == -1 else newline
+
+
+def _open_zstd(path: str, mode: str = "rb") -> IO[bytes]:
+    """Opens a zstd file as a binary stream. Requires the optional 
+    'zstandard' package."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "Reading '.zst' data corpus files requires the 'zstandard' package"
+        )
+    return zstandard.open(path, mode)
+
+
+class CompressedLineReader:
+    """
+    Reads the lines of a compressed text file, choosing the decompressor 
+    by file extension. A background thread decompresses blocks of lines 
+    into a bounded read-ahead queue, so decompression (which releases 
+    the GIL) overlaps with the processing of the lines already read.
+    
+    Compressed files can't be read by byte ranges nor indexed.
+    """
+    openers = {
+        ".gz": gzip.open,
+        ".bz2": bz2.open,
+        ".xz": lzma.open,
+        ".zst": _open_zstd
+    }
+    
+    def __init__(
+        self,
+        path: str,
+        block_size: int = 1 << 20,
+        read_ahead: int = 8,
+        encoding: str = "utf-8"
+    ) -> None:
+        """
+        Builds a CompressedLineReader object.
+
+        args:
+            path: Path to the compressed text file.
+            block_size: Approximate number of decompressed bytes per 
+                block. Defaults to 1 MiB.
+            read_ahead: Maximum number of blocks decompressed ahead of 
+                the consumer. Defaults to 8.
+            encoding: Encoding of the file. Defaults to 'utf-8'.
+        """
+        self._path = path
+        self._opener = self.openers[self.get_extension(path)]
+        self._block_size = block_size
+        self._read_ahead = read_ahead
+        self._encoding = encoding
+    
+    def __iter__(self) -> Generator:
+        """Yields each line of the file, stripped."""
+        for lines in self.iter_batches():
+            yield from lines
+    
+    @staticmethod
+    def get_extension(path: str) -> str:
+        """Returns the lowercase extension of the path."""
+        return os.path.splitext(path)[1].lower()
+    
+    @classmethod
+    def supports(cls, path: Union[str, object]) -> bool:
+        """Checks if the path has a supported compression extension."""
+        return isinstance(path, str) and cls.get_extension(path) in cls.openers
+    
+    def iter_batches(self) -> Generator[List[str], None, None]:
+        """Yields the lines of the file, stripped, as one list per 
+        decompressed block."""
+        queue = Queue(maxsize=self._read_ahead)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._read_blocks, 
+            args=(queue, stop), 
+            daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                block = queue.get()
+                if block is None:
+                    return
+                if isinstance(block, BaseException):
+                    raise block
+                yield _split_lines(block, self._encoding)
+        finally:
+            stop.set()
+            while producer.is_alive():
+                try:
+                    queue.get_nowait()
+                except Empty:
+                    producer.join(0.01)
+    
+    def _read_blocks(self, queue: Queue, stop: threading.Event) -> None:
+        """Decompresses the file into blocks of whole lines, without the 
+        newline that ends each block, and puts them into the queue. 
+        Puts None at the end, or the exception raised while reading."""
+        try:
+            with self._opener(self._path, "rb") as f:
+                rest = b""
+                while not stop.is_set():
+                    data = f.read(self._block_size)
+                    if not data:
+                        break
+                    data = rest + data
+                    newline = data.rfind(b"\n")
+                    if newline == -1:
+                        rest = data
+                        continue
+                    rest = data[newline + 1:]
+                    self._put(queue, stop, data[:newline])
+                if rest:
+                    self._put(queue, stop, rest)
+        except BaseException as e:
+            self._put(queue, stop, e)
+        finally:
+            self._put(queue, stop, None)
+    
+    @staticmethod
+    def _put(queue: Queue, stop: threading.Event, item) -> None:
+        """Puts the item into the queue, unless the consumer stops."""
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+
+class LineOffsetIndex:
+    """
+    Index of the byte offset where each line of a text file starts, that
+    allows counting lines and reading line 'i' without reading the lines
+    before it.
+
+    The index is persisted next to the file ('<path>.lineidx.npy') together
+    with the size and modification time of the file, and it is reused while
+    those don't change. Lines are delimited by '\\n', as in 'MmapLineReader'
+    (a lone '\\r' is not indexed as a line break).
+    """
+    sidecar_suffix = ".lineidx.npy"
+
+    def __init__(self, path: str, offsets: np.ndarray) -> None:
+        """
+        Builds a LineOffsetIndex object.
+
+        args:
+            path: Path to the indexed text file.
+            offsets: Start offset of each line, followed by a sentinel
+                that is one byte past the end of the last line.
+        """
+        self._path = path
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        """Returns the number of lines of the file."""
+        return len(self._offsets) - 1
+
+    @classmethod
+    def build(cls, path: str, block_size: int = 1 << 26) -> LineOffsetIndex:
+        """
+        Builds the index by searching the newlines of the file through a
+        memory map, in blocks of 'block_size' bytes.
+        """
+        size = os.path.getsize(path)
+        if size == 0:
+            return cls(path, np.zeros(1, dtype=np.int64))
+
+        starts = [np.zeros(1, dtype=np.int64)]
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                buffer = np.frombuffer(mm, dtype=np.uint8)
+                try:
+                    for pos in range(0, size, block_size):
+                        block = buffer[pos:pos + block_size]
+                        starts.append(np.flatnonzero(block == 10) + (pos + 1))
+                    ends_with_newline = buffer[-1] == 10
+                finally:
+                    del buffer, block
+
+        offsets = np.concatenate(starts)
+        if not ends_with_newline:
+            # sentinel past the last line, which has no newline to skip
+            offsets = np.append(offsets, size + 1)
+        return cls(path, offsets)
+
+    @classmethod
+    def load_or_build(cls, path: str) -> LineOffsetIndex:
+        """
+        Returns the persisted index of the file if it is up to date, or
+        builds and persists a new one otherwise. The persisted index is
+        memory-mapped.
+        """
+        sidecar = path + cls.sidecar_suffix
+        stat = os.stat(path)
+
+        try:
+            stored = np.load(sidecar, mmap_mode="r")
+            if stored[0] == stat.st_size and stored[1] == stat.st_mtime_ns:
+                return cls(path, stored[2:])
+        except (FileNotFoundError, ValueError, IndexError):
+            pass
+
+        index = cls.build(path)
+        header = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        try:
+            tmp_sidecar = sidecar + ".tmp.npy"
+            np.save(tmp_sidecar, np.concatenate([header, index._offsets]))
+            os.replace(tmp_sidecar, sidecar)
+        except OSError:
+            logger.warning(
+                f"Line offset index of '{path}' could not be persisted in "
+                f"'{sidecar}', it will be rebuilt on next use"
+            )
+        return index
+
+    def line_range(self, i: int) -> Tuple[int, int]:
+        """Returns the (start, end) byte offsets of line 'i', without
+        its newline."""
+        return int(self._offsets[i]), int(self._offsets[i + 1]) - 1
+
+    def byte_offset(self, i: int) -> int:
+        """Returns the byte offset where line 'i' starts, or the end of
+        the file if 'i' is the number of lines."""
+        return int(self._offsets[i])
+
+    def line_number(self, offset: int) -> int:
+        """Returns the number of lines that start before the byte
+        'offset', i.e. the first line that belongs to a range starting
+        at 'offset'."""
+        return int(np.searchsorted(self._offsets[:-1], offset, side="left"))
+
+    def read_line(self, i: int, encoding: str = "utf-8") -> str:
+        """Reads line 'i' from the file, stripped."""
+        start, end = self.line_range(i)
+        with open(self._path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode(encoding).strip()
@@ -0,0 +1,130 @@
+"""
+The module groups the thin client of the pipeline server. It only
+depends on the standard library, so it starts without importing the
+pipeline processes.
+"""
+from __future__ import annotations
+from typing import List, Dict, Any, Optional, Iterable, Generator
+
+import json
+import socket
+from itertools import count
+
+
+class PipelineClient:
+    """
+    Client of a PipelineServer listening on a Unix socket (see
+    'PipelineServer' for the protocol).
+
+    Several requests can be sent before their responses are read, so the
+    server processes them concurrently and groups their texts into
+    micro-batches.
+    """
+    def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+        """
+        Builds a PipelineClient object connected to the server.
+
+        args:
+            path: Path to the Unix socket of the server.
+            timeout: Seconds to wait for the server before raising a
+                socket.timeout. Defaults to None (wait forever).
+        """
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._reader = self._sock.makefile("rb")
+        self._ids = count()
+        self._responses: Dict[int, Dict[str, Any]] = {}
+
+    def __enter__(self) -> PipelineClient:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the connection to the server."""
+        self._reader.close()
+        self._sock.close()
+
+    def _send(
+        self,
+        method: str,
+        data: List[str],
+        stages: Optional[List[str]] = None
+    ) -> int:
+        """Sends a request and returns its id."""
+        request_id = next(self._ids)
+        request = {"id": request_id, "method": method, "data": data}
+        if stages is not None:
+            request["stages"] = stages
+        self._sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        return request_id
+
+    def _receive(self, request_id: int) -> Dict[str, Any]:
+        """Reads responses until the one of the request, and returns its
+        result. Raises a RuntimeError if the request failed."""
+        while request_id not in self._responses:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("The server closed the connection")
+            response = json.loads(line)
+            self._responses[response["id"]] = response
+
+        response = self._responses.pop(request_id)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def request(
+        self,
+        method: str,
+        data: List[str],
+        stages: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Sends a request and returns the output of each requested stage.
+
+        args:
+            method: 'normalize' or 'featurize'.
+            data: List of texts.
+            stages: Aliases of the stages whose outputs are returned. If
+                None, the default stages of the method.
+        """
+        return self._receive(self._send(method, data, stages))
+
+    def normalize(self, data: List[str]) -> List[str]:
+        """Returns the texts normalized by the last active normalizer."""
+        return next(iter(self.request("normalize", data).values()))
+
+    def featurize(self, data: List[str]) -> Dict[str, Any]:
+        """Returns the output of each active featurizer."""
+        return self.request("featurize", data)
+
+    def request_batches(
+        self,
+        method: str,
+        batches: Iterable[List[str]],
+        stages: Optional[List[str]] = None,
+        window: int = 8
+    ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Sends a request per batch of texts and yields their results in the
+        order of the batches, keeping at most 'window' requests sent and
+        not answered.
+
+        args:
+            method: 'normalize' or 'featurize'.
+            batches: Iterable of lists of texts.
+            stages: Aliases of the stages whose outputs are returned. If
+                None, the default stages of the method.
+            window: Maximum number of requests waiting for their
+                response. Defaults to 8.
+        """
+        sent = []
+        for batch in batches:
+            sent.append(self._send(method, batch, stages))
+            if len(sent) == window:
+                yield self._receive(sent.pop(0))
+        for request_id in sent:
+            yield self._receive(request_id)
@@ -1,11 +1,16 @@
 from pypipe import settings
 from pypipe.core.pipeline.handlers import TextNormalizerHandler, TextFeaturizerHandler
 from pypipe.core.processes.normalization.normalizers import RegexNormalizer
-from pypipe.core.processes.featurization.featurizers import CountVecFeaturizer, Word2VecFeaturizer
+from pypipe.core.processes.featurization.featurizers import (
+    CountVecFeaturizer, 
+    Word2VecFeaturizer, 
+    HashingVecFeaturizer
+)
 
 
 PIPELINE_PROCESS_ALIAS = {
     settings.REGEX_NORMALIZER_ALIAS: (TextNormalizerHandler, RegexNormalizer),
     settings.COUNTVEC_FEATURIZER_ALIAS: (TextFeaturizerHandler, CountVecFeaturizer),
-    settings.WORD2VEC_FEATURIZER_ALIAS: (TextFeaturizerHandler, Word2VecFeaturizer)
+    settings.WORD2VEC_FEATURIZER_ALIAS: (TextFeaturizerHandler, Word2VecFeaturizer),
+    settings.HASHINGVEC_FEATURIZER_ALIAS: (TextFeaturizerHandler, HashingVecFeaturizer)
 }
@@ -1,8 +1,10 @@
-from typing import List, Union, Iterable
+from typing import List, Union, Iterable, Generator
 
 import logging
+from functools import partial
 
 from pypipe import settings
+from pypipe.core.processes import utils
 from pypipe.core.interfaces import IProcessHandler
 from pypipe.core.management.managers import DataLazyManager
 from pypipe.core.processes.normalization.normalizers import TextNormalizer
@@ -39,9 +41,30 @@ class PipeHandler(IProcessHandler):
             )
             
     def set_next(self, handler: IProcessHandler) -> IProcessHandler:
-        """Sets the next handler in the chain."""
+        """Sets the next handler in the chain, and this handler as its 
+        previous one."""
         self._next_handler = handler
+        handler._prev_handler = self
         return handler
+    
+    def process_in_worker(
+        self, 
+        data: Union[Iterable[str], List[str]], 
+        persist: bool = False,
+        queue_size: int = 8,
+        batch_size: int = 1000
+    ) -> Generator[str, None, None]:
+        """
+        Runs 'process' in a worker thread and lazily yields its output, 
+        passed in batches through a bounded queue (see 
+        'utils.iterate_in_thread'), so the handler runs concurrently 
+        with the one that reads its output.
+        """
+        return utils.iterate_in_thread(
+            partial(self.process, data=data, persist=persist),
+            queue_size=queue_size,
+            batch_size=batch_size
+        )
 
 
 class TextNormalizerHandler(PipeHandler):
@@ -56,9 +79,7 @@ class TextNormalizerHandler(PipeHandler):
         persist: bool = False
     ) -> DataLazyManager:
         """Interface to the 'normalize_text' method."""
-        PipeHandler._prev_handler = self
         if super()._check_if_input_type_is_iterable(iter_data=data):
-            self._prev_handler = self
             return self._processor.normalize_text(data=data, persist=persist)
 
 
@@ -75,7 +96,6 @@ class TextFeaturizerHandler(PipeHandler):
     ) -> None:
         """Interface to the 'train' method."""    
         if not isinstance(self._prev_handler, TextFeaturizerHandler):
-            PipeHandler._prev_handler = self
             if super()._check_if_input_type_is_iterable(iter_data=data):    
                 return self._processor.train(trainset=data, persist=persist)
         else:
@@ -1,13 +1,38 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Union, Callable, Iterable
+from typing import (
+    List, 
+    Dict, 
+    Any, 
+    Tuple, 
+    Union, 
+    Optional, 
+    Callable, 
+    Iterable, 
+    Generator, 
+    AsyncIterable
+)
 
+import os
 import logging
+import tempfile
+import asyncio
+from functools import partial
+from collections import Counter
+from concurrent.futures import Executor
 from omegaconf import OmegaConf, DictConfig
 
 from pypipe import settings
 from pypipe.core.pipeline import constants
-from pypipe.core.interfaces import IProcess
-from pypipe.core.management.managers import DataLazyManager
+from pypipe.core.processes import utils
+from pypipe.core.interfaces import IProcess, IProcessHandler
+from pypipe.core.pipeline.handlers import TextFeaturizerHandler
+from pypipe.core.management.managers import (
+    DataLazyManager, 
+    StageCacheManager,
+    TokenizedCorpusManager
+)
+from pypipe.core.processes.normalization.base import TextNormalizer
+from pypipe.core.processes.featurization.base import TextFeaturizer
 
 
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -48,7 +73,11 @@ class Pipeline:
         """
         self._config = self._format_config(config=config)
         self._data_generator = data_generator
+        self.processes: Dict[str, IProcess] = {}
+        self.executor: Optional[Executor] = None
+        self._max_delay = self._config.get("async_execution", {}).get("max_delay", 0.002)
         if data is not None:
+            self._raw_data = data
             self._data = self._data_generator(data)
     
     @staticmethod
@@ -70,15 +99,212 @@ class Pipeline:
                     f"{config} is not a configuration alias."
                 )
             
+    def _check_if_process_is_active(self, alias: str) -> bool:
+        """Checks if the process is set as active in the configurations. 
+        Processes missing from the configurations are not active."""
+        return alias in self._config.pipeline and self._config.pipeline[alias].active
+    
+    def _check_if_token_cache_is_active(self) -> bool:
+        """Checks if the token cache is set as active in the configurations."""
+        return "token_cache" in self._config and self._config.token_cache.active
+    
+    def _set_token_cache(
+        self, 
+        process: IProcess, 
+        data: Iterable[str],
+        token_cache: Optional[TokenizedCorpusManager]
+    ) -> Optional[TokenizedCorpusManager]:
+        """
+        Sets the token cache to the process if it is a featurizer and the 
+        token cache is active, tokenizing the data corpus the first time 
+        it is needed. Returns the token cache.
+        """
+        if not isinstance(process, TextFeaturizer):
+            return token_cache
+        if not self._check_if_token_cache_is_active():
+            return token_cache
+        if token_cache is None:
+            token_cache = TokenizedCorpusManager.build(
+                data, 
+                path=self._config.token_cache.path
+            )
+            logger.info(
+                f"Data corpus was tokenized into '{token_cache.path}' "
+                f"to be shared by the pipeline featurizers"
+            )
+        process.set_token_cache(token_cache)
+        return token_cache
+    
+    def _get_stage_cache(self) -> Optional[StageCacheManager]:
+        """Returns the stage cache if it is set as active in the 
+        configurations."""
+        if "stage_cache" in self._config and self._config.stage_cache.active:
+            return StageCacheManager(self._config.stage_cache.path)
+    
+    @staticmethod
+    def _check_if_stage_is_cached(
+        stage_cache: StageCacheManager, 
+        key: str, 
+        process: IProcess
+    ) -> bool:
+        """Checks if the output of the stage is stored with the given key."""
+        if isinstance(process, TextNormalizer):
+            return stage_cache.contains_corpus(key)
+        if isinstance(process, TextFeaturizer):
+            return stage_cache.contains_model(key)
+        return False
+    
+    @staticmethod
+    def _load_cached_stage(
+        stage_cache: StageCacheManager, 
+        key: str, 
+        process: IProcess
+    ) -> Optional[DataLazyManager]:
+        """Loads the output of the stage stored with the given key into the 
+        process. Returns the output of the stage (None for featurizers, as 
+        their handlers)."""
+        if isinstance(process, TextNormalizer):
+            return stage_cache.load_corpus(key)
+        process.load(data=stage_cache.load_model(key))
+        return None
+    
+    @staticmethod
+    def _cache_stage(
+        stage_cache: StageCacheManager, 
+        key: str, 
+        process: IProcess,
+        output: Optional[Iterable[str]]
+    ) -> Optional[Union[Iterable[str], DataLazyManager]]:
+        """Stores the output of the stage with the given key. Returns the 
+        output of the stage, that is read from the cache for normalizers 
+        since their output may be a generator."""
+        if isinstance(process, TextNormalizer) and output is not None:
+            return stage_cache.save_corpus(key, output)
+        if isinstance(process, TextFeaturizer) and process.featurizer is not None:
+            stage_cache.save_model(key, process.featurizer)
+        return output
+    
     def create_pipeline_process(self, alias: str) -> IProcess:
         """Returns a pipeline process."""
         if alias in Pipeline._pipeline_process:
-            if self._config.pipeline[alias].active:
+            if self._check_if_process_is_active(alias):
                 _, processor = Pipeline._pipeline_process[alias]
                 process = processor(alias=alias, configs=self._config)
+                process.set_executor(self.executor, max_delay=self._max_delay)
                 self._pipiline_was_created = True
                 return process
                    
+    def _get_data_key(self, stage_cache: Optional[StageCacheManager]) -> Optional[str]:
+        """Returns the fingerprint of the data corpus used as input key of 
+        the first stages by the stage cache, or None if the stage cache is 
+        not active or can't be used with the data corpus."""
+        if stage_cache is None:
+            return None
+        key = StageCacheManager.fingerprint_data(self._raw_data)
+        if key is None:
+            logger.warning(
+                "The stage cache can only be used with a list or a file "
+                "as data corpus, every stage will be computed"
+            )
+        return key
+    
+    def _run_stage(
+        self,
+        alias: str,
+        process: IProcess,
+        handler: IProcessHandler,
+        data: Iterable[str],
+        persist: bool,
+        stage_cache: Optional[StageCacheManager],
+        key: Optional[str],
+        token_cache: Optional[TokenizedCorpusManager]
+    ) -> Tuple[Optional[Iterable[str]], Optional[TokenizedCorpusManager]]:
+        """
+        Runs a stage through its handler, unless its output is stored in 
+        the stage cache with the given key, in which case it is loaded. 
+        Returns the output of the stage and the token cache, that is built 
+        the first time a featurizer is run.
+        """
+        if key is not None and self._check_if_stage_is_cached(stage_cache, key, process):
+            logger.info(f"Output of '{alias}' was loaded from the stage cache")
+            return self._load_cached_stage(stage_cache, key, process), token_cache
+        
+        spilled_file = None
+        if (
+            token_cache is None 
+            and isinstance(process, TextFeaturizer) 
+            and self._check_if_token_cache_is_active()
+            and not self._check_if_data_can_be_reread(data)
+        ):
+            # the token cache reads the data corpus before the featurizer
+            data = self._spill_data(data)
+            spilled_file = data.get_file_path()
+        
+        try:
+            token_cache = self._set_token_cache(process, data, token_cache)
+            output = handler.process(data=data, persist=persist)
+        finally:
+            if spilled_file is not None:
+                os.remove(spilled_file)
+        if key is not None:
+            output = self._cache_stage(stage_cache, key, process, output)
+        return output, token_cache
+    
+    @staticmethod
+    def _check_if_data_can_be_reread(data: Iterable[str]) -> bool:
+        """Checks if the data corpus can be iterated more than once."""
+        if isinstance(data, DataLazyManager):
+            return data.check_if_can_be_reread()
+        return isinstance(data, (list, tuple))
+    
+    def _remove_token_caches(self, token_caches: Iterable[TokenizedCorpusManager]) -> None:
+        """Removes the token caches built during a run, unless they were 
+        built in the path set in the configurations."""
+        if self._check_if_token_cache_is_active() and self._config.token_cache.path is None:
+            for token_cache in token_caches:
+                if token_cache is not None:
+                    token_cache.remove()
+    
+    def _get_process_graph(self) -> Dict[str, Optional[str]]:
+        """
+        Returns the alias of the input stage of each active stage (None if 
+        it reads the data corpus), in execution order. The input of a stage 
+        is the normalizer set in its 'input' configuration, or the last 
+        active normalizer before it, so normalizers are chained and 
+        featurizers share the output of the same normalizer.
+        """
+        graph = {}
+        normalizers = []
+        for alias, (_, processor) in Pipeline._pipeline_process.items():
+            if not self._check_if_process_is_active(alias):
+                continue
+            default_input = normalizers[-1] if normalizers else None
+            input_alias = self._config.pipeline[alias].get("input", default_input)
+            if input_alias is not None and input_alias not in normalizers:
+                raise ValueError(
+                    f"Invalid input '{input_alias}' for '{alias}'. Expected an "
+                    f"active normalizer that runs before it: {normalizers}"
+                )
+            graph[alias] = input_alias
+            if issubclass(processor, TextNormalizer):
+                normalizers.append(alias)
+        return graph
+    
+    @staticmethod
+    def _spill_data(data: Iterable[str]) -> DataLazyManager:
+        """Writes a data corpus that can only be read once to a temporary 
+        file, and returns a DataLazyManager object that reads it."""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False, encoding="utf-8"
+        ) as f:
+            try:
+                for batch in utils.chunk_iterable(data, 10000):
+                    f.write("".join(sent + "\n" for sent in batch))
+            except BaseException:
+                os.remove(f.name)
+                raise
+        return DataLazyManager(f.name)
+    
     def run_processes_sequentially(
         self, 
         data: Union[Iterable[str], str] = None,
@@ -96,19 +322,336 @@ class Pipeline:
             all outputs of all processes in the executed sequence.
         """
         if data is not None:
+            self._raw_data = data
             self._data = self._data_generator(data)
         
         processed_data = self._data
+        # featurizers read the data corpus tokenized once, if the token 
+        # cache is active
+        token_cache = None
+        # stages whose input and configurations didn't change are loaded 
+        # from the stage cache, if it is active
+        stage_cache = self._get_stage_cache()
+        key = self._get_data_key(stage_cache)
+        prev_handler = None
+        
+        try:
+            for alias, spec in Pipeline._pipeline_process.items():
+                if self._check_if_process_is_active(alias):
+                    process = self.create_pipeline_process(alias)
+                    self.processes[alias] = process
+                    handler, _ = spec
+                    active_handler = handler(processor=process)
+                    if prev_handler is not None:
+                        prev_handler.set_next(active_handler)
+                    prev_handler = active_handler
+                    
+                    if key is not None:
+                        key = stage_cache.get_key(key, alias, self._config.pipeline[alias])
+                    processed_data, token_cache = self._run_stage(
+                        alias,
+                        process,
+                        active_handler,
+                        processed_data,
+                        persist,
+                        stage_cache,
+                        key,
+                        token_cache
+                    )
+        finally:
+            self._remove_token_caches([token_cache])
+                
+        return processed_data
+    
+    def run_processes_as_dag(
+        self, 
+        data: Union[Iterable[str], str] = None,
+        persist: bool = False,
+    ) -> Dict[str, Optional[Iterable[str]]]:
+        """
+        Process the data corpus through the pipeline as a directed acyclic 
+        graph (see '_get_process_graph'): each normalizer runs once and its 
+        output is shared by all the stages that read it, e.g. several 
+        featurizers trained on the same normalized data corpus. 
+        
+        Outputs that can only be read once (generators) and are read by 
+        more than one stage are written once to a temporary file, removed 
+        at the end of the run.
+
+        Args:
+            data: The data corpus to be processed. Can be a list
+            of str or a path to static data corpus file.  
+            
+            persist: If there are paths set in the configurations, persists
+            all outputs of all processes in the graph.
         
-        for alias, spec in Pipeline._pipeline_process.items():
-            if self._config.pipeline[alias].active:
+        Returns:
+            The output of each stage that is not read by other stages 
+            (None for featurizers, whose trained processes are kept in 
+            'processes').
+        """
+        if data is not None:
+            self._raw_data = data
+            self._data = self._data_generator(data)
+        
+        graph = self._get_process_graph()
+        n_readers = Counter(graph.values())
+        
+        outputs = {None: self._data}
+        handlers = {}
+        token_caches = {}
+        stage_cache = self._get_stage_cache()
+        keys = {None: self._get_data_key(stage_cache)}
+        spilled_files = []
+        
+        try:
+            for alias, input_alias in graph.items():
                 process = self.create_pipeline_process(alias)
-                handler, _ = spec
-                active_handler = handler(processor=process)
-                processed_data = active_handler.process(
-                    data=processed_data,
-                    persist=persist
-                )   
+                self.processes[alias] = process
+                handler, _ = Pipeline._pipeline_process[alias]
+                handlers[alias] = handler(processor=process)
+                if input_alias is not None:
+                    handlers[input_alias].set_next(handlers[alias])
+                
+                key = keys[input_alias]
+                if key is not None:
+                    key = stage_cache.get_key(key, alias, self._config.pipeline[alias])
+                output, token_caches[input_alias] = self._run_stage(
+                    alias,
+                    process,
+                    handlers[alias],
+                    outputs[input_alias],
+                    persist,
+                    stage_cache,
+                    key,
+                    token_caches.get(input_alias)
+                )
                 
+                if (
+                    n_readers[alias] > 1
+                    and isinstance(output, DataLazyManager) 
+                    and not output.check_if_can_be_reread()
+                ):
+                    output = self._spill_data(output)
+                    spilled_files.append(output.get_file_path())
+                outputs[alias], keys[alias] = output, key
+        finally:
+            self._remove_token_caches(token_caches.values())
+            for path in spilled_files:
+                os.remove(path)
+        
+        return {alias: outputs[alias] for alias in graph if n_readers[alias] == 0}
+    
+    def _get_concurrency_configs(
+        self, 
+        queue_size: Optional[int], 
+        batch_size: Optional[int]
+    ) -> Tuple[int, int]:
+        """Returns the size of the queues between concurrent stages and the 
+        number of texts per queued batch, taken from the configurations 
+        when they are not given."""
+        configs = self._config.get("concurrent_execution", {})
+        if queue_size is None:
+            queue_size = configs.get("queue_size", 4)
+        if batch_size is None:
+            batch_size = configs.get("batch_size", 10000)
+        return queue_size, batch_size
+    
+    def run_processes_concurrently(
+        self, 
+        data: Union[Iterable[str], str] = None,
+        persist: bool = False,
+        queue_size: int = None,
+        batch_size: int = None
+    ) -> Optional[Iterable[str]]:
+        """
+        Process the data corpus through the pipeline in sequential order, 
+        as 'run_processes_sequentially', but running the reading of the 
+        data corpus and each normalizer in its own worker thread (see 
+        'PipeHandler.process_in_worker'). 
+        
+        Consecutive stages are connected by bounded queues: a stage only 
+        runs ahead of the next one by 'queue_size' batches of 'batch_size' 
+        texts, and then waits for it (backpressure). So reading, 
+        normalization and training overlap, and memory stays bounded 
+        whatever the size of the data corpus. Featurizers run in the 
+        calling thread, as they consume the whole data corpus before 
+        returning.
+        
+        The stage and token caches are not used, since they need the 
+        whole output of a stage before the next one starts.
+
+        Args:
+            data: The data corpus to be processed. Can be a list
+            of str or a path to static data corpus file.  
+            
+            persist: If there are paths set in the configurations, persists
+            all outputs of all processes in the executed sequence.
+            
+            queue_size: Maximum number of batches queued between two 
+            stages. If None, it is taken from configurations (4 by default).
+            
+            batch_size: Number of texts per queued batch. If None, it is 
+            taken from configurations (10000 by default).
+        
+        Returns:
+            The output of the last stage. If it is a normalizer, its output 
+            is produced lazily by the worker threads as it's read.
+        """
+        if data is not None:
+            self._raw_data = data
+            self._data = self._data_generator(data)
+        
+        queue_size, batch_size = self._get_concurrency_configs(queue_size, batch_size)
+        iterate_in_thread = partial(
+            utils.iterate_in_thread, 
+            queue_size=queue_size, 
+            batch_size=batch_size
+        )
+        
+        streams: List[Generator] = [iterate_in_thread(partial(iter, self._data))]
+        processed_data = self._data_generator(streams[0])
+        prev_handler = None
+        
+        try:
+            for alias, spec in Pipeline._pipeline_process.items():
+                if self._check_if_process_is_active(alias):
+                    process = self.create_pipeline_process(alias)
+                    self.processes[alias] = process
+                    handler, _ = spec
+                    active_handler = handler(processor=process)
+                    if prev_handler is not None:
+                        prev_handler.set_next(active_handler)
+                    prev_handler = active_handler
+                    
+                    if isinstance(process, TextNormalizer):
+                        streams.append(active_handler.process_in_worker(
+                            data=processed_data, 
+                            persist=persist,
+                            queue_size=queue_size,
+                            batch_size=batch_size
+                        ))
+                        processed_data = self._data_generator(streams[-1])
+                    else:
+                        processed_data = active_handler.process(
+                            data=processed_data, 
+                            persist=persist
+                        )
+        except BaseException:
+            self._close_streams(streams)
+            raise
+        
+        if isinstance(prev_handler, TextFeaturizerHandler):
+            self._close_streams(streams)
         return processed_data
+    
+    @staticmethod
+    def _close_streams(streams: List[Generator]) -> None:
+        """Stops the worker threads of the stages, from the last one to the 
+        first one, since each stage reads the output of the previous one."""
+        for stream in reversed(streams):
+            stream.close()
+    
+    def set_executor(self, executor: Optional[Executor]) -> None:
+        """
+        Sets the executor where the processes run when the pipeline is run 
+        by 'arun', for the current and future processes.
+        
+        Args:
+            executor: Executor, e.g. a ThreadPoolExecutor object, or None to 
+            use the default executor of the event loop.
+        """
+        self.executor = executor
+        for process in self.processes.values():
+            process.set_executor(executor, max_delay=self._max_delay)
+    
+    def _get_async_process(self, alias: str) -> IProcess:
+        """Returns the process of the alias kept from previous runs, or 
+        creates it, loading the trained model set in the configurations if 
+        it is a featurizer."""
+        if alias not in self.processes:
+            process = self.create_pipeline_process(alias)
+            if isinstance(process, TextFeaturizer):
+                process.load()
+            self.processes[alias] = process
+        return self.processes[alias]
+    
+    def load_processes(self) -> None:
+        """Creates the active processes that were not kept from previous 
+        runs, loading the trained models set in the configurations, so the 
+        first call to 'arun' doesn't pay for it."""
+        for alias in self._get_process_graph():
+            self._get_async_process(alias)
+    
+    @staticmethod
+    def _get_subgraph(
+        graph: Dict[str, Optional[str]], 
+        stages: Iterable[str]
+    ) -> Dict[str, Optional[str]]:
+        """Returns the part of the process graph needed to compute the 
+        outputs of the stages, in execution order."""
+        required = set()
+        for alias in stages:
+            if alias not in graph:
+                raise ValueError(
+                    f"Invalid stage '{alias}'. Expected an active process: "
+                    f"{list(graph)}"
+                )
+            while alias is not None and alias not in required:
+                required.add(alias)
+                alias = graph[alias]
+        return {alias: input_alias for alias, input_alias in graph.items() if alias in required}
+    
+    async def arun(
+        self, 
+        data: Union[Iterable[str], AsyncIterable[str]],
+        stages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async facade to serve the pipeline from an event loop, e.g. in an 
+        asyncio web service, without blocking it. 
+        
+        The data corpus is normalized by the active normalizers and then 
+        converted by each active featurizer ('aprocess'), as a graph (see 
+        '_get_process_graph'). Featurizers run concurrently. Featurizers 
+        are not trained: the processes kept from previous runs are used, 
+        or created by loading the trained models set in the configurations. 
+        
+        The processes run in the executor set by 'set_executor', and the 
+        texts of concurrent calls are grouped into micro-batches processed 
+        by a single call of each process (see 'AsyncMicroBatcher'). The 
+        maximum waiting time of a call to be grouped is the 'max_delay' of 
+        the 'async_execution' configurations (0.002 seconds by default).
+
+        Args:
+            data: The data corpus to be processed. Can be an iterable or an 
+            async iterable of str, read in chunks as it is received.
             
+            stages: Aliases of the stages whose outputs are returned. Only 
+            these stages and the ones they read are run. If None, the 
+            stages that are not read by other stages.
+        
+        Returns:
+            The output of each stage: normalized texts for normalizers, and 
+            the matrix of the texts for featurizers.
+        """
+        graph = self._get_process_graph()
+        if stages is None:
+            stages = [alias for alias in graph if alias not in graph.values()]
+        graph = self._get_subgraph(graph, stages)
+        n_readers = Counter(graph.values())
+        if isinstance(data, AsyncIterable) and n_readers[None] > 1:
+            data = [text async for text in data]
+        
+        outputs = {None: data}
+        featurizers = {}
+        for alias, input_alias in graph.items():
+            process = self._get_async_process(alias)
+            if isinstance(process, TextNormalizer):
+                outputs[alias] = await process.anormalize(outputs[input_alias])
+            else:
+                featurizers[alias] = process.aprocess(outputs[input_alias])
+        
+        outputs.update(zip(featurizers, await asyncio.gather(*featurizers.values())))
+        return {alias: outputs[alias] for alias in stages}
+
@@ -0,0 +1,225 @@
+"""
+The module groups the server that keeps a pipeline warm to process
+requests without paying its startup on each call.
+"""
+from __future__ import annotations
+from typing import List, Dict, Any, Set, Optional, Callable, Awaitable
+
+import os
+import sys
+import json
+import stat
+import socket
+import asyncio
+import logging
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.sparse import issparse
+
+from pypipe import settings
+from pypipe.core.pipeline.pipeline import Pipeline
+from pypipe.core.processes.normalization.base import TextNormalizer
+
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+def to_json_serializable(output: Any) -> Any:
+    """Returns the output of a stage as a JSON serializable object: sparse
+    matrices as a dict of their CSR arrays, and arrays as nested lists."""
+    if issparse(output):
+        output = output.tocsr()
+        return {
+            "shape": list(output.shape),
+            "indptr": output.indptr.tolist(),
+            "indices": output.indices.tolist(),
+            "data": output.data.tolist()
+        }
+    if isinstance(output, np.ndarray):
+        return output.tolist()
+    return output
+
+
+class PipelineServer:
+    """
+    Long-lived server of a pipeline, whose processes are created (and
+    trained models loaded) once at startup and kept warm between requests.
+
+    Requests and responses are JSON lines, read from a Unix socket or from
+    stdin (responses to stdout):
+
+        {"id": 1, "method": "normalize", "data": ["text", ...]}
+        {"id": 1, "result": {"regex_norm": ["text", ...]}}
+
+    'method' is 'normalize' (output of the last active normalizer) or
+    'featurize' (output of each active featurizer), and 'stages' can list
+    the aliases of the stages whose output is returned instead. Failed
+    requests are answered with {"id": ..., "error": "..."}.
+
+    Requests are processed concurrently through 'Pipeline.arun', so the
+    texts of concurrent requests are grouped into micro-batches. Responses
+    may be written in a different order than requests, and are matched by
+    'id'.
+    """
+    methods = ("normalize", "featurize")
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        workers: int = 1,
+        max_pending: int = 1024
+    ) -> None:
+        """
+        Builds a PipelineServer object and loads the pipeline processes.
+
+        args:
+            pipeline: Pipeline to serve.
+            workers: Number of threads where the processes run. Defaults
+                to 1.
+            max_pending: Maximum number of requests being processed, after
+                which no more requests are read until one is answered.
+                Defaults to 1024.
+        """
+        self.pipeline = pipeline
+        self.pipeline.set_executor(ThreadPoolExecutor(max_workers=workers))
+        self.pipeline.load_processes()
+        self._max_pending = max_pending
+
+        self._normalizers = [
+            alias for alias, process in pipeline.processes.items()
+            if isinstance(process, TextNormalizer)
+        ]
+
+    def _get_stages(self, request: Dict[str, Any]) -> Optional[List[str]]:
+        """Returns the aliases of the stages whose outputs are requested, or
+        None for the outputs of the featurizers."""
+        if request.get("stages") is not None:
+            return list(request["stages"])
+        if request["method"] == "normalize":
+            if not self._normalizers:
+                raise ValueError("There is no active normalizer in the pipeline")
+            return self._normalizers[-1:]
+        return None
+
+    async def handle_request(self, line: bytes) -> Dict[str, Any]:
+        """Processes a request JSON line and returns its response."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if request.get("method") not in PipelineServer.methods:
+                raise ValueError(
+                    f"Invalid method '{request.get('method')}'. Expected one "
+                    f"of {PipelineServer.methods}"
+                )
+            outputs = await self.pipeline.arun(
+                request["data"],
+                stages=self._get_stages(request)
+            )
+            result = {alias: to_json_serializable(output) for alias, output in outputs.items()}
+            return {"id": request_id, "result": result}
+        except Exception as e:
+            logger.exception(f"Request {request_id} failed")
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+    async def _serve_lines(
+        self,
+        readline: Callable[[], Awaitable[bytes]],
+        write: Callable[[bytes], Awaitable[None]]
+    ) -> None:
+        """Reads request lines until the end of the stream, processing each
+        one in its own task, and writes each response line as soon as it's
+        ready. Returns once every request is answered."""
+        pending = asyncio.Semaphore(self._max_pending)
+        tasks: Set[asyncio.Task] = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                response = await self.handle_request(line)
+                await write(json.dumps(response).encode("utf-8") + b"\n")
+            finally:
+                pending.release()
+
+        while True:
+            line = await readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            await pending.acquire()
+            task = asyncio.ensure_future(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves the requests of a Unix socket connection."""
+        async def write(line: bytes) -> None:
+            writer.write(line)
+            await writer.drain()
+
+        try:
+            await self._serve_lines(reader.readline, write)
+        except ConnectionError:
+            logger.warning("Client connection was lost")
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _remove_stale_socket(path: str) -> None:
+        """Removes the socket file left by a server that is no longer
+        running. Raises an OSError if a server is listening on it."""
+        if not os.path.exists(path) or not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(path)
+            except ConnectionRefusedError:
+                os.remove(path)
+                return
+        raise OSError(f"A server is already listening on '{path}'")
+
+    async def serve_unix_socket(self, path: str) -> None:
+        """Serves requests on a Unix socket bound to the path until the
+        task is cancelled (e.g. by KeyboardInterrupt). The socket file is
+        removed at the end."""
+        self._remove_stale_socket(path)
+        server = await asyncio.start_unix_server(
+            self._handle_connection,
+            path=path,
+            limit=2 ** 26
+        )
+        logger.info(f"Pipeline server is listening on '{path}'")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def serve_stdio(self) -> None:
+        """Serves requests read from stdin until its end, writing responses
+        to stdout. Anything else that processes print is sent to stderr, so
+        stdout only holds responses."""
+        stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+
+        async def readline() -> bytes:
+            # read in a thread, so reading stdin doesn't block the event loop
+            return await asyncio.get_running_loop().run_in_executor(None, stdin.readline)
+
+        async def write(line: bytes) -> None:
+            stdout.write(line)
+            stdout.flush()
+
+        with redirect_stdout(sys.stderr):
+            await self._serve_lines(readline, write)
+
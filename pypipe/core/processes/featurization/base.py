@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 from abc import abstractclassmethod, abstractmethod
-from typing import List, Dict, Union
+from typing import Any, List, Dict, Union, Optional, Callable, Iterable, Sequence
+from concurrent.futures import Executor
 
 from omegaconf import OmegaConf, DictConfig
 
 from pypipe.core.interfaces import IProcess
-from pypipe.core.management.managers import DataStorageManager, VocabularyManager
+from pypipe.core.processes import utils
+from pypipe.core.management.managers import (
+    DataLazyManager, 
+    DataStorageManager, 
+    VocabularyManager,
+    TokenizedCorpusManager
+)
+from pypipe.core.management.batchers import AsyncMicroBatcher
 
 
 class TextFeaturizer(IProcess):
@@ -35,7 +43,84 @@ class TextFeaturizer(IProcess):
             self._configs = configs.pipeline[alias]
         else:
             self._configs = configs
+        
+        self.token_cache: Optional[TokenizedCorpusManager] = None
+        
+        self.executor: Optional[Executor] = None
+        self._max_delay = 0.002
+        self._batcher: Optional[AsyncMicroBatcher] = None
+        self._worker_batch_fn: Optional[Callable[[List], Sequence]] = None
+        self._worker_batch_key: Any = None
+    
+    def set_token_cache(self, token_cache: Optional[TokenizedCorpusManager]) -> None:
+        """
+        Sets a data corpus already tokenized (e.g. by a pipeline, once for 
+        all its featurizers), that the featurizer reads instead of the 
+        trainset when its training can be computed from whitespace tokens. 
+        The token cache must hold the same data corpus as the trainset.
+        
+        Args:
+            token_cache: Tokenized data corpus, or None to read the trainset.
+        """
+        self.token_cache = token_cache
+    
+    def set_executor(self, executor: Optional[Executor], max_delay: float = 0.002) -> None:
+        """
+        Sets the executor where 'aprocess' runs, and the maximum number of 
+        seconds a request waits to be grouped with other concurrent 
+        requests (see 'AsyncMicroBatcher').
+        
+        Args:
+            executor: Executor, or None to use the default executor of the 
+                event loop.
+            
+            max_delay: Maximum waiting time of a request, in seconds. 
+                Defaults to 0.002.
+        """
+        self.executor = executor
+        self._max_delay = max_delay
+        self._batcher = None
+    
+    def _get_batcher(
+        self, 
+        fn: Callable[[List[str]], Sequence],
+        concat: Callable[[List[Sequence]], Sequence],
+        max_batch_size: int = 10000
+    ) -> AsyncMicroBatcher:
+        """Returns the micro-batcher of 'aprocess', built with the batch 
+        function the first time it is needed."""
+        if self._batcher is None:
+            self._batcher = AsyncMicroBatcher(
+                fn, 
+                concat=concat,
+                executor=self.executor, 
+                max_batch_size=max_batch_size, 
+                max_delay=self._max_delay
+            )
+        return self._batcher
+    
+    def _get_worker_batch_fn(
+        self, 
+        key: Any, 
+        make_fn: Callable[[], Callable[[List], Sequence]]
+    ) -> Callable[[List], Sequence]:
+        """Returns the batch function sent to worker processes (see 
+        'WorkerState'), made by 'make_fn' again only when the key of its 
+        state changes, which also rebuilds the micro-batcher."""
+        if self._worker_batch_fn is None or self._worker_batch_key != key:
+            self._worker_batch_fn = make_fn()
+            self._worker_batch_key = key
+            self._batcher = None
+        return self._worker_batch_fn
                 
+    @staticmethod
+    def _iter_batches(data: Iterable[str], batch_size: int) -> Iterable[List[str]]:
+        """Splits the data corpus into batches of 'batch_size' sentences, 
+        read in blocks if the data corpus is a DataLazyManager object."""
+        if isinstance(data, DataLazyManager):
+            return data.iter_batches(batch_size=batch_size)
+        return utils.chunk_iterable(data, batch_size)
+    
     @staticmethod    
     def create_vocab(
         data: Union[List[str], str],
@@ -45,7 +130,10 @@ class TextFeaturizer(IProcess):
         unk_text: str = "<<UNK>>",
         diacritic: bool = False,
         lower_case: bool = False,
-        norm_punct: bool = False
+        norm_punct: bool = False,
+        workers: int = 1,
+        count_freq: bool = False,
+        max_size: Optional[int] = None
     ) -> VocabularyManager:
         """Returns a VocabularyManager type generator"""
         return VocabularyManager(
@@ -56,7 +144,10 @@ class TextFeaturizer(IProcess):
             unk_text,
             diacritic,
             lower_case,
-            norm_punct
+            norm_punct,
+            workers=workers,
+            count_freq=count_freq,
+            max_size=max_size
         )
 
     @abstractclassmethod
@@ -1,21 +1,200 @@
 from __future__ import annotations
-from typing import List, Dict, Set, Union, Optional
+from typing import (
+    List, 
+    Dict, 
+    Set, 
+    Tuple, 
+    Union, 
+    Optional, 
+    Callable, 
+    Iterable, 
+    Generator,
+    AsyncIterable
+)
 
+import os
+import shutil
 import logging
+import tempfile
+from numbers import Integral
+from collections import Counter
+from functools import partial
+from itertools import chain, repeat, compress, filterfalse
 from omegaconf import OmegaConf, DictConfig
+import numpy as np
 from numpy import ndarray
-from sklearn.feature_extraction.text import CountVectorizer
+from scipy.sparse import csr_matrix, vstack
+from sklearn.utils import murmurhash3_32
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from gensim.models import Word2Vec, KeyedVectors
 
 from pypipe import settings
 from pypipe.core.processes import utils
+from pypipe.core.management.managers import DataLazyManager, TokenizedCorpusManager
+from pypipe.core.management.batchers import WorkerState, check_if_executor_uses_processes
 from pypipe.core.processes.featurization.base import TextFeaturizer
+from pypipe.core.processes.featurization.indexes import IVFVectorIndex
 
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 
+# Vectorizer of each worker process, set once by '_init_transform_worker' 
+# when the worker starts.
+_worker_vectorizer: Union[CountVectorizer, HashingVectorizer] = None
+
+
+def _init_transform_worker(
+    vectorizer: Union[CountVectorizer, HashingVectorizer]
+) -> None:
+    """Sets the vectorizer used by the worker process."""
+    global _worker_vectorizer
+    _worker_vectorizer = vectorizer
+
+
+def _transform_chunk(chunk: List[str]) -> csr_matrix:
+    """Transforms a chunk of sentences in a worker process."""
+    return _worker_vectorizer.transform(chunk)
+
+
+def _transform_batch_with(
+    vectorizer: Union[CountVectorizer, HashingVectorizer], 
+    batch: List[str]
+) -> csr_matrix:
+    """Transforms a batch of sentences with the vectorizer of a worker 
+    process (see 'aprocess')."""
+    return vectorizer.transform(batch)
+
+
+def _transform_batches(
+    vectorizer: Union[CountVectorizer, HashingVectorizer],
+    batches: Iterable[List[str]],
+    workers: int
+) -> Iterable[csr_matrix]:
+    """Returns an iterator over the matrices of token counts of the batches, 
+    in their original order, transformed in worker processes if more than 
+    one worker is set. The vectorizer is sent once to each worker."""
+    if workers is not None and workers > 1:
+        return utils.imap_in_processes(
+            _transform_chunk,
+            batches,
+            workers=workers,
+            initializer=_init_transform_worker,
+            initargs=(vectorizer,)
+        )
+    return map(vectorizer.transform, batches)
+
+
+def _analyzes_tokens_independently(
+    vectorizer: Union[CountVectorizer, HashingVectorizer]
+) -> bool:
+    """Checks if the vectorizer splits a sentence into the same terms as 
+    the concatenation of the terms of each of its whitespace-separated 
+    tokens: word unigrams with the default preprocessor, tokenizer and 
+    token pattern, whose matches can't span whitespace."""
+    return (
+        vectorizer.analyzer == "word"
+        and tuple(vectorizer.ngram_range) == (1, 1)
+        and vectorizer.preprocessor is None
+        and vectorizer.tokenizer is None
+        and vectorizer.token_pattern == CountVectorizer().token_pattern
+    )
+
+
+def _analyze_token_cache_vocabulary(
+    token_cache: TokenizedCorpusManager,
+    analyzer: Callable[[str], List[str]]
+) -> Tuple[List[str], ndarray, ndarray]:
+    """
+    Analyzes each distinct token of the token cache once. Returns the 
+    distinct terms, in first-seen order, and a ragged map from token id 
+    to term ids: the terms of token 'i' are term_ids[indptr[i]: 
+    indptr[i + 1]].
+    """
+    term2idx: Dict[str, int] = {}
+    tokens_terms = [
+        [term2idx.setdefault(term, len(term2idx)) for term in analyzer(token)]
+        for token in token_cache.vocab
+    ]
+    lengths = np.fromiter(map(len, tokens_terms), dtype=np.int64, count=len(tokens_terms))
+    indptr = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths)])
+    term_ids = np.fromiter(
+        chain.from_iterable(tokens_terms), dtype=np.int64, count=int(indptr[-1])
+    )
+    return list(term2idx), indptr, term_ids
+
+
+def _get_token_idxs(
+    key_to_index: Dict[str, int], 
+    unk_token: Optional[str], 
+    sents: List[List[str]]
+) -> Tuple[ndarray, ndarray]:
+    """
+    Maps the tokens of the sentences to the rows of their vectors, in 
+    bulk. Unknown tokens are mapped to the vector of 'unk_token', and 
+    dropped only if it is not in the vocabulary (e.g. 'unk_token' is 
+    None, or the vocabulary was loaded without it). Returns the rows 
+    and the number of mapped tokens of each sentence.
+    """
+    unk_idx = key_to_index.get(unk_token, -1)
+    tokens = list(chain.from_iterable(sents))
+    idxs = np.fromiter(
+        map(key_to_index.get, tokens, repeat(unk_idx)), 
+        dtype=np.int64, 
+        count=len(tokens)
+    )
+    lengths = np.fromiter(map(len, sents), dtype=np.int64, count=len(sents))
+    if unk_idx == -1:
+        known = idxs != -1
+        doc_ids = np.repeat(np.arange(len(sents)), lengths)
+        lengths = np.bincount(doc_ids[known], minlength=len(sents))
+        idxs = idxs[known]
+    return idxs, lengths
+
+
+def _pool_vectors(
+    wv: KeyedVectors,
+    unk_token: Optional[str],
+    pooling: str,
+    idf: Optional[ndarray],
+    batch: List[str]
+) -> ndarray:
+    """Returns a matrix with the vector of each sentence of the batch, 
+    pooled from the vectors of its tokens (see 'Word2VecFeaturizer.
+    embed_documents'). 'idf' is the float32 inverse document frequency 
+    of each word for 'tfidf' pooling, and None otherwise."""
+    sents = list(map(str.split, batch))
+    idxs, lengths = _get_token_idxs(wv.key_to_index, unk_token, sents)
+    weights = np.ones(len(idxs), dtype=np.float32) if idf is None else idf[idxs]
+    if pooling != "sum":
+        totals = np.zeros(len(sents), dtype=np.float32)
+        nonempty = lengths > 0
+        starts = np.cumsum(lengths) - lengths
+        totals[nonempty] = np.add.reduceat(weights, starts[nonempty])
+        weights = weights / np.repeat(totals, lengths)
+    # segment reduction of the vectors of each sentence, as the product 
+    # of a sparse (sentence x word) weight matrix and the vectors, so the 
+    # vectors of the tokens are not copied
+    pooling_matrix = csr_matrix(
+        (weights, idxs, np.concatenate([[0], np.cumsum(lengths)])), 
+        shape=(len(sents), len(wv))
+    )
+    return np.asarray(pooling_matrix @ wv.vectors, dtype=np.float32)
+
+
+def _load_worker_vectors(
+    loader: type, 
+    path: str, 
+    mmap: Optional[str]
+) -> KeyedVectors:
+    """Loads the vectors of a worker process from a Word2Vec or 
+    KeyedVectors file, memory-mapped with the 'mmap' mode, so worker 
+    processes share a single copy in the page cache."""
+    vectors = loader.load(path, mmap=mmap)
+    return vectors.wv if isinstance(vectors, Word2Vec) else vectors
+
+
 class CountVecFeaturizer(TextFeaturizer):
     """
     Sparse feautrizer based on Sklearn CountVectorizer.
@@ -62,10 +241,18 @@ class CountVecFeaturizer(TextFeaturizer):
         
         self._path_to_get_trained_model = self._configs.path_to_get_trained_model
         self._path_to_get_stored_vocabulary = self._configs.path_to_get_stored_vocabulary
+        self._path_to_get_vocabulary_delta = self._configs.get(
+            "path_to_get_vocabulary_delta", None
+        )
         
         self._use_own_vocabulary_creator = self._configs.use_own_vocabulary_creator
         
         self._update_stored_vocabulary = self._configs.update_stored_vocabulary
+        
+        self._workers = self._configs.get("workers", 1)
+        
+        self._streaming_fit = self._configs.get("streaming_fit", False)
+        self._chunk_size = self._configs.get("chunk_size", 10000)
 
     @classmethod
     def get_isolated_process(
@@ -95,7 +282,11 @@ class CountVecFeaturizer(TextFeaturizer):
             "use_own_vocabulary_creator": True,
             "unk_token": "<<UNK>>",
             "path_to_save_model": None,
-            "path_to_save_vocabulary": None
+            "path_to_save_vocabulary": None,
+            "workers": 1,
+            "streaming_fit": False,
+            "chunk_size": 10000,
+            "path_to_get_vocabulary_delta": None
         })
 
     def _check_if_trained_featurizer_exists_and_load_it(self) -> bool:
@@ -106,8 +297,35 @@ class CountVecFeaturizer(TextFeaturizer):
             callback_fn_to_load_data=utils.load_data_with_pickle,
             path_to_load_data=self._path_to_get_trained_model
         )
+        if self.featurizer is not None:
+            self._apply_stored_vocabulary_delta()
         return self.featurizer is not None
     
+    def _apply_stored_vocabulary_delta(self) -> None:
+        """Appends to the loaded featurizer vocabulary the terms added by 
+        'partial_fit' and persisted in the vocabulary delta file set in 
+        the configurations, if present. Terms already in the vocabulary 
+        are skipped, so a delta can be applied more than once."""
+        deltas = TextFeaturizer.data_manager.load_data_from_callable(
+            callback_fn_to_load_data=utils.open_json_lines_as_dicts,
+            path_to_load_data=self._path_to_get_vocabulary_delta
+        )
+        if not deltas or not hasattr(self.featurizer, "vocabulary_"):
+            return
+        
+        vocabulary = self.featurizer.vocabulary_
+        for delta in deltas:
+            for term, idx in delta.items():
+                if term in vocabulary:
+                    continue
+                if idx != len(vocabulary):
+                    raise ValueError(
+                        f"Invalid vocabulary delta in "
+                        f"'{self._path_to_get_vocabulary_delta}'. Expected index "
+                        f"{len(vocabulary)} for term '{term}' but {idx} was found"
+                    )
+                vocabulary[term] = idx
+    
     def _check_if_stored_vocabulary_exists_and_load_it(self) -> bool:
         """Checks if a vocabulary was set in the configurations and
         loads it if present."""
@@ -151,7 +369,8 @@ class CountVecFeaturizer(TextFeaturizer):
         else:
             self.vocab = super().create_vocab(
                 data=self._trainset,
-                unk_text=self._unk_token
+                unk_text=self._unk_token,
+                workers=self._workers
             )
             logger.info(
                 "A new vocabulary for 'CountVecFeaturizer' "
@@ -202,10 +421,185 @@ class CountVecFeaturizer(TextFeaturizer):
                 vocab_to_update[word] = len(vocab_to_update)
         return vocab_to_update
 
+    def _get_unseen_terms(self, data: Iterable[str]) -> List[str]:
+        """Returns the terms of the data corpus (as split by the 
+        CountVectorizer analyzer) that are not in the featurizer 
+        vocabulary, in first-seen order."""
+        analyzer = self.featurizer.build_analyzer()
+        vocabulary = self.featurizer.vocabulary_
+        unseen_terms = {}
+        for batch in self._iter_batches(data, self._chunk_size):
+            terms = dict.fromkeys(chain.from_iterable(map(analyzer, batch)))
+            unseen_terms.update(
+                dict.fromkeys(filterfalse(vocabulary.__contains__, terms))
+            )
+        return list(unseen_terms)
+    
+    def partial_fit(
+        self, 
+        data: Iterable[str], 
+        persist: bool = False
+    ) -> Dict[str, int]:
+        """
+        Incrementally updates the trained CountVectorizer object by 
+        appending the unseen terms of the data corpus to its vocabulary, 
+        in first-seen order, without refitting: the indices of the known 
+        terms don't change. 'min_df', 'max_df' and 'max_features' are not 
+        applied to the appended terms.
+        
+        If there is no trained featurizer to load, it is trained from 
+        scratch with the data corpus.
+        
+        Returns the appended terms and their indices (the vocabulary delta).
+        
+        args:
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object.
+            persist: Whether to append the vocabulary delta to the 
+                vocabulary delta file ('vocab_delta.jsonl'), instead of 
+                persisting the whole model. Defaults to False.
+        """
+        if self.featurizer is None:
+            self._check_if_trained_featurizer_exists_and_load_it()
+        
+        if self.featurizer is None or not hasattr(self.featurizer, "vocabulary_"):
+            self.train(trainset=data, persist=persist)
+            return dict(self.featurizer.vocabulary_)
+        
+        unseen_terms = self._get_unseen_terms(data)
+        first_idx = len(self.featurizer.vocabulary_)
+        delta = dict(
+            zip(unseen_terms, range(first_idx, first_idx + len(unseen_terms)))
+        )
+        self.featurizer.vocabulary_.update(delta)
+        if hasattr(self.featurizer, "stop_words_"):
+            self.featurizer.stop_words_.difference_update(delta)
+        
+        if persist and delta:
+            self._persist_vocab_delta(delta)
+        return delta
+    
+    def _can_use_token_cache(self) -> bool:
+        """Checks if a token cache is set and the CountVectorizer terms can 
+        be computed from its tokens."""
+        return (
+            self.token_cache is not None 
+            and _analyzes_tokens_independently(self.featurizer)
+        )
+    
+    def _count_term_frequencies_from_token_cache(self) -> Tuple[Counter, Counter, int]:
+        """
+        Same as '_count_term_frequencies', but reading the token ids of the 
+        token cache: each distinct token is analyzed once, and the terms 
+        of each batch of sentences are counted with numpy.
+        """
+        terms, indptr, token_term_ids = _analyze_token_cache_vocabulary(
+            self.token_cache, 
+            self.featurizer.build_analyzer()
+        )
+        n_terms = len(terms)
+        tf = np.zeros(n_terms, dtype=np.int64)
+        df = np.zeros(n_terms, dtype=np.int64)
+        for ids, offsets in self.token_cache.iter_id_batches():
+            lengths = np.diff(indptr)[ids]
+            ends = np.cumsum(lengths)
+            # positions in 'token_term_ids' of the terms of each token
+            positions = np.arange(int(ends[-1]) if len(ends) else 0) + np.repeat(
+                indptr[ids] - (ends - lengths), lengths
+            )
+            term_ids = token_term_ids[positions]
+            docs = np.repeat(
+                np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)), lengths
+            )
+            tf += np.bincount(term_ids, minlength=n_terms)
+            df += np.bincount(
+                np.unique(docs * n_terms + term_ids) % n_terms, minlength=n_terms
+            )
+        return (
+            Counter(dict(zip(terms, tf.tolist()))), 
+            Counter(dict(zip(terms, df.tolist()))), 
+            len(self.token_cache)
+        )
+    
+    def _count_term_frequencies(self) -> Tuple[Counter, Counter, int]:
+        """
+        Reads the trainset in chunks of 'chunk_size' sentences and returns 
+        the term frequency and document frequency of each term (as split 
+        by the CountVectorizer analyzer), and the number of documents. 
+        Only the counters are kept in memory, not the document-term matrix.
+        """
+        if self._can_use_token_cache():
+            return self._count_term_frequencies_from_token_cache()
+        
+        analyzer = self.featurizer.build_analyzer()
+        tfs, dfs = Counter(), Counter()
+        n_docs = 0
+        for batch in self._iter_batches(self._trainset, self._chunk_size):
+            docs_terms = list(map(analyzer, batch))
+            tfs.update(Counter(chain.from_iterable(docs_terms)))
+            dfs.update(Counter(chain.from_iterable(map(set, docs_terms))))
+            n_docs += len(docs_terms)
+        return tfs, dfs, n_docs
+    
+    def _fit_streaming(self) -> None:
+        """
+        Fits CountVectorizer object by reading the trainset in chunks, 
+        with the same vocabulary selection as 'CountVectorizer.fit': terms 
+        sorted alphabetically and limited by 'min_df', 'max_df' and 
+        'max_features'. Fixed vocabularies don't depend on the trainset, 
+        so it is not read.
+        """
+        if self.featurizer.vocabulary is not None:
+            self.featurizer.fit([])
+            return
+        
+        self.featurizer._validate_params()
+        tfs, dfs, n_docs = self._count_term_frequencies()
+        if not tfs:
+            raise ValueError(
+                "empty vocabulary; perhaps the documents only contain stop words"
+            )
+        
+        terms = sorted(tfs)
+        df = np.fromiter(map(dfs.__getitem__, terms), dtype=np.int64, count=len(terms))
+        tf = np.fromiter(map(tfs.__getitem__, terms), dtype=np.int64, count=len(terms))
+        if self.featurizer.binary:
+            tf = df
+        
+        max_df, min_df = self.featurizer.max_df, self.featurizer.min_df
+        max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+        min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+        if max_doc_count < min_doc_count:
+            raise ValueError("max_df corresponds to < documents than min_df")
+        
+        mask = (df <= max_doc_count) & (df >= min_doc_count)
+        max_features = self.featurizer.max_features
+        if max_features is not None and mask.sum() > max_features:
+            # same selection (and tie order) as CountVectorizer
+            mask_inds = (-tf[mask]).argsort()[:max_features]
+            new_mask = np.zeros(len(df), dtype=bool)
+            new_mask[np.where(mask)[0][mask_inds]] = True
+            mask = new_mask
+        
+        if not mask.any():
+            raise ValueError(
+                "After pruning, no terms remain. Try a lower min_df or a higher max_df."
+            )
+        
+        kept_terms = compress(terms, mask)
+        self.featurizer.vocabulary_ = dict(zip(kept_terms, range(len(terms))))
+        self.featurizer.fixed_vocabulary_ = False
+        self.featurizer.stop_words_ = set(compress(terms, ~mask))
+    
     def _train(self) -> None:
-        """Fits CountVectorizer object."""
+        """Fits CountVectorizer object, reading the trainset in chunks if 
+        'streaming_fit' is True or from the token cache if it can be 
+        used."""
         logger.info("'CountVecFeaturizer' training has started")        
-        self.featurizer.fit(self._trainset)
+        if self._streaming_fit or self._can_use_token_cache():
+            self._fit_streaming()
+        else:
+            self.featurizer.fit(self._trainset)
         logger.info("'CountVecFeaturizer' training finished")
 
     def _train_loaded_featurizer(self) -> None:
@@ -267,6 +661,17 @@ class CountVecFeaturizer(TextFeaturizer):
             to_save_vocab=True
         )
         
+    def _persist_vocab_delta(self, delta: Dict[str, int]) -> None:
+        TextFeaturizer.data_manager.save_data_from_callable(
+            delta,
+            "a",
+            callback_fn_to_save_data=utils.persist_dict_as_json_line,
+            path_to_save_data=self.path_to_save_vocabulary,
+            data_file_name="/vocab_delta.jsonl",
+            alias=self._alias,
+            to_save_vocab=True
+        )
+        
     def _persist_model(self, model: CountVectorizer) -> None:
         TextFeaturizer.data_manager.save_data_from_callable(
             model,
@@ -297,25 +702,436 @@ class CountVecFeaturizer(TextFeaturizer):
                 vec_vocab = self._get_vocab_from_featurizer()
                 self._persist_vocab(vocab=vec_vocab)
     
-    def process(self, data: List[str]) -> Union(List[str], ndarray):
+    def process(
+        self, 
+        data: Iterable[str], 
+        workers: int = None,
+        lazy: bool = False
+    ) -> Union(Iterable[str], csr_matrix, Generator[csr_matrix, None, None]):
         """
         Process a data corpus of text and, if there is a trained CountVectorizer 
         object, converts it to a matrix of token counts.
+        
+        Unless the data corpus is a list processed by a single worker, it 
+        is transformed in chunks of 'chunk_size' sentences, in worker 
+        processes if more than one worker is set, and the matrices of the 
+        chunks are stacked.
 
         Args:
-            data: list of sentences. If None, returns the original data corpus 
-            without processing.
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object. If there is no trained model, returns the original 
+                data corpus without processing.
+                
+            workers: Number of worker processes. If None, the 'workers' 
+                set in the configurations is used.
+                
+            lazy: Whether to return a generator that yields the matrix of 
+                each chunk instead of the stacked matrix. Defaults to False.
         """
         if self.featurizer is None:
-            print(
+            logger.warning(
                 "It's impossible to process the input from 'CountVecFeaturizer' "
                 "because there is no trained model"
             )
             return data
+        
+        workers = self._workers if workers is None else workers
+        
+        batches = self._iter_batches(data, self._chunk_size)
+        if lazy:
+            return self.process_batches(batches, workers=workers)
+        
+        if isinstance(data, list) and (workers is None or workers <= 1):
+            return self.featurizer.transform(data)
+        
+        matrices = list(self.process_batches(batches, workers=workers))
+        if not matrices:
+            return self.featurizer.transform([])
+        return vstack(matrices, format="csr")
+    
+    def process_batches(
+        self, 
+        batches: Iterable[List[str]],
+        workers: int = None
+    ) -> Generator[csr_matrix, None, None]:
+        """
+        Lazily converts batches of sentences (e.g. the output of 
+        'DataLazyManager.iter_batches' or 'RegexNormalizer.normalize_batches') 
+        to matrices of token counts, one matrix per batch, in their 
+        original order.
+        
+        Args:
+            batches: Iterable of lists of sentences.
+            
+            workers: Number of worker processes. If None, the 'workers' 
+                set in the configurations is used.
+        """
+        if self.featurizer is None:
+            logger.warning(
+                "It's impossible to process the input from 'CountVecFeaturizer' "
+                "because there is no trained model"
+            )
+            return
+        
+        workers = self._workers if workers is None else workers
+        
+        yield from _transform_batches(self.featurizer, batches, workers)
+    
+    def _transform_batch(self, batch: List[str]) -> csr_matrix:
+        """Converts a batch of sentences to a matrix of token counts."""
+        return self.featurizer.transform(batch)
+    
+    def _get_async_batch_fn(self) -> Callable[[List[str]], csr_matrix]:
+        """Returns the batch function of 'aprocess'. Process pool executors 
+        get a module-level function, with the vectorizer sent once to each 
+        worker process (see 'WorkerState') and again when its vocabulary 
+        grows (see 'partial_fit')."""
+        if not check_if_executor_uses_processes(self.executor):
+            return self._transform_batch
+        return self._get_worker_batch_fn(
+            key=(self.featurizer, len(self.featurizer.vocabulary_)),
+            make_fn=lambda: partial(_transform_batch_with, WorkerState.of(self.featurizer))
+        )
+    
+    async def aprocess(
+        self, 
+        data: Union[Iterable[str], AsyncIterable[str]]
+    ) -> Union(Iterable[str], csr_matrix):
+        """
+        Async facade of 'process' that doesn't block the event loop: the 
+        sentences of concurrent calls are grouped into micro-batches of up 
+        to 'chunk_size' sentences, each transformed by a single call in the 
+        executor set by 'set_executor' (see 'AsyncMicroBatcher'). 
 
-        data = self.featurizer.transform(data)
+        Args:
+            data: Iterable or async iterable of sentences. If there is no 
+                trained model, returns the original data corpus without 
+                processing.
+        """
+        if self.featurizer is None:
+            logger.warning(
+                "It's impossible to process the input from 'CountVecFeaturizer' "
+                "because there is no trained model"
+            )
+            return data
         
-        return data
+        batcher = self._get_batcher(
+            self._get_async_batch_fn(), 
+            concat=partial(vstack, format="csr"),
+            max_batch_size=self._chunk_size
+        )
+        return await batcher.submit(data)
+    
+
+class HashingVecFeaturizer(TextFeaturizer):
+    """
+    Stateless sparse featurizer based on Sklearn HashingVectorizer.
+    
+    Converts a collection of text documents to a matrix of token counts 
+    by hashing each token to a column, so it needs no fit pass over the 
+    data corpus and keeps no vocabulary in memory. Chunks of the data 
+    corpus can be transformed in parallel worker processes.
+    
+    Since hashing can't be inverted, a sample of the tokens seen during 
+    training can optionally be kept to look up the tokens of a column.
+    """
+    def __init__(
+        self,
+        configs: OmegaConf, 
+        featurizer: HashingVectorizer = None,
+        alias: str = None
+    ) -> None:
+        """
+        Builds a HashingVecFeaturizer object by taking configurations
+        from the configs object.
+        
+        Args:
+            config: Featurizer configurations.
+        
+            featurizer: HashingVectorizer object. If it is None, it will 
+                be created with the 'config' settings.
+        
+            alias: Alias to recognize the featurizer within a 
+                pipeline (it is None if the featurizer is not 
+                within a pipeline).
+        """
+        super().__init__(
+            configs=configs,
+            alias=alias
+        )
+        
+        self._alias = settings.HASHINGVEC_FEATURIZER_ALIAS if alias is None else alias
+        
+        self.featurizer = featurizer
+        
+        self.path_to_save_model = self._configs.path_to_save_model 
+        self.path_to_save_vocabulary = self._configs.path_to_save_vocabulary
+        
+        self._path_to_get_trained_model = self._configs.path_to_get_trained_model
+        self._path_to_get_stored_vocabulary = self._configs.path_to_get_stored_vocabulary
+        
+        self.vocab: Dict[int, List[str]] = self._load_stored_vocabulary()
+        
+        self._vocabulary_sample_size = self._configs.vocabulary_sample_size
+        
+        self._workers = self._configs.workers
+        self._chunk_size = self._configs.chunk_size
+
+    @classmethod
+    def get_isolated_process(
+        cls, 
+        configs: OmegaConf, 
+        featurizer: HashingVectorizer = None,
+        alias: str = None,
+    ) -> HashingVecFeaturizer:
+        """Returns HashingVecFeaturizer object"""
+        return cls(
+            configs=configs,
+            featurizer=featurizer,
+            alias=alias
+        )
+        
+    @classmethod
+    def get_default_configs(cls) -> DictConfig:
+        """Returns configurations for HashingVecFeaturizer object"""
+        return OmegaConf.create({
+            "n_features": 2 ** 20,
+            "min_ngram": 1,
+            "max_ngram": 1,
+            "alternate_sign": False,
+            "norm": None,
+            "vocabulary_sample_size": 0,
+            "workers": 1,
+            "chunk_size": 10000,
+            "path_to_get_trained_model": None,
+            "path_to_get_stored_vocabulary": None,
+            "path_to_save_model": None,
+            "path_to_save_vocabulary": None
+        })
+    
+    def _load_stored_vocabulary(self) -> Dict[int, List[str]]:
+        """Loads the sampled vocabulary set in the configurations, or 
+        returns an empty one if it is not present."""
+        stored_vocab = TextFeaturizer.data_manager.load_data_from_callable(
+            callback_fn_to_load_data=utils.open_json_as_dict,
+            path_to_load_data=self._path_to_get_stored_vocabulary
+        )
+        if stored_vocab is None:
+            return {}
+        # json keys are always str
+        return {int(index): texts for index, texts in stored_vocab.items()}
+    
+    def _check_if_trained_featurizer_exists_and_load_it(self) -> bool:
+        """Checks if a featurizer was set in the configurations and loads 
+        it if present."""
+        self.featurizer = TextFeaturizer.data_manager.load_data_from_callable(
+            "rb",
+            callback_fn_to_load_data=utils.load_data_with_pickle,
+            path_to_load_data=self._path_to_get_trained_model
+        )
+        return self.featurizer is not None
+    
+    def _create_featurizer(self) -> HashingVectorizer:
+        """Returns HashingVectorizer object."""
+        return HashingVectorizer(
+            n_features=self._configs.n_features,
+            ngram_range=(self._configs.min_ngram, self._configs.max_ngram),
+            alternate_sign=self._configs.alternate_sign,
+            norm=self._configs.norm,
+            lowercase=False,
+            stop_words=None,
+            strip_accents=None,
+            analyzer="word"
+        )
+    
+    def _get_featurizer(self) -> HashingVectorizer:
+        """Returns the HashingVectorizer object, creating it if it was 
+        not set or loaded, since it doesn't need to be trained."""
+        if self.featurizer is None:
+            if not self._check_if_trained_featurizer_exists_and_load_it():
+                self.featurizer = self._create_featurizer()
+        return self.featurizer
+    
+    def get_index_by_text(self, text: str) -> int:
+        """
+        Returns the column of the matrix of token counts where the given 
+        token (or n-gram) is counted.
+        
+        args:
+            text: Token or n-gram, as returned by the featurizer analyzer.
+        """
+        return abs(murmurhash3_32(text, seed=0)) % self._get_featurizer().n_features
+    
+    def get_texts_by_index(self, index: int) -> List[str]:
+        """
+        Looks up the tokens of the sampled vocabulary that are counted in 
+        the given column. Returns an empty list if no sampled token is 
+        counted in it.
+        
+        args:
+            index: Column of the matrix of token counts.
+        """
+        return self.vocab.get(index, [])
+    
+    def _sample_vocabulary(self, trainset: Iterable[str]) -> None:
+        """Keeps the first 'vocabulary_sample_size' distinct tokens of the 
+        trainset, grouped by their column. Stops reading the trainset 
+        once the sample is full. If a token cache can be used, only its 
+        distinct tokens are read."""
+        analyzer = self._get_featurizer().build_analyzer()
+        if self.token_cache is not None and _analyzes_tokens_independently(self.featurizer):
+            batches = [self.token_cache.vocab]
+        else:
+            batches = self._iter_batches(trainset, self._chunk_size)
+        sampled = set()
+        for batch in batches:
+            for sent in batch:
+                for token in analyzer(sent):
+                    if token not in sampled:
+                        sampled.add(token)
+                        index = self.get_index_by_text(token)
+                        self.vocab.setdefault(index, []).append(token)
+                        if len(sampled) >= self._vocabulary_sample_size:
+                            return
+    
+    def train(self, trainset: Iterable[str], persist: bool = False) -> None:
+        """
+        Interface that prepares HashingVecFeaturizer object. HashingVectorizer 
+        doesn't need a fit pass, so the trainset is only read to sample a 
+        vocabulary if 'vocabulary_sample_size' is greater than 0.
+        
+        args:
+            trainset: training data corpus, an iterable of sentences.
+        """
+        self._get_featurizer()
+        
+        if self._vocabulary_sample_size:
+            self.vocab = {}
+            self._sample_vocabulary(trainset)
+        
+        if persist:
+            self.persist(model=True, vocab=bool(self.vocab))
+    
+    def load(self, data: Optional(str, HashingVectorizer) = None) -> None:
+        """
+        Loads HashingVectorizer object.
+        
+        args:
+            data: HashingVectorizer object or path to a persisted one.
+        """
+        if isinstance(data, HashingVectorizer):
+            self.featurizer = data
+        else:
+            if isinstance(data, str):
+                self._path_to_get_trained_model = data
+            self._check_if_trained_featurizer_exists_and_load_it()
+    
+    def persist(self, model: bool = True, vocab: bool = False) -> None:
+        if model:
+            TextFeaturizer.data_manager.save_data_from_callable(
+                self._get_featurizer(),
+                "wb",
+                callback_fn_to_save_data=utils.persist_data_with_pickle,
+                path_to_save_data=self.path_to_save_model,
+                data_file_name="/hashing_vectorizer.pkl",
+                alias=self._alias
+            )
+        
+        if vocab:
+            TextFeaturizer.data_manager.save_data_from_callable(
+                self.vocab,
+                "w",
+                callback_fn_to_save_data=utils.persist_dict_as_json,
+                path_to_save_data=self.path_to_save_vocabulary,
+                data_file_name="/hashing_vocab.json",
+                alias=self._alias,
+                to_save_vocab=True
+            )
+    
+    def process_batches(
+        self, 
+        batches: Iterable[List[str]],
+        workers: int = None
+    ) -> Generator[csr_matrix, None, None]:
+        """
+        Lazily converts batches of sentences to matrices of token counts, 
+        one matrix per batch, in their original order.
+        
+        Args:
+            batches: Iterable of lists of sentences.
+            
+            workers: Number of worker processes. If None, the 'workers' 
+                set in the configurations is used.
+        """
+        workers = self._workers if workers is None else workers
+        
+        yield from _transform_batches(self._get_featurizer(), batches, workers)
+    
+    def process(
+        self, 
+        data: Iterable[str], 
+        workers: int = None,
+        lazy: bool = False
+    ) -> Union(csr_matrix, Generator[csr_matrix, None, None]):
+        """
+        Converts a data corpus of text to a matrix of token counts, 
+        transforming chunks of 'chunk_size' sentences in parallel if 
+        more than one worker is set.
+
+        Args:
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object.
+                
+            workers: Number of worker processes. If None, the 'workers' 
+                set in the configurations is used.
+                
+            lazy: Whether to return a generator that yields the matrix of 
+                each chunk instead of the stacked matrix. Defaults to False.
+        """
+        batches = self._iter_batches(data, self._chunk_size)
+        if lazy:
+            return self.process_batches(batches, workers=workers)
+        
+        matrices = list(self.process_batches(batches, workers=workers))
+        if not matrices:
+            return csr_matrix((0, self._get_featurizer().n_features))
+        return vstack(matrices, format="csr")
+    
+    def _transform_batch(self, batch: List[str]) -> csr_matrix:
+        """Converts a batch of sentences to a matrix of token counts."""
+        return self._get_featurizer().transform(batch)
+    
+    def _get_async_batch_fn(self) -> Callable[[List[str]], csr_matrix]:
+        """Returns the batch function of 'aprocess'. Process pool executors 
+        get a module-level function, with the vectorizer sent once to each 
+        worker process (see 'WorkerState')."""
+        if not check_if_executor_uses_processes(self.executor):
+            return self._transform_batch
+        vectorizer = self._get_featurizer()
+        return self._get_worker_batch_fn(
+            key=vectorizer,
+            make_fn=lambda: partial(_transform_batch_with, WorkerState.of(vectorizer))
+        )
+    
+    async def aprocess(
+        self, 
+        data: Union[Iterable[str], AsyncIterable[str]]
+    ) -> csr_matrix:
+        """
+        Async facade of 'process' that doesn't block the event loop: the 
+        sentences of concurrent calls are grouped into micro-batches of up 
+        to 'chunk_size' sentences, each transformed by a single call in the 
+        executor set by 'set_executor' (see 'AsyncMicroBatcher'). 
+
+        Args:
+            data: Iterable or async iterable of sentences.
+        """
+        batcher = self._get_batcher(
+            self._get_async_batch_fn(), 
+            concat=partial(vstack, format="csr"),
+            max_batch_size=self._chunk_size
+        )
+        return await batcher.submit(data)
     
 
 class Word2VecFeaturizer(TextFeaturizer):
@@ -324,7 +1140,29 @@ class Word2VecFeaturizer(TextFeaturizer):
     
     The Gensim word2vec algorithms include skip-gram and CBOW models, using
     either hierarchical softmax or negative sampling.
+    
+    Training modes ('training_mode' configuration):
+    - 'corpus_file': trains through Gensim 'corpus_file' mode, that reads 
+    the sentences from a text file in parallel, outside of the GIL. File 
+    data corpora are read directly, other data corpora are written once 
+    to a temporary file.
+    - 'streaming': tokenizes the trainset once into a memory-mapped 
+    TokenizedCorpusManager object (or reads the token cache, if it is 
+    set), that is iterated again on each epoch. 
+    Memory doesn't grow with the size of the trainset, and every sentence 
+    (including repeated ones) is counted.
+    - 'vocabulary': trains on the unique sentences of a VocabularyManager 
+    object.
+    
+    In every training mode the vocabulary holds 'unk_token', whose vector 
+    is taken by unknown tokens. In 'corpus_file' and 'streaming' modes 
+    unknown words are not replaced in the corpus, so 'unk_token' is added 
+    to the vocabulary and its vector is the mean of the trained vectors.
     """
+    training_modes = ("corpus_file", "streaming", "vocabulary")
+    pooling_methods = ("mean", "sum", "tfidf")
+    fingerprint_suffix = ".fingerprint"
+    
     def __init__(
         self,
         configs: OmegaConf, 
@@ -360,6 +1198,39 @@ class Word2VecFeaturizer(TextFeaturizer):
         
         self._update_stored_vocabulary = self._configs.update_stored_vocabulary
         
+        self._workers = self._configs.get("workers", 1)
+        
+        self._max_vocab_size = self._configs.get("max_vocab_size", None)
+        
+        self._vectors_mmap = self._configs.get("vectors_mmap", "r")
+        
+        self._pooling = self._configs.get("pooling", "mean")
+        self._chunk_size = self._configs.get("chunk_size", 10000)
+        self.idf: Optional[ndarray] = None
+        
+        self._index_n_lists = self._configs.get("index_n_lists", None)
+        self._index_n_probe = self._configs.get("index_n_probe", 8)
+        self._persist_vector_index = self._configs.get("persist_vector_index", False)
+        self.vector_index: Optional[IVFVectorIndex] = None
+        self._fingerprinted_vectors: Optional[ndarray] = None
+        self._vectors_fingerprint: Optional[str] = None
+        self._vectors_file: Optional[Tuple[type, str]] = None
+        self._spilled_vectors_dir: Optional[str] = None
+        
+        self._training_mode = self._configs.get("training_mode", "corpus_file")
+        if self._training_mode not in self.training_modes:
+            raise ValueError(
+                f"Invalid training mode '{self._training_mode}' for "
+                f"'Word2VecFeaturizer'. Expected one of {self.training_modes}"
+            )
+        
+        self._unk_token_added = False
+        
+        self._corpus_file: Optional[str] = None
+        self._spilled_corpus_file: Optional[str] = None
+        self._tokenized_corpus: Optional[TokenizedCorpusManager] = None
+        self._corpus_total_words = 0
+        
         self.path_to_save_model = self._configs.path_to_save_model
         self.path_to_save_vocabulary = self._configs.path_to_save_vocabulary
         self.path_to_save_vectors = self._configs.path_to_save_vectors
@@ -367,6 +1238,7 @@ class Word2VecFeaturizer(TextFeaturizer):
         self._path_to_trained_model = self._configs.path_to_get_trained_model
         self._path_to_get_trained_vectors = self._configs.path_to_get_trained_vectors
         self._path_to_get_stored_vocabulary = self._configs.path_to_get_stored_vocabulary
+        self._path_to_get_vector_index = self._configs.get("path_to_get_vector_index", None)
                 
         if self._path_to_get_stored_vocabulary is not None:
             if self._path_to_get_trained_vectors is not None:
@@ -404,21 +1276,50 @@ class Word2VecFeaturizer(TextFeaturizer):
             "window": 5,
             "epochs": 5,
             "seed": None,
+            "unk_token": "<<UNK>>",
             "path_to_save_model": None,
             "path_to_save_vocabulary": None,
+            "path_to_save_vectors": None,
             "path_to_get_trained_model": None,
             "path_to_get_stored_vocabulary": None,
-            "update_stored_vocabulary": False
+            "path_to_get_trained_vectors": None,
+            "update_stored_vocabulary": False,
+            "workers": 4,
+            "max_vocab_size": None,
+            "training_mode": "corpus_file",
+            "vectors_mmap": "r",
+            "pooling": "mean",
+            "chunk_size": 10000,
+            "index_n_lists": None,
+            "index_n_probe": 8,
+            "persist_vector_index": False,
+            "path_to_get_vector_index": None
         })
             
-    def _check_if_trained_featurizer_exists_and_load_it(self) -> bool:
+    def _check_if_trained_featurizer_exists_and_load_it(
+        self, 
+        mmap: Optional[str] = None
+    ) -> bool:
         """Checks if a trained featurizer was set in the configurations 
-        and loads it if present."""
+        and loads it if present. Arrays saved in separate '.npy' files 
+        are memory-mapped with the 'mmap' mode, if it is not None."""
         self.featurizer = TextFeaturizer.data_manager.load_data_from_callable(
-            callback_fn_to_load_data=Word2Vec.load,
+            callback_fn_to_load_data=partial(Word2Vec.load, mmap=mmap),
             path_to_load_data=self._path_to_trained_model
         )
-        return self.featurizer is not None
+        if self.featurizer is None:
+            return False
+        self._load_vectors_fingerprint(self._path_to_trained_model)
+        self._set_vectors_file((Word2Vec, self._path_to_trained_model))
+        return True
+    
+    def _read_arrays_into_memory(self) -> None:
+        """Replaces the memory-mapped arrays of the featurizer with copies 
+        in memory, since read-only arrays can't be trained further."""
+        for obj in (self.featurizer, self.featurizer.wv):
+            for attr, value in vars(obj).items():
+                if isinstance(value, np.memmap):
+                    setattr(obj, attr, np.array(value))
         
     def _load_featurizer_params(self) -> None:        
         """Loads necessary parameters to create Word2Vec object."""
@@ -440,7 +1341,7 @@ class Word2VecFeaturizer(TextFeaturizer):
             "window": self._configs.window,
             "seed": self._configs.seed,
             "sg": self._sg,
-            "workers": 4, # parallel only works if you have installed cpython
+            "workers": self._workers,
             # "negative": "TODO",
             "ns_exponent": 0.75
         }
@@ -448,20 +1349,104 @@ class Word2VecFeaturizer(TextFeaturizer):
     def _load_train_params(self) -> None:
         """Loads necessary parameters to train Word2Vec object."""
         self._train_params = {
-            "corpus_iterable": self._vocab,
-            "total_examples": self.featurizer.corpus_count,
             "epochs": self._configs.epochs,
             "start_alpha": None,
             "end_alpha": None
         }
+        if self._corpus_file is not None:
+            self._train_params.update({
+                "corpus_file": self._corpus_file,
+                "total_words": self._corpus_total_words
+            })
+        elif self._tokenized_corpus is not None:
+            self._train_params.update({
+                "corpus_iterable": self._tokenized_corpus,
+                "total_examples": len(self._tokenized_corpus)
+            })
+        else:
+            self._train_params.update({
+                "corpus_iterable": self._vocab,
+                "total_examples": self.featurizer.corpus_count
+            })
     
-    def _load_vectors(self, path_to_vectors: str) -> KeyedVectors:
+    def _load_vectors(
+        self, 
+        path_to_vectors: str, 
+        mmap: Optional[str] = None
+    ) -> KeyedVectors:
         """Loads KeyedVectors object from configuratios with a representation 
-        of trained dense vectors."""
+        of trained dense vectors. Vectors saved in a separate '.npy' file 
+        (see '_save_vectors') are memory-mapped with the 'mmap' mode, if it 
+        is not None. Word2vec '.bin' files are always read into memory."""
         if utils.check_if_dir_extension_is('.bin', path_to_vectors):
             return KeyedVectors.load_word2vec_format(path_to_vectors, binary=True)
         else:
-            return KeyedVectors.load(path_to_vectors)
+            return KeyedVectors.load(path_to_vectors, mmap=mmap)
+    
+    def _save_vectors(self, path: str) -> None:
+        """Saves KeyedVectors object with the vectors in a separate '.npy' 
+        file next to it, that can be memory-mapped when loaded, and their 
+        fingerprint. Norms are not saved, they are computed again when 
+        needed."""
+        self.featurizer.wv.save(path, separately=["vectors"], ignore=["norms"])
+        self._save_vectors_fingerprint(path)
+        self._set_vectors_file((KeyedVectors, path))
+    
+    def _save_model(self, path: str) -> None:
+        """Saves Word2Vec object and the fingerprint of its vectors."""
+        self.featurizer.save(path)
+        self._save_vectors_fingerprint(path)
+        self._set_vectors_file((Word2Vec, path))
+    
+    def _set_vectors_file(self, vectors_file: Optional[Tuple[type, str]]) -> None:
+        """Sets the class and the path of the file that holds the current 
+        vectors, or None if they are not saved, removing the temporary 
+        file written by '_get_vectors_file'."""
+        if self._spilled_vectors_dir is not None:
+            shutil.rmtree(self._spilled_vectors_dir, ignore_errors=True)
+            self._spilled_vectors_dir = None
+        self._vectors_file = vectors_file
+    
+    def _get_vectors_file(self) -> Tuple[type, str]:
+        """Returns the class and the path of the file that holds the current 
+        vectors, or writes them to a temporary file if they are not saved 
+        (e.g. trained and not persisted)."""
+        if self._vectors_file is None:
+            spilled_vectors_dir = tempfile.mkdtemp()
+            self._save_vectors(os.path.join(spilled_vectors_dir, "word2vec_vectors.kv"))
+            self._spilled_vectors_dir = spilled_vectors_dir
+            logger.info(
+                f"'Word2VecFeaturizer' vectors were written to "
+                f"'{spilled_vectors_dir}' to be loaded by worker processes"
+            )
+        return self._vectors_file
+    
+    def _get_vectors_fingerprint(self) -> str:
+        """Returns the fingerprint of the vectors (see 
+        'IVFVectorIndex.fingerprint_vectors'). It is only computed if it was 
+        not saved with the vectors nor computed before for the same array, 
+        so vectors changed in place must reset it (see 'train')."""
+        vectors = self.featurizer.wv.vectors
+        if self._fingerprinted_vectors is not vectors:
+            self._vectors_fingerprint = IVFVectorIndex.fingerprint_vectors(vectors)
+            self._fingerprinted_vectors = vectors
+        return self._vectors_fingerprint
+    
+    def _save_vectors_fingerprint(self, path: str) -> None:
+        """Saves the fingerprint of the vectors next to the file in 'path', 
+        so indexes are checked against them without hashing the vectors 
+        again when they are loaded."""
+        with open(path + self.fingerprint_suffix, "w") as f:
+            f.write(self._get_vectors_fingerprint())
+    
+    def _load_vectors_fingerprint(self, path: str) -> None:
+        """Sets the fingerprint saved next to the file in 'path' as the 
+        fingerprint of the vectors, if it exists."""
+        self._fingerprinted_vectors = None
+        if os.path.exists(path + self.fingerprint_suffix):
+            with open(path + self.fingerprint_suffix) as f:
+                self._vectors_fingerprint = f.read().strip()
+            self._fingerprinted_vectors = self.featurizer.wv.vectors
     
     def _prepare_vocabulary_from_loaded_vocab(self, update: bool) -> None:
         """Loads word-freq dictionary from configuratios and and sets it 
@@ -479,6 +1464,7 @@ class Word2VecFeaturizer(TextFeaturizer):
     def _prepare_vocabulary_from_pretrained_vectors(self, update: bool) -> None:
         """Loads pretrained vectors from configuratios and sets it as Word2Vec
         vocab."""
+        # read into memory, since the vectors are trained further
         wv = self._load_vectors(self._path_to_get_trained_vectors)
         
         self.featurizer.build_vocab_from_freq(
@@ -487,6 +1473,125 @@ class Word2VecFeaturizer(TextFeaturizer):
         )
         
         self.featurizer.wv.vectors = wv.vectors
+    
+    def _count_word_freq(
+        self, 
+        sentences: Iterable[List[str]]
+    ) -> Tuple[Dict[str, int], int, int]:
+        """Counts the words of the tokenized sentences, in first-seen order, 
+        pruning the least frequent ones if the vocabulary exceeds 
+        'max_vocab_size'. Returns the word frequencies and the number of 
+        sentences and words."""
+        word_vocab = super().create_vocab(
+            data=[],
+            unk_text=None,
+            count_freq=True,
+            max_size=self._max_vocab_size
+        )
+        n_sents = n_words = 0
+        for sents in utils.chunk_iterable(sentences, 10000):
+            words = list(chain.from_iterable(sents))
+            word_vocab.add_texts(words)
+            n_sents += len(sents)
+            n_words += len(words)
+        return word_vocab.get_text2freq(), n_sents, n_words
+    
+    def _get_corpus_file(self, trainset: Union[Iterable[str], str]) -> str:
+        """Returns the path of the trainset if it is a whole uncompressed 
+        file (e.g. a normalized corpus persisted by a normalizer), or 
+        writes the trainset to a temporary file and returns its path."""
+        if isinstance(trainset, str):
+            trainset = DataLazyManager(trainset)
+        if isinstance(trainset, DataLazyManager):
+            path = trainset.get_file_path()
+            if path is not None:
+                return path
+        
+        batches = self._iter_batches(trainset, 10000)
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False, encoding="utf-8"
+        ) as f:
+            self._spilled_corpus_file = f.name
+            for batch in batches:
+                f.write("\n".join(batch))
+                f.write("\n")
+        logger.info(
+            f"'Word2VecFeaturizer' trainset was written to "
+            f"'{self._spilled_corpus_file}' to train in 'corpus_file' mode"
+        )
+        return self._spilled_corpus_file
+    
+    def _get_tokenized_corpus(
+        self, 
+        trainset: Union[Iterable[str], str]
+    ) -> TokenizedCorpusManager:
+        """Returns the token cache if it is set, or tokenizes the trainset 
+        once into a temporary memory-mapped TokenizedCorpusManager object."""
+        if self.token_cache is not None:
+            self._tokenized_corpus = self.token_cache
+            return self._tokenized_corpus
+        if isinstance(trainset, str):
+            trainset = DataLazyManager(trainset)
+        self._tokenized_corpus = TokenizedCorpusManager.build(trainset)
+        logger.info(
+            f"'Word2VecFeaturizer' trainset was tokenized into "
+            f"'{self._tokenized_corpus.path}' to train in 'streaming' mode"
+        )
+        return self._tokenized_corpus
+    
+    def _get_word_freq_from_tokenized_corpus(
+        self, 
+        corpus: TokenizedCorpusManager
+    ) -> Dict[str, int]:
+        """Returns the word frequencies counted while tokenizing, keeping 
+        only the 'max_vocab_size' most frequent words (in first-seen 
+        order) if it is set."""
+        word_freq = corpus.vocab.get_text2freq()
+        if self._max_vocab_size is not None and len(word_freq) > self._max_vocab_size:
+            freqs = np.fromiter(word_freq.values(), dtype=np.int64, count=len(word_freq))
+            keep = np.zeros(len(freqs), dtype=bool)
+            keep[np.argsort(-freqs, kind="stable")[:self._max_vocab_size]] = True
+            word_freq = dict(compress(word_freq.items(), keep.tolist()))
+        return word_freq
+    
+    def _add_unk_token(self, word_freq: Dict[str, int]) -> Dict[str, int]:
+        """Returns a copy of the word frequencies with 'unk_token', with the 
+        minimum count kept in the vocabulary, if it doesn't occur in the 
+        trainset (see '_set_unk_vector')."""
+        self._unk_token_added = (
+            self._unk_token is not None and self._unk_token not in word_freq
+        )
+        if self._unk_token_added:
+            word_freq = dict(word_freq)
+            word_freq[self._unk_token] = max(self._configs.ignore_freq_higher_than, 1)
+        return word_freq
+    
+    def _set_unk_vector(self) -> None:
+        """Sets the vector of 'unk_token' to the mean of the other vectors, 
+        if it was added to the vocabulary by '_add_unk_token', since it 
+        is not trained."""
+        if not self._unk_token_added:
+            return
+        wv = self.featurizer.wv
+        unk_idx = wv.key_to_index[self._unk_token]
+        if len(wv) > 1:
+            total = wv.vectors.sum(axis=0, dtype=np.float64) - wv.vectors[unk_idx]
+            wv.vectors[unk_idx] = total / (len(wv) - 1)
+        wv.norms = None
+        self._unk_token_added = False
+    
+    def _remove_temporary_corpus(self) -> None:
+        """Removes the temporary file written by '_get_corpus_file' and the 
+        temporary directory written by '_get_tokenized_corpus' (the token 
+        cache is kept)."""
+        if self._spilled_corpus_file is not None:
+            os.remove(self._spilled_corpus_file)
+            self._spilled_corpus_file = None
+        if self._tokenized_corpus is not None:
+            if self._tokenized_corpus is not self.token_cache:
+                self._tokenized_corpus.remove()
+            self._tokenized_corpus = None
+        self._corpus_file = None
         
     def _prepare_vocabulary(self) -> None:
         """
@@ -494,13 +1599,28 @@ class Word2VecFeaturizer(TextFeaturizer):
         can be loaded in different ways: 
         - from pre-trained dense vectors
         - from a frequency dictionary
-        - from the generator created by the Vocabulary object.
+        - from the words counted in the trainset (in 'corpus_file' and 
+        'streaming' modes) or in the generator created by the Vocabulary 
+        object.
         """
-        self._vocab = super().create_vocab(
-            data=self._vocab, 
-            data2sent=True,
-            unk_text=self._unk_token
-        )
+        word_freq = None
+        if self._training_mode == "corpus_file":
+            self._corpus_file = self._get_corpus_file(self._vocab)
+            word_freq, corpus_count, self._corpus_total_words = self._count_word_freq(
+                map(str.split, DataLazyManager(self._corpus_file))
+            )
+        elif self._training_mode == "streaming":
+            corpus = self._get_tokenized_corpus(self._vocab)
+            word_freq = self._get_word_freq_from_tokenized_corpus(corpus)
+            corpus_count, self._corpus_total_words = len(corpus), corpus.n_tokens
+        else:
+            self._vocab = super().create_vocab(
+                data=self._vocab, 
+                data2sent=True,
+                unk_text=self._unk_token,
+                workers=self._workers
+            )
+            corpus_count = len(self._vocab)
         
         if self.featurizer.wv.key_to_index:
             update = self._update_stored_vocabulary
@@ -511,9 +1631,16 @@ class Word2VecFeaturizer(TextFeaturizer):
             self._prepare_vocabulary_from_pretrained_vectors(update)
         elif self._path_to_get_stored_vocabulary is not None:
             self._prepare_vocabulary_from_loaded_vocab(update)
-        else:       
-            self.featurizer.build_vocab(
-                data_iterable=self._vocab,
+        else:
+            # counted by the VocabularyManager, so Word2Vec doesn't scan 
+            # the corpus again
+            if word_freq is None:
+                word_freq, _, _ = self._count_word_freq(self._vocab)
+            else:
+                word_freq = self._add_unk_token(word_freq)
+            self.featurizer.build_vocab_from_freq(
+                word_freq=word_freq,
+                corpus_count=corpus_count,
                 update=update
             )
     
@@ -523,13 +1650,18 @@ class Word2VecFeaturizer(TextFeaturizer):
     
     def _train(self) -> None:
         """Trains Word2Vec object."""
-        self._prepare_vocabulary()
-        self._load_train_params()
-        logger.info("'Word2VecFeaturizer' training has started")
-        self.featurizer.train(**self._train_params)
-        logger.info("'Word2VecFeaturizer' training finished")
+        try:
+            self._prepare_vocabulary()
+            self._load_train_params()
+            logger.info("'Word2VecFeaturizer' training has started")
+            self.featurizer.train(**self._train_params)
+            self._set_unk_vector()
+            logger.info("'Word2VecFeaturizer' training finished")
+        finally:
+            self._remove_temporary_corpus()
     
     def _train_loaded_featurizer(self) -> None:
+        self._read_arrays_into_memory()
         self._train()
         
     def _train_featurizer_from_scratch(self) -> None:
@@ -557,44 +1689,85 @@ class Word2VecFeaturizer(TextFeaturizer):
         else:
             self._train_loaded_featurizer()
         
+        # the index and the fingerprint of the previous vectors are 
+        # computed again when they are needed, since the vectors may have 
+        # been trained in place
+        self.vector_index = None
+        self._path_to_get_vector_index = None
+        self._fingerprinted_vectors = None
+        self._set_vectors_file(None)
+        
         if persist:
             self.persist(model=True, vocab=True, vectors=True)
 
-    def load(self, data: str = None) -> None:
+    def load(self, data: Optional(str, Word2Vec) = None) -> None:
         """
-        Loads Word2Vec object.
+        Loads Word2Vec object. Arrays saved in separate '.npy' files (the 
+        large ones, e.g. the vectors of large models) are memory-mapped 
+        with the 'vectors_mmap' mode. If no data is given and there is no 
+        trained model in the configurations, the vectors in 
+        'path_to_get_trained_vectors' are loaded (see 'load_vectors').
         
         args: 
-            data: Path to trained or non-trained Word2Vec 
-                object. If the featurizer is not trained, it will 
+            data: Trained or non-trained Word2Vec object or path to 
+                it. If the featurizer is not trained, it will 
                 be trained with the 'config' settings. If it is 
                 trained, when you re-train it will do so with the
                 'config' settings.
         """
-        if data is not None:
+        if isinstance(data, Word2Vec):
+            self.featurizer = data
+            self._fingerprinted_vectors = None
+            self._set_vectors_file(None)
+        elif data is not None:
             self.featurizer = Word2Vec.load(
-                fname=data
+                fname=data,
+                mmap=self._vectors_mmap
             )
-        else:
-            self._check_if_trained_featurizer_exists_and_load_it()
+            self._load_vectors_fingerprint(data)
+            self._set_vectors_file((Word2Vec, data))
+        elif not self._check_if_trained_featurizer_exists_and_load_it(mmap=self._vectors_mmap):
+            if self._path_to_get_trained_vectors is not None:
+                self.load_vectors(self._path_to_get_trained_vectors)
+        self.vector_index = None
     
     def persist(
         self, 
         model: bool = True, 
         vocab: bool = False, 
-        vectors: bool = False
+        vectors: bool = False,
+        index: Optional[bool] = None
     ) -> None:
+        """
+        Persists the trained featurizer in the paths set in the 
+        configurations.
+        
+        args:
+            model: Whether to save the Word2Vec object. Defaults to True.
+            vocab: Whether to save the vocabulary and word counts. Defaults 
+                to False.
+            vectors: Whether to save the KeyedVectors object. Defaults to 
+                False.
+            index: Whether to save the vector index next to the vectors, 
+                building it if needed (see 'get_vector_index'). If None, 
+                the 'persist_vector_index' configuration is used. Only 
+                used if 'vectors' is True.
+        """
+        if index is None:
+            index = self._persist_vector_index
+        
         if model:
             TextFeaturizer.data_manager.save_data_from_callable(
-                callback_fn_to_save_data=self.featurizer.save,
+                callback_fn_to_save_data=self._save_model,
                 path_to_save_data=self.path_to_save_model,
                 data_file_name="/word2vec_model.model",
                 alias=self._alias
             )
         
         if vocab:
+            wv = self.featurizer.wv
             TextFeaturizer.data_manager.save_data_from_callable(
-                self.featurizer.wv.key_to_index,
+                {key: wv.get_vecattr(key, "count") for key in wv.index_to_key},
                 "w",
                 callback_fn_to_save_data=utils.persist_dict_as_json,
                 path_to_save_data=self.path_to_save_vocabulary,
@@ -605,22 +1778,57 @@ class Word2VecFeaturizer(TextFeaturizer):
             
         if vectors:
             TextFeaturizer.data_manager.save_data_from_callable(
-                callback_fn_to_save_data=self.featurizer.wv.save,
+                callback_fn_to_save_data=self._save_vectors,
                 path_to_save_data=self.path_to_save_vectors,
                 data_file_name="/word2vec_vectors.kv",
                 alias=self._alias,
                 to_save_vocab=True
             )
+        
+        if vectors and index:
+            TextFeaturizer.data_manager.save_data_from_callable(
+                callback_fn_to_save_data=self._save_vector_index,
+                path_to_save_data=self.path_to_save_vectors,
+                data_file_name="/word2vec_vectors.ann",
+                alias=self._alias,
+                to_save_vocab=True
+            )
                 
-    def load_vectors(self, data: str) -> KeyedVectors:
+    def load_vectors(
+        self, 
+        data: str, 
+        mmap: Optional[Union[str, bool]] = None
+    ) -> KeyedVectors:
         """
         Interface to load KeyedVectors object from configuratios with a 
-        representation of trained dense vectors.
+        representation of trained dense vectors, that are set as the 
+        vectors of the featurizer, so lookups ('get_vector_by_key', 
+        'embed_documents', 'nearest') are served from them. If there is no 
+        featurizer, a non-trained one is created to hold them.
+        
+        Vectors persisted by 'persist' are memory-mapped (read-only by 
+        default), so processes that load the same vectors share a single 
+        copy in the page cache. 
         
         args:
             data: path to get vectors.
+            mmap: Memory-map mode of the vectors ('r', 'r+', 'c'), or False 
+                to read them into memory. If None, the 'vectors_mmap' 
+                configuration is used. Defaults to None.
         """
-        return self._load_vectors(data)
+        if mmap is None:
+            mmap = self._vectors_mmap
+        wv = self._load_vectors(data, mmap=mmap or None)
+        if self.featurizer is None:
+            self.featurizer = Word2Vec(vector_size=wv.vector_size)
+        self.featurizer.wv = wv
+        self.vector_index = None
+        self._load_vectors_fingerprint(data)
+        if utils.check_if_dir_extension_is('.bin', data):
+            self._set_vectors_file(None)
+        else:
+            self._set_vectors_file((KeyedVectors, data))
+        return wv
                                        
     def get_word_vector_object(self) -> Optional[KeyedVectors]:
         """Returns KeyedVectors object (see Gensim 4.x models.keyedvectors).
@@ -633,6 +1841,283 @@ class Word2VecFeaturizer(TextFeaturizer):
             return
         return self.featurizer.wv
     
+    def _save_vector_index(self, path: str) -> None:
+        """Saves the index of the vectors, building it if needed."""
+        self.get_vector_index().save(path)
+    
+    def _check_if_vector_index_matches_vectors(self, index: IVFVectorIndex) -> bool:
+        """Checks if the index was built from the current vectors: same 
+        number and size, and same content fingerprint (indexes without 
+        fingerprint never match). The fingerprint of the vectors is read 
+        from the file saved next to them, so they are not hashed again."""
+        vectors = self.featurizer.wv.vectors
+        return (
+            len(index) == len(vectors) 
+            and index.vectors.shape[1:] == vectors.shape[1:]
+            and index.fingerprint == self._get_vectors_fingerprint()
+        )
+    
+    def get_vector_index(self) -> IVFVectorIndex:
+        """
+        Returns the approximate nearest neighbour index of the trained 
+        vectors (see IVFVectorIndex). The index is loaded from 
+        'path_to_get_vector_index' if it is set and matches the vectors, 
+        or built from the vectors otherwise.
+        """
+        if self.vector_index is not None:
+            return self.vector_index
+        
+        if self._path_to_get_vector_index is not None:
+            index = IVFVectorIndex.load(
+                self._path_to_get_vector_index, 
+                n_probe=self._index_n_probe
+            )
+            if self._check_if_vector_index_matches_vectors(index):
+                self.vector_index = index
+                return self.vector_index
+            logger.warning(
+                f"Vector index in '{self._path_to_get_vector_index}' doesn't "
+                f"match the 'Word2VecFeaturizer' vectors, it will be rebuilt"
+            )
+        
+        logger.info("'Word2VecFeaturizer' vector index building has started")
+        self.vector_index = IVFVectorIndex.build(
+            self.featurizer.wv.vectors,
+            n_lists=self._index_n_lists,
+            n_probe=self._index_n_probe,
+            fingerprint=self._get_vectors_fingerprint()
+        )
+        return self.vector_index
+    
+    def nearest(
+        self, 
+        keys: Union[str, List[str]], 
+        k: int = 10
+    ) -> Union[List[Tuple[str, float]], List[List[Tuple[str, float]]]]:
+        """
+        Given words learned during training, returns the 'k' most similar 
+        words to each one, by cosine similarity, as (word, similarity) 
+        pairs. Unlike 'KeyedVectors.most_similar', neighbours are searched 
+        through an approximate index (see 'get_vector_index'), so some 
+        of the exact neighbours may be missed.
+        
+        If there is no trained featurizer, returns None.
+        
+        Args:
+            keys: requested key or list-of-keys.
+            k: number of similar words of each key. Defaults to 10.
+        """
+        if self.featurizer is None:
+            logger.warning(
+                "It's impossible to get similar items from 'Word2VecFeaturizer' "
+                "object because there is no trained model"
+            )
+            return
+        
+        wv = self.featurizer.wv
+        queries = [keys] if isinstance(keys, str) else keys
+        rows, scores = self.get_vector_index().search(wv[queries], k + 1)
+        
+        neighbours = []
+        for key, key_rows, key_scores in zip(queries, rows.tolist(), scores.tolist()):
+            neighbours.append([
+                (wv.index_to_key[row], score) 
+                for row, score in zip(key_rows, key_scores)
+                if row != -1 and row != wv.key_to_index[key]
+            ][:k])
+        return neighbours[0] if isinstance(keys, str) else neighbours
+    
+    def _get_token_idxs(
+        self, 
+        sents: List[List[str]]
+    ) -> Tuple[ndarray, ndarray]:
+        """Maps the tokens of the sentences to the rows of their vectors 
+        (see '_get_token_idxs' function)."""
+        return _get_token_idxs(self.featurizer.wv.key_to_index, self._unk_token, sents)
+    
+    def _get_idf_from_counts(self) -> ndarray:
+        """Approximates the inverse document frequency of each word by its 
+        count in the training corpus, since document frequencies are not 
+        stored by Word2Vec."""
+        wv = self.featurizer.wv
+        counts = np.fromiter(
+            (wv.get_vecattr(key, "count") for key in wv.index_to_key), 
+            dtype=np.float64, 
+            count=len(wv)
+        )
+        n_docs = max(self.featurizer.corpus_count, 1)
+        return np.log((1 + n_docs) / (1 + counts)) + 1
+    
+    def fit_idf(self, data: Iterable[str]) -> ndarray:
+        """
+        Computes the inverse document frequency of each word, as sklearn 
+        'TfidfTransformer' does with 'smooth_idf=True', to weight the 
+        vectors when documents are embedded with 'tfidf' pooling. Unknown 
+        tokens are counted as 'unk_token' if it is in the vocabulary.
+        
+        Args:
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object.
+        """
+        n_words = len(self.featurizer.wv)
+        df = np.zeros(n_words, dtype=np.int64)
+        n_docs = 0
+        for batch in self._iter_batches(data, self._chunk_size):
+            idxs, lengths = self._get_token_idxs(list(map(str.split, batch)))
+            doc_ids = np.repeat(np.arange(len(batch)), lengths)
+            df += np.bincount(
+                np.unique(doc_ids * n_words + idxs) % n_words, minlength=n_words
+            )
+            n_docs += len(batch)
+        self.idf = np.log((1 + n_docs) / (1 + df)) + 1
+        return self.idf
+    
+    def _get_pooling(self, pooling: Optional[str]) -> str:
+        """Returns the given pooling, or the configured one if it is None, 
+        checking that it is valid."""
+        pooling = self._pooling if pooling is None else pooling
+        if pooling not in self.pooling_methods:
+            raise ValueError(
+                f"Invalid pooling '{pooling}' for 'Word2VecFeaturizer'. "
+                f"Expected one of {self.pooling_methods}"
+            )
+        return pooling
+    
+    def embed_batches(
+        self, 
+        batches: Iterable[List[str]], 
+        pooling: Optional[str] = None
+    ) -> Generator[ndarray, None, None]:
+        """
+        Yields a matrix with the vector of each sentence of each batch 
+        (see 'embed_documents').
+        
+        Args:
+            batches: Iterable of lists of sentences.
+            pooling: 'mean', 'sum' or 'tfidf'. If None, the 'pooling' set in 
+                the configurations is used.
+        """
+        pooling = self._get_pooling(pooling)
+        idf = self._get_pooling_idf(pooling)
+        for batch in batches:
+            yield _pool_vectors(self.featurizer.wv, self._unk_token, pooling, idf, batch)
+    
+    def _get_pooling_idf(self, pooling: str) -> Optional[ndarray]:
+        """Returns the float32 inverse document frequencies for 'tfidf' 
+        pooling (see 'fit_idf'), or None for other poolings."""
+        if pooling != "tfidf":
+            return None
+        idf = self._get_idf_from_counts() if self.idf is None else self.idf
+        return idf.astype(np.float32)
+    
+    def embed_documents(
+        self, 
+        data: Iterable[str], 
+        pooling: Optional[str] = None,
+        lazy: bool = False
+    ) -> Union[ndarray, Generator[ndarray, None, None]]:
+        """
+        Converts each sentence of a data corpus into a single vector, by 
+        pooling the vectors of its whitespace-separated tokens:
+        - 'mean': average of the vectors.
+        - 'sum': sum of the vectors.
+        - 'tfidf': average of the vectors weighted by the inverse document 
+        frequency of each word (see 'fit_idf'; if it was not fitted, it is 
+        approximated from the word counts of the training corpus). Repeated 
+        words weight their term frequency.
+        
+        Tokens are mapped to vectors in bulk and pooled as a single sparse 
+        matrix product, in chunks of 'chunk_size' sentences. Unknown tokens 
+        take the vector of 'unk_token' (see 'Word2VecFeaturizer'), and are 
+        ignored only if it is not in the vocabulary. Sentences with no 
+        mapped tokens are zero vectors.
+        
+        If there is no trained featurizer, returns None.
+        
+        Args:
+            data: Iterable of sentences, e.g. a list or a DataLazyManager 
+                object.
+            pooling: 'mean', 'sum' or 'tfidf'. If None, the 'pooling' set in 
+                the configurations is used.
+            lazy: Whether to return a generator that yields the matrix of 
+                each chunk instead of the stacked matrix. Defaults to False.
+        """
+        if self.featurizer is None:
+            logger.warning(
+                "It's impossible to embed documents from 'Word2VecFeaturizer' "
+                "object because there is no trained model"
+            )
+            return
+        
+        pooling = self._get_pooling(pooling)
+        batches = self._iter_batches(data, self._chunk_size)
+        if lazy:
+            return self.embed_batches(batches, pooling=pooling)
+        
+        embeddings = list(self.embed_batches(batches, pooling=pooling))
+        if not embeddings:
+            return np.zeros((0, self.featurizer.wv.vector_size), dtype=np.float32)
+        return np.concatenate(embeddings)
+    
+    def _get_async_batch_fn(self) -> Callable[[List[str]], ndarray]:
+        """Returns the batch function of 'aprocess'. Process pool executors 
+        get a module-level function, with the vectors loaded once per 
+        worker process (see 'WorkerState')."""
+        if not check_if_executor_uses_processes(self.executor):
+            return self.embed_documents
+        vectors_file = self._get_vectors_file()
+        
+        def make_fn() -> Callable[[List[str]], ndarray]:
+            idf = self._get_pooling_idf(self._get_pooling(None))
+            return partial(
+                _pool_vectors,
+                WorkerState(_load_worker_vectors, *vectors_file, self._vectors_mmap or None),
+                self._unk_token,
+                self._pooling,
+                None if idf is None else WorkerState.of(idf)
+            )
+        
+        return self._get_worker_batch_fn(
+            key=(vectors_file, id(self.idf)),
+            make_fn=make_fn
+        )
+    
+    async def aprocess(
+        self, 
+        data: Union[Iterable[str], AsyncIterable[str]]
+    ) -> Optional[ndarray]:
+        """
+        Async facade of 'embed_documents', with the pooling set in the 
+        configurations, that doesn't block the event loop: the sentences of 
+        concurrent calls are grouped into micro-batches of up to 
+        'chunk_size' sentences, each embedded by a single call in the 
+        executor set by 'set_executor' (see 'AsyncMicroBatcher'). 
+        
+        With a process pool executor, each worker process memory-maps the 
+        vectors from the file they were loaded from or saved to (or from 
+        a temporary file, if they were not saved), so workers share them. 
+        Vectors changed without 'train' or the load methods must be 
+        persisted again.
+        
+        If there is no trained featurizer, returns None.
+
+        Args:
+            data: Iterable or async iterable of sentences.
+        """
+        if self.featurizer is None:
+            logger.warning(
+                "It's impossible to embed documents from 'Word2VecFeaturizer' "
+                "object because there is no trained model"
+            )
+            return
+        
+        batcher = self._get_batcher(
+            self._get_async_batch_fn(), 
+            concat=np.concatenate,
+            max_batch_size=self._chunk_size
+        )
+        return await batcher.submit(data)
+    
     def get_vector_by_key(
         self, 
         data: Union[str, List[str]]
@@ -0,0 +1,261 @@
+"""
+The module groups indexes to search dense vectors learned by featurizers.
+"""
+from __future__ import annotations
+from typing import Tuple, Optional
+
+import os
+import hashlib
+import logging
+
+import numpy as np
+from numpy import ndarray
+
+from pypipe import settings
+from pypipe.core.processes import utils
+
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+
+class IVFVectorIndex:
+    """
+    Approximate nearest neighbour index of dense vectors by cosine
+    similarity, based on an inverted file (IVF): vectors are clustered by
+    spherical k-means, and a query is only compared with the vectors of
+    the 'n_probe' clusters whose centroids are the most similar to it.
+
+    Normalized vectors are stored grouped by cluster, so each probed
+    cluster is a contiguous block of rows. The arrays are persisted as
+    '.npy' files in a directory and memory-mapped when loaded, next to the
+    fingerprint of the vectors the index was built from.
+    """
+    arrays = ("centroids", "vectors", "ids", "offsets")
+    fingerprint_file_name = "fingerprint.txt"
+
+    def __init__(
+        self,
+        centroids: ndarray,
+        vectors: ndarray,
+        ids: ndarray,
+        offsets: ndarray,
+        n_probe: int = 8,
+        fingerprint: Optional[str] = None
+    ) -> None:
+        """
+        Builds an IVFVectorIndex object from the arrays written by
+        'IVFVectorIndex.build'.
+
+        args:
+            centroids: Normalized centroid of each cluster.
+            vectors: Normalized vectors, grouped by cluster.
+            ids: Original row of each vector in 'vectors'.
+            offsets: Rows where each cluster starts in 'vectors', followed
+                by the number of vectors (the vectors of cluster 'i' are
+                vectors[offsets[i]: offsets[i + 1]]).
+            n_probe: Number of clusters compared with each query.
+                Defaults to 8.
+            fingerprint: Fingerprint of the indexed vectors (see
+                'fingerprint_vectors'). Defaults to None.
+        """
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        self.n_probe = n_probe
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        """Returns the number of indexed vectors."""
+        return len(self.ids)
+
+    @property
+    def n_lists(self) -> int:
+        """Returns the number of clusters."""
+        return len(self.centroids)
+
+    @staticmethod
+    def fingerprint_vectors(vectors: ndarray, batch_size: int = 65536) -> str:
+        """Returns the sha256 hex digest of the shape, type and content of
+        the vectors, hashed in batches of 'batch_size' rows."""
+        digest = hashlib.sha256(f"{vectors.shape}{vectors.dtype}".encode("utf-8"))
+        for start in range(0, len(vectors), batch_size):
+            digest.update(np.ascontiguousarray(vectors[start:start + batch_size]).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _normalize(vectors: ndarray) -> ndarray:
+        """Returns a float32 copy of the vectors scaled to unit length
+        (zero vectors are kept)."""
+        vectors = np.array(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors /= norms
+        return vectors
+
+    @staticmethod
+    def _assign(
+        vectors: ndarray,
+        centroids: ndarray,
+        batch_size: int = 65536
+    ) -> ndarray:
+        """Returns the most similar centroid of each vector, computed in
+        batches of 'batch_size' vectors."""
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), batch_size):
+            batch = vectors[start:start + batch_size]
+            labels[start:start + batch_size] = np.argmax(batch @ centroids.T, axis=1)
+        return labels
+
+    @classmethod
+    def _train_centroids(
+        cls,
+        vectors: ndarray,
+        n_lists: int,
+        n_iter: int,
+        rng: np.random.Generator
+    ) -> ndarray:
+        """Clusters the normalized vectors by spherical k-means, starting
+        from random vectors. Empty clusters are restarted from random
+        vectors."""
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)]
+        for _ in range(n_iter):
+            labels = cls._assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, vectors)
+            empty = np.bincount(labels, minlength=n_lists) == 0
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            centroids = cls._normalize(sums)
+        return centroids
+
+    @classmethod
+    def build(
+        cls,
+        vectors: ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        sample_size: int = 64,
+        seed: int = 0,
+        fingerprint: Optional[str] = None
+    ) -> IVFVectorIndex:
+        """
+        Builds the index of the vectors.
+
+        args:
+            vectors: 2D array of vectors, e.g. the vectors of a Gensim
+                KeyedVectors object.
+            n_lists: Number of clusters. If None, 4 * sqrt(n) for 'n'
+                vectors. Defaults to None.
+            n_probe: Number of clusters compared with each query.
+                Defaults to 8.
+            n_iter: Number of k-means iterations. Defaults to 10.
+            sample_size: Number of vectors per cluster sampled to train
+                the centroids. Defaults to 64.
+            seed: Seed of the random sampling. Defaults to 0.
+            fingerprint: Fingerprint of the vectors (see
+                'fingerprint_vectors'). If None, it is computed. Defaults
+                to None.
+        """
+        if fingerprint is None:
+            fingerprint = cls.fingerprint_vectors(vectors)
+        vectors = cls._normalize(vectors)
+        n = len(vectors)
+        if n_lists is None:
+            n_lists = int(4 * np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+
+        rng = np.random.default_rng(seed)
+        if n == 0:
+            centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        else:
+            sample = vectors
+            if n > n_lists * sample_size:
+                sample = vectors[np.sort(rng.choice(n, n_lists * sample_size, replace=False))]
+            centroids = cls._train_centroids(sample, n_lists, n_iter, rng)
+
+        labels = cls._assign(vectors, centroids)
+        ids = np.argsort(labels, kind="stable")
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=len(centroids)), out=offsets[1:])
+        return cls(
+            centroids, 
+            vectors[ids], 
+            ids, 
+            offsets, 
+            n_probe=n_probe, 
+            fingerprint=fingerprint
+        )
+
+    def search(self, queries: ndarray, k: int) -> Tuple[ndarray, ndarray]:
+        """
+        Returns the rows of the 'k' indexed vectors most similar to each
+        query and their cosine similarities, in decreasing order of
+        similarity. Rows are -1 (and similarities -inf) where fewer than
+        'k' vectors were compared.
+
+        args:
+            queries: 2D array of query vectors.
+            k: Number of neighbours of each query.
+        """
+        queries = self._normalize(np.atleast_2d(queries))
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        if len(self) == 0 or k <= 0:
+            return rows, scores
+
+        n_probe = min(self.n_probe, self.n_lists)
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+        for i, query in enumerate(queries):
+            candidates = np.concatenate([
+                np.arange(self.offsets[c], self.offsets[c + 1]) for c in probes[i]
+            ])
+            if len(candidates) == 0:
+                continue
+            candidate_scores = self.vectors[candidates] @ query
+            top = min(k, len(candidates))
+            best = np.argpartition(-candidate_scores, top - 1)[:top]
+            best = best[np.argsort(-candidate_scores[best], kind="stable")]
+            rows[i, :top] = self.ids[candidates[best]]
+            scores[i, :top] = candidate_scores[best]
+        return rows, scores
+
+    def save(self, path: str) -> None:
+        """Saves the arrays of the index as '.npy' files in the 'path'
+        directory, and its fingerprint if it is known."""
+        utils.create_dir_if_not_exists(path)
+        for name in self.arrays:
+            np.save(os.path.join(path, name + ".npy"), getattr(self, name))
+        if self.fingerprint is not None:
+            with open(os.path.join(path, self.fingerprint_file_name), "w") as f:
+                f.write(self.fingerprint)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        n_probe: int = 8,
+        mmap_mode: Optional[str] = "r"
+    ) -> IVFVectorIndex:
+        """
+        Loads an index saved by 'IVFVectorIndex.save'.
+
+        args:
+            path: Directory of the index.
+            n_probe: Number of clusters compared with each query.
+                Defaults to 8.
+            mmap_mode: Memory-map mode of the arrays, or None to read them
+                into memory. Defaults to 'r'.
+        """
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+            for name in cls.arrays
+        }
+        fingerprint = None
+        fingerprint_path = os.path.join(path, cls.fingerprint_file_name)
+        if os.path.exists(fingerprint_path):
+            with open(fingerprint_path) as f:
+                fingerprint = f.read().strip()
+        return cls(**arrays, n_probe=n_probe, fingerprint=fingerprint)
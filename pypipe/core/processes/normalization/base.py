@@ -1,10 +1,12 @@
 from abc import abstractclassmethod, abstractmethod
-from typing import List, Union, Iterable
+from typing import Any, List, Union, Optional, Callable, Iterable, Sequence
+from concurrent.futures import Executor
 
 from omegaconf import OmegaConf
 
 from pypipe.core.interfaces import IProcess
 from pypipe.core.management.managers import DataStorageManager, DataLazyManager
+from pypipe.core.management.batchers import AsyncMicroBatcher, concat_lists
 
 
 class TextNormalizer(IProcess):
@@ -33,6 +35,61 @@ class TextNormalizer(IProcess):
             self._configs = configs.pipeline[alias]
         else:
             self._configs = configs
+        
+        self.executor: Optional[Executor] = None
+        self._max_delay = 0.002
+        self._batcher: Optional[AsyncMicroBatcher] = None
+        self._worker_batch_fn: Optional[Callable[[List], Sequence]] = None
+        self._worker_batch_key: Any = None
+    
+    def set_executor(self, executor: Optional[Executor], max_delay: float = 0.002) -> None:
+        """
+        Sets the executor where the async methods of the normalizer run, 
+        and the maximum number of seconds a request waits to be grouped 
+        with other concurrent requests (see 'AsyncMicroBatcher').
+        
+        Args:
+            executor: Executor, or None to use the default executor of the 
+                event loop.
+            
+            max_delay: Maximum waiting time of a request, in seconds. 
+                Defaults to 0.002.
+        """
+        self.executor = executor
+        self._max_delay = max_delay
+        self._batcher = None
+    
+    def _get_batcher(
+        self, 
+        fn: Callable[[List], Sequence],
+        concat: Callable[[List[Sequence]], Sequence] = concat_lists,
+        max_batch_size: int = 10000
+    ) -> AsyncMicroBatcher:
+        """Returns the micro-batcher of the async methods, built with the 
+        batch function the first time it is needed."""
+        if self._batcher is None:
+            self._batcher = AsyncMicroBatcher(
+                fn, 
+                concat=concat,
+                executor=self.executor, 
+                max_batch_size=max_batch_size, 
+                max_delay=self._max_delay
+            )
+        return self._batcher
+    
+    def _get_worker_batch_fn(
+        self, 
+        key: Any, 
+        make_fn: Callable[[], Callable[[List], Sequence]]
+    ) -> Callable[[List], Sequence]:
+        """Returns the batch function sent to worker processes (see 
+        'WorkerState'), made by 'make_fn' again only when the key of its 
+        state changes, which also rebuilds the micro-batcher."""
+        if self._worker_batch_fn is None or self._worker_batch_key != key:
+            self._worker_batch_fn = make_fn()
+            self._worker_batch_key = key
+            self._batcher = None
+        return self._worker_batch_fn
     
     @abstractclassmethod
     def get_isolated_process(cls) -> IProcess:
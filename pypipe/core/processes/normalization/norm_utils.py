@@ -1,4 +1,5 @@
-from typing import Tuple, Dict
+from __future__ import annotations
+from typing import Tuple, Dict, List, Callable, Optional, NamedTuple, Pattern
 
 import re
 from unidecode import unidecode
@@ -159,4 +160,208 @@ REGEX_NORMALIZATION_HANDLERS = {
     "normalize_q": q_handler,
     "normalize_re": re_handler,
     "normalize_laught": laught_handler
-}
\ No newline at end of file
+}
+
+
+class RegexStep(NamedTuple):
+    """
+    Single substitution performed by a regex handler, described so that 
+    'RegexNormalizationPlan' can compile it without calling the handler.
+    
+    args:
+        pattern: Compiled regular expression to substitute.
+        repl: Fixed replacement. If None, the replacement set in the 
+            handler configurations is used.
+        literals: Substrings of which at least one must be in the text 
+            for the pattern to match. If None, the step always runs.
+        char_class: Name of the character class the pattern consumes, 
+            only set for patterns without groups or lookarounds that 
+            match one character ('runs' False) or a maximal run of 
+            characters ('runs' True) of that class. Different names 
+            must refer to disjoint classes.
+        runs: Whether the pattern matches maximal runs of 'char_class'.
+    """
+    pattern: Pattern
+    repl: Optional[str] = None
+    literals: Optional[Tuple[str, ...]] = None
+    char_class: Optional[str] = None
+    runs: bool = False
+
+
+# Decomposition of each regex handler into its substitutions, in the order 
+# in which the handler applies them. Handlers not listed here (e.g. 
+# 'lowercase_diacritic_handler' or custom ones) are called as they are.
+REGEX_NORMALIZATION_STEPS = {
+    whitespaces_handler: (
+        RegexStep(constants.WHITE_SPACE_REGEX, char_class="whitespace", runs=True),
+    ),
+    punctuaction_handler: (
+        RegexStep(constants.PUNCTUTATION_REGEX, char_class="punctuation"),
+    ),
+    duplicated_letter_handler: (
+        RegexStep(constants.DUPLICATED_LETTER_REGEX),
+    ),
+    mention_handler: (
+        RegexStep(constants.MENTION_REGEX, literals=("@", "#")),
+    ),
+    url_handler: (
+        RegexStep(constants.URL_REGEX, literals=("://", "ww", "wW", "Ww", "WW")),
+    ),
+    email_handler: (
+        RegexStep(constants.EMAIL_REGEX, literals=("@",)),
+    ),
+    digit_handler: (
+        RegexStep(constants.DIGIT_REGEX, char_class="digit", runs=True),
+    ),
+    single_word_handler: (
+        RegexStep(constants.SINGLE_WORD_REGEX),
+    ),
+    isolated_consonant_handler: (
+        RegexStep(constants.ISOLATED_CONSONANT_REGEX),
+    ),
+    q_handler: (
+        RegexStep(constants.Q_REGEX["que"], " que ", ("k", "q")),
+        RegexStep(constants.Q_REGEX["quie"], " quie", ("kie", "qie")),
+    ),
+    re_handler: (
+        RegexStep(constants.RE_REGEX, literals=("re",)),
+    ),
+    laught_handler: (
+        RegexStep(constants.LAUGHT_REGEX["ja"], "ja", ("ja", "aj", "ha")),
+        RegexStep(constants.LAUGHT_REGEX["je"], "je", ("je", "ej", "he")),
+        RegexStep(constants.LAUGHT_REGEX["ji"], "ji", ("ji", "ij")),
+        RegexStep(constants.LAUGHT_REGEX["jo"], "jo", ("jo", "oj")),
+        RegexStep(constants.LAUGHT_REGEX["ju"], "ju", ("ju", "uj")),
+    )
+}
+
+
+class RegexNormalizationPlan:
+    """
+    Compiled form of a sequence of (handler, replacement) pairs that 
+    produces the same output as applying the handlers one after the 
+    other, in fewer and cheaper passes:
+    
+    - handlers listed in 'REGEX_NORMALIZATION_STEPS' are decomposed into 
+    bound 'Pattern.sub' calls, so no partials, 'SubRegexBuilder' objects 
+    or 're' module lookups are involved per sentence.
+    - steps with 'literals' are skipped when none of them is in the text, 
+    which is cheaper than letting the regex engine scan it.
+    - adjacent steps over disjoint character classes are fused into one 
+    alternation whose matches are dispatched to the replacement of the 
+    step that matched, when doing so cannot change the output.
+    
+    Any other step keeps its original position, since the substitutions 
+    of the remaining handlers depend on the output of the previous ones.
+    """
+    def __init__(
+        self, 
+        compile_handlers: List[Tuple[Callable[[str, str], str], str]]
+    ) -> None:
+        """
+        Builds a RegexNormalizationPlan object.
+        
+        args:
+            compile_handlers: List of tuples with: 0) handler, 1) its 
+                replacement, in the order in which they are applied.
+        """
+        steps = []
+        for handler, repl in compile_handlers:
+            if handler in REGEX_NORMALIZATION_STEPS:
+                for step in REGEX_NORMALIZATION_STEPS[handler]:
+                    steps.append(
+                        step._replace(repl=repl) if step.repl is None else step
+                    )
+            else:
+                steps.append((handler, repl))
+        
+        self._stages = self._compile_stages(steps)
+    
+    def __len__(self) -> int:
+        """Returns the number of passes over each text."""
+        return len(self._stages)
+    
+    def __call__(self, text: str) -> str:
+        """Normalizes the given text."""
+        for literals, sub, repl in self._stages:
+            if literals is not None:
+                for literal in literals:
+                    if literal in text:
+                        break
+                else:
+                    continue
+            text = sub(repl, text)
+        return text
+    
+    @staticmethod
+    def _is_fusible(step: RegexStep) -> bool:
+        return (
+            isinstance(step, RegexStep)
+            and step.char_class is not None
+            and isinstance(step.repl, str)
+            and "\\" not in step.repl
+            and step.pattern.groups == 0
+        )
+
+    @staticmethod
+    def _can_follow(prev: RegexStep, step: RegexStep) -> bool:
+        """
+        Checks whether 'step' can run in the same pass as the previous 
+        step 'prev': the classes must be disjoint, 'prev' replacement 
+        must not introduce characters of 'step' class, the flags must 
+        be the same, and if 'prev' 
+        deletes its matches, it must not join two runs of 'step' that 
+        are replaced by a non-empty string.
+        """
+        if prev.char_class == step.char_class:
+            return False
+        if prev.pattern.flags != step.pattern.flags:
+            return False
+        if step.pattern.search(prev.repl) is not None:
+            return False
+        if prev.repl == "" and step.runs and step.repl != "":
+            return False
+        return True
+    
+    def _compile_stages(self, steps: List) -> List[Tuple]:
+        """
+        Groups the steps into passes. Each pass is a tuple with: 0) 
+        literals that guard it, 1) substitution function called as 
+        'sub(repl, text)', 2) replacement.
+        """
+        groups = []
+        for step in steps:
+            if (
+                self._is_fusible(step)
+                and groups
+                and all(self._is_fusible(prev) for prev in groups[-1])
+                and all(self._can_follow(prev, step) for prev in groups[-1])
+            ):
+                groups[-1].append(step)
+            else:
+                groups.append([step])
+        
+        stages = []
+        for group in groups:
+            step = group[0]
+            if len(group) > 1:
+                stages.append(self._fuse(group))
+            elif isinstance(step, RegexStep):
+                stages.append((step.literals, step.pattern.sub, step.repl))
+            else:
+                handler, repl = step
+                stages.append(
+                    (None, lambda repl, text, handler=handler: handler(text=text, repl=repl), repl)
+                )
+        return stages
+    
+    @staticmethod
+    def _fuse(group: List[RegexStep]) -> Tuple:
+        """Returns a pass that applies the group of steps in a single 
+        alternation with a dispatch callback."""
+        pattern = re.compile(
+            "|".join(f"({step.pattern.pattern})" for step in group),
+            flags=group[0].pattern.flags
+        )
+        repls = [None] + [step.repl for step in group]
+        return (None, pattern.sub, lambda match: repls[match.lastindex])
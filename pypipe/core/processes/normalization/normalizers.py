@@ -1,21 +1,68 @@
 from __future__ import annotations
-from typing import List, Union, Callable, Iterable, Generator
+from typing import List, Tuple, Union, Callable, Iterable, Generator, AsyncIterable
 
 import logging
-from functools import reduce
+from functools import lru_cache, partial
 from omegaconf import OmegaConf
 
 from pypipe import settings
 from pypipe.core.processes import utils
 from pypipe.core.management.managers import DataLazyManager
+from pypipe.core.management.batchers import WorkerState, check_if_executor_uses_processes
 from pypipe.core.processes.normalization.base import TextNormalizer
-from pypipe.core.processes.normalization.norm_utils import REGEX_NORMALIZATION_HANDLERS
+from pypipe.core.processes.normalization.norm_utils import (
+    REGEX_NORMALIZATION_HANDLERS,
+    RegexNormalizationPlan
+)
 
 
 logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 
+def _build_plan(compile_handlers: List, cache_size: int = 0) -> Callable[[str], str]:
+    """
+    Returns the normalization plan of the given handlers. If 'cache_size' 
+    is greater than 0, the plan is wrapped in a LRU cache keyed on the raw 
+    text that keeps at most 'cache_size' normalized texts.
+    """
+    plan = RegexNormalizationPlan(compile_handlers)
+    if cache_size:
+        return lru_cache(maxsize=cache_size)(plan)
+    return plan
+
+
+# Normalization plan of each worker process, built once by 
+# '_init_normalization_worker' when the worker starts.
+_worker_plan: Callable[[str], str] = None
+
+
+def _init_normalization_worker(compile_handlers: List, cache_size: int = 0) -> None:
+    """Builds the normalization plan of a worker process."""
+    global _worker_plan
+    _worker_plan = _build_plan(compile_handlers, cache_size)
+
+
+def _normalize_chunk(chunk: List[str]) -> Tuple[List[str], int, int]:
+    """
+    Normalizes a chunk of texts inside a worker process. Returns the 
+    normalized texts together with the cache hits and misses of the chunk.
+    """
+    if not hasattr(_worker_plan, "cache_info"):
+        return [_worker_plan(sent) for sent in chunk], 0, 0
+    
+    before = _worker_plan.cache_info()
+    norm_chunk = [_worker_plan(sent) for sent in chunk]
+    after = _worker_plan.cache_info()
+    return norm_chunk, after.hits - before.hits, after.misses - before.misses
+
+
+def _normalize_batch_with_plan(plan: Callable[[str], str], batch: List[str]) -> List[str]:
+    """Normalizes a batch of texts with the plan of a worker process (see 
+    'RegexNormalizer.anormalize')."""
+    return list(map(plan, batch))
+
+
 class RegexNormalizer(TextNormalizer):
     """
     Text normalizer using regex handlers that are stored
@@ -48,9 +95,19 @@ class RegexNormalizer(TextNormalizer):
         
         self.compile_handlers: List = []
         
+        self._regex_handlers_compiled = False
+        self._plan: Callable[[str], str] = None
+        
         self._data_file_name = "/normcorpus.txt"
         self._path_to_save_normcorpus = self._configs.path_to_save_normcorpus
         
+        self._workers = self._configs.get("workers", 1)
+        self._chunk_size = self._configs.get("chunk_size", 10000)
+        
+        self._cache_size = self._configs.get("cache_size", 0)
+        self._worker_cache_hits = 0
+        self._worker_cache_misses = 0
+        
     @classmethod
     def get_isolated_process(
         cls, 
@@ -65,7 +122,11 @@ class RegexNormalizer(TextNormalizer):
     def get_default_configs(cls) -> OmegaConf:
         """Returns configurations for a RegexNormalizer object."""
         return OmegaConf.create({
+            "active": True,
             "path_to_save_normcorpus": None, 
+            "workers": 1,
+            "chunk_size": 10000,
+            "cache_size": 0,
             "handlers": {
                 "normalize_laught": {
                     "active": True,
@@ -126,88 +187,186 @@ class RegexNormalizer(TextNormalizer):
         """
         Compiles regular expression handlers and adds them to the 
         list of compilation handlers ('compile_handlers'), assuming
-        configuration is active.
+        configuration is active. Then, compiles 'compile_handlers' into 
+        the normalization plan applied to each text, unless it is already 
+        compiled.
         """
-        for regex_handler, spec in self._configs.handlers.items():
-            if self._configs.active:
-                if regex_handler in RegexNormalizer.regex_handlers:
-                    handler = RegexNormalizer.regex_handlers.get(regex_handler)
-                    self.compile_handlers.append(
-                        (handler, spec.replacement)
-                    )
-    
-    def _normalize(
-        self, 
-        text: str, 
-        compile_handlers: tuple[Callable[[str, str], str], str]
-    ) -> str:
+        if not self._regex_handlers_compiled:
+            for regex_handler, spec in self._configs.handlers.items():
+                if self._configs.active:
+                    if regex_handler in RegexNormalizer.regex_handlers:
+                        handler = RegexNormalizer.regex_handlers.get(regex_handler)
+                        self.compile_handlers.append(
+                            (handler, spec.replacement)
+                        )
+            self._regex_handlers_compiled = True
+        
+        if self._plan is None:
+            self._plan = _build_plan(self.compile_handlers, self._cache_size)
+            self._worker_cache_hits = 0
+            self._worker_cache_misses = 0
+
+    def _normalize_text(self, text: str) -> str:
         """
-        Performs an string substitution operation where it uses 
-        the provided compile_handlers tuple to apply the regular 
-        expression patterns to the input text.
+        Normalizes a given input text by applying the compiled 
+        normalization plan, which is equivalent to applying each 
+        handler in 'compile_handlers' in order.
 
-        args:
+        Args:
             text: A string representing the input text to be normalized.
+        """
+        return self._plan(text)
+
+    def _parallel_normalization(
+        self, 
+        batches: Iterable[List[str]], 
+        workers: int
+    ) -> Generator[List[str], None, None]:
+        """
+        Normalizes batches of texts in a pool of worker processes and 
+        yields the normalized batches in their original order (see 
+        'utils.imap_in_processes').
+        
+        args:
+            batches: Iterable of lists of texts to normalize.
             
-            compile_handlers: A tuple containing two elements: 0) function, 
-                1) string. The function applies the compiled regular 
-                expression to the input text, while the string represents 
-                the replacement pattern used during normalization.
+            workers: Number of worker processes.
         """
-        handler, repl = compile_handlers
-        return handler(
-            text=text,
-            repl=repl
+        chunks = utils.imap_in_processes(
+            _normalize_chunk,
+            batches,
+            workers=workers,
+            initializer=_init_normalization_worker,
+            initargs=(list(self.compile_handlers), self._cache_size)
         )
+        for chunk in chunks:
+            yield self._collect_chunk(chunk)
 
-    def _normalize_text(self, text):
-        """
-            Normalizes a given input text by applying a series of regular 
-            expression patterns using the '_normalize' function. The method 
-            returns the normalized text.
+    def _collect_chunk(self, chunk: Tuple[List[str], int, int]) -> List[str]:
+        """Returns the normalized chunk of a worker and accumulates its 
+        cache counters."""
+        norm_chunk, hits, misses = chunk
+        self._worker_cache_hits += hits
+        self._worker_cache_misses += misses
+        return norm_chunk
 
-            Args:
-                text: A string representing the input text to be normalized.
-        """
-        return reduce(
-            self._normalize, 
-            self.compile_handlers, 
-            text
+    def _normalize_batch(self, batch: List[str]) -> List[str]:
+        """Normalizes a batch of texts."""
+        return list(map(self._normalize_text, batch))
+
+    def _get_async_batch_fn(self) -> Callable[[List[str]], List[str]]:
+        """Returns the batch function of 'anormalize'. Process pool executors 
+        get a module-level function, with the normalization plan built once 
+        per worker process (see 'WorkerState')."""
+        if not check_if_executor_uses_processes(self.executor):
+            return self._normalize_batch
+        return self._get_worker_batch_fn(
+            key=(tuple(self.compile_handlers), self._cache_size),
+            make_fn=lambda: partial(
+                _normalize_batch_with_plan, 
+                WorkerState(_build_plan, list(self.compile_handlers), self._cache_size)
+            )
         )
 
-    def _standard_normalization(self, data: List[str], persist: bool = False) -> List[str]:
+    def _normalize_batches(
+        self, 
+        batches: Iterable[List[str]], 
+        workers: int
+    ) -> Iterable[List[str]]:
+        """Returns an iterator over the normalized batches, normalized in 
+        worker processes if more than one worker is set."""
+        if workers is not None and workers > 1:
+            return self._parallel_normalization(batches=batches, workers=workers)
+        return map(self._normalize_batch, batches)
+    
+    def _iter_batches(self, data: Iterable) -> Iterable[List[str]]:
+        """Splits the data corpus into batches of 'chunk_size' texts, read 
+        in blocks if the data corpus is a DataLazyManager object."""
+        if isinstance(data, DataLazyManager):
+            return data.iter_batches(batch_size=self._chunk_size)
+        return utils.chunk_iterable(data, self._chunk_size)
+    
+    def _yield_normalized_batches(
+        self, 
+        batches: Iterable[List[str]], 
+        persist: bool = False, 
+        workers: int = 1
+    ) -> Generator[List[str], None, None]:
+        """
+        Normalizes batches of texts and yields them, writing each 
+        normalized batch to the normalized corpus file if 'persist' 
+        is True.
+        
+        args:
+            batches: Iterable of lists of texts to normalize.
+            
+            workers: Number of worker processes.
+        """
+        norm_batches = self._normalize_batches(batches=batches, workers=workers)
+        if persist:
+            writer = TextNormalizer.data_manager.get_lazy_file_writer(
+                path_to_save_data=self._path_to_save_normcorpus,
+                data_file_name=self._data_file_name,
+                alias=self._alias
+            )
+            for norm_batch in norm_batches:
+                if writer is not None and norm_batch: 
+                    writer.send("\n".join(norm_batch))
+                yield norm_batch
+        else:
+            yield from norm_batches
+
+    def _standard_normalization(
+        self, 
+        data: List[str], 
+        persist: bool = False, 
+        workers: int = 1
+    ) -> List[str]:
         """
         Iterates over a list of strings and normalize each string.
         
         args:
             data: List of string to normalize.
+            
+            workers: Number of worker processes.
         """
-        norm_data = [self._normalize_text(sent) for sent in data]
+        if workers is not None and workers > 1:
+            norm_data = [
+                sent 
+                for norm_batch in self._normalize_batches(
+                    batches=utils.chunk_iterable(data, self._chunk_size), 
+                    workers=workers
+                ) 
+                for sent in norm_batch
+            ]
+        else:
+            norm_data = self._normalize_batch(data)
         if persist:
             self.persist(data=norm_data)
         return norm_data
     
-    def _lazy_normalization(self, data: Iterable, persist: bool = False) -> Generator:   
+    def _lazy_normalization(
+        self, 
+        data: Iterable, 
+        persist: bool = False, 
+        workers: int = 1
+    ) -> Generator:   
         """
         Iterates over a list of strings and performs a lazy normalization
-        by yield each element in the list.
+        by yield each element in the list. Internally, the data corpus is 
+        normalized and persisted in batches of 'chunk_size' texts.
         
         args:
             data: Iterable to normalize.
+            
+            workers: Number of worker processes.
         """
-        if persist:
-            writer = TextNormalizer.data_manager.get_lazy_file_writer(
-                path_to_save_data=self._path_to_save_normcorpus,
-                data_file_name=self._data_file_name,
-                alias=self._alias
-            )
-            for sent in data:
-                normalized_sent = self._normalize_text(sent)
-                if writer is not None: writer.send(normalized_sent)
-                yield normalized_sent
-        else:
-            for sent in data:
-                yield self._normalize_text(sent)
+        for norm_batch in self._yield_normalized_batches(
+            batches=self._iter_batches(data), 
+            persist=persist, 
+            workers=workers
+        ):
+            yield from norm_batch
 
     def add_regex_handler(
         self, 
@@ -230,6 +389,25 @@ class RegexNormalizer(TextNormalizer):
                     return re.sub(pattern, repl, text)
         """
         self.compile_handlers.append((handler, repl))
+        self._plan = None
+    
+    @property
+    def cache_hits(self) -> int:
+        """Number of texts whose normalization was taken from the cache 
+        since the normalization plan was compiled."""
+        hits = self._worker_cache_hits
+        if hasattr(self._plan, "cache_info"):
+            hits += self._plan.cache_info().hits
+        return hits
+    
+    @property
+    def cache_misses(self) -> int:
+        """Number of texts that were normalized and stored in the cache 
+        since the normalization plan was compiled."""
+        misses = self._worker_cache_misses
+        if hasattr(self._plan, "cache_info"):
+            misses += self._plan.cache_info().misses
+        return misses
     
     def persist(self, data: Iterable):
         TextNormalizer.data_manager.save_data_from_callable(
@@ -240,10 +418,42 @@ class RegexNormalizer(TextNormalizer):
             alias=self._alias
         )
     
+    def normalize_batches(
+        self, 
+        batches: Iterable[List[str]], 
+        persist: bool = False,
+        workers: int = None
+    ) -> Generator[List[str], None, None]:
+        """
+        Lazily normalizes an iterable of batches of texts (e.g. the output 
+        of 'DataLazyManager.iter_batches') and yields one normalized batch 
+        per batch, so the per-call overhead is paid once per batch.
+        
+        Args:
+            batches: Iterable of lists of texts to normalize.
+            
+            persist: Whether to write the normalized texts to the normalized 
+                corpus file.
+            
+            workers: Number of worker processes that normalize the batches. 
+                If None, it is taken from configurations.
+        """
+        self._compile_regex_handlers()
+        
+        if workers is None:
+            workers = self._workers
+        
+        yield from self._yield_normalized_batches(
+            batches=batches, 
+            persist=persist, 
+            workers=workers
+        )
+    
     def normalize_text(
         self, 
         data: Union[List[str], Iterable],
-        persist: bool = False
+        persist: bool = False,
+        workers: int = None
     ) -> Union[List[str], DataLazyManager]:
         """
         Normalizes the given data corpus by compiling regex handlers set on 
@@ -253,6 +463,11 @@ class RegexNormalizer(TextNormalizer):
         Args:
             data: The text to be normalized. Can accept lists or iterables 
                 containing string elements.
+                
+            workers: Number of worker processes that normalize the data 
+                corpus in chunks of 'chunk_size' texts. If None, it is taken 
+                from configurations. With more than one worker, custom 
+                handlers must be picklable.
 
         Returns:
             Union[List[str], DataLazyManager]: The normalized text as a Python 
@@ -269,9 +484,39 @@ class RegexNormalizer(TextNormalizer):
         logger.info("'RegexNormalizer' normalization has started")
         
         self._compile_regex_handlers()
+        
+        if workers is None:
+            workers = self._workers
                 
         if isinstance(data, List):
-            return self._standard_normalization(data=data, persist=persist)
+            return self._standard_normalization(
+                data=data, 
+                persist=persist, 
+                workers=workers
+            )
         else:
-            return DataLazyManager(self._lazy_normalization(data=data, persist=persist))
+            return DataLazyManager(
+                self._lazy_normalization(data=data, persist=persist, workers=workers)
+            )
+    
+    async def anormalize(self, data: Union[Iterable[str], AsyncIterable[str]]) -> List[str]:
+        """
+        Async facade of 'normalize_text' that doesn't block the event loop: 
+        the texts of concurrent calls are grouped into micro-batches of up 
+        to 'chunk_size' texts, each normalized by a single call in the 
+        executor set by 'set_executor' (see 'AsyncMicroBatcher'). With a 
+        process pool executor, custom handlers must be picklable, and the 
+        cache of each worker process is not counted by 'cache_hits' and 
+        'cache_misses'.
+        
+        Args:
+            data: Iterable or async iterable of texts. Async iterables are 
+                normalized in chunks as they are read.
+        
+        Returns:
+            List[str]: The normalized texts.
+        """
+        self._compile_regex_handlers()
+        batcher = self._get_batcher(self._get_async_batch_fn(), max_batch_size=self._chunk_size)
+        return await batcher.submit(data)
 
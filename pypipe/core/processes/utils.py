@@ -1,10 +1,15 @@
 from __future__ import annotations
-from typing import List, Dict, Set, Any, Iterable
+from typing import List, Dict, Set, Any, Tuple, Callable, Iterable, Generator
 
 import os
 import pickle
 import json
+import threading
+from queue import Queue, Empty, Full
+from collections import deque
+from itertools import islice
 from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 
 def create_dir_if_not_exists(path: str) -> None:
@@ -53,6 +58,23 @@ def persist_dict_as_json(
         json.dump(file, f, indent=4)
         
 
+def persist_dict_as_json_line(
+    file: Dict[str, Any], 
+    mode: str,
+    file_dir: str,
+) -> None:
+    """Writes the dict as one line of a JSON lines file. Use mode 'a' to 
+    append it to the existing lines."""
+    with open(file_dir, mode) as f:
+        f.write(json.dumps(file) + "\n")
+
+
+def open_json_lines_as_dicts(file_dir: str) -> List[Dict[str, Any]]:
+    """Returns the dict of each line of a JSON lines file."""
+    with open(file_dir) as f:
+        return [json.loads(line) for line in f if line.strip()]
+        
+
 def persist_data_with_pickle(
     file_to_persist: Any,  
     mode: str,
@@ -73,6 +95,124 @@ def load_data_with_pickle(
     return pickle.load(open(file_dir, mode))
 
 
+def chunk_iterable(data: Iterable, chunk_size: int) -> Generator[List, None, None]:
+    """
+    Lazily splits the given iterable into lists of at most 'chunk_size' 
+    consecutive elements, keeping their original order.
+    """
+    iterator = iter(data)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def imap_in_processes(
+    fn: Callable[[Any], Any],
+    data: Iterable,
+    workers: int,
+    initializer: Callable[..., None] = None,
+    initargs: Tuple = ()
+) -> Generator[Any, None, None]:
+    """
+    Lazily applies 'fn' to each element of the iterable in a pool of 
+    'workers' processes and yields the results in the original order.
+    
+    The number of elements submitted and not yet yielded is bounded, so 
+    lazy iterables are never read ahead of the consumer by more than a 
+    few elements per worker. 'fn' must be picklable, and 'initializer' 
+    can set up state shared by every call in a worker.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        initargs=initargs
+    ) as executor:
+        pending = deque()
+        try:
+            for element in data:
+                pending.append(executor.submit(fn, element))
+                if len(pending) > 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def iterate_in_thread(
+    fn: Callable[[], Iterable],
+    queue_size: int = 8,
+    batch_size: int = 1000
+) -> Generator[Any, None, None]:
+    """
+    Iterates the iterable returned by 'fn' in a worker thread and lazily 
+    yields its elements in the original order, so the producer and the 
+    consumer run concurrently.
+    
+    Elements are passed in batches of 'batch_size' through a queue of at 
+    most 'queue_size' batches: once the queue is full the worker waits 
+    for the consumer (backpressure), so at most 'queue_size' batches are 
+    held in memory. Exceptions raised in the worker are raised to the 
+    consumer, and the worker stops when the generator is closed.
+    """
+    queue = Queue(maxsize=queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_put_batches_from_callable, 
+        args=(fn, batch_size, queue, stop), 
+        daemon=True
+    )
+    producer.start()
+    try:
+        while True:
+            batch = queue.get()
+            if batch is None:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()
+        while producer.is_alive():
+            try:
+                queue.get_nowait()
+            except Empty:
+                producer.join(0.01)
+
+
+def _put_batches_from_callable(
+    fn: Callable[[], Iterable],
+    batch_size: int,
+    queue: Queue, 
+    stop: threading.Event
+) -> None:
+    """Puts the elements of the iterable returned by 'fn' into the queue 
+    in batches, until it's exhausted or the consumer stops. Puts None at 
+    the end, or the exception raised while iterating."""
+    try:
+        for batch in chunk_iterable(fn(), batch_size):
+            if stop.is_set():
+                break
+            _put_unless_stopped(queue, stop, batch)
+    except BaseException as e:
+        _put_unless_stopped(queue, stop, e)
+    finally:
+        _put_unless_stopped(queue, stop, None)
+
+
+def _put_unless_stopped(queue: Queue, stop: threading.Event, item: Any) -> None:
+    """Puts the item into the queue, unless the consumer stops."""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return
+        except Full:
+            continue
+
+
 def check_if_dir_extension_is(to_check: str, dir_path: str) -> bool:
     if dir_path is None:
         return
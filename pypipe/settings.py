@@ -21,6 +21,7 @@ CONFIG_ALIAS = {
 REGEX_NORMALIZER_ALIAS = "regex_norm"
 COUNTVEC_FEATURIZER_ALIAS = "countvec"
 WORD2VEC_FEATURIZER_ALIAS = "word2vec"
+HASHINGVEC_FEATURIZER_ALIAS = "hashingvec"
 
 
 ###### Paths to model resources ######
@@ -28,12 +29,14 @@ WORD2VEC_FEATURIZER_ALIAS = "word2vec"
 MODEL_DEFAULT_PATHS = {
     COUNTVEC_FEATURIZER_ALIAS: "pypipe/data/models/countvec",
     WORD2VEC_FEATURIZER_ALIAS: "pypipe/data/models/word2vec",
+    HASHINGVEC_FEATURIZER_ALIAS: "pypipe/data/models/hashingvec",
     REGEX_NORMALIZER_ALIAS: "pypipe/data/models/regex_norm"
 }
 
 VOCAB_DEFAULT_PATHS = {
     COUNTVEC_FEATURIZER_ALIAS: "pypipe/data/corpus/countvec",
-    WORD2VEC_FEATURIZER_ALIAS: "pypipe/data/corpus/word2vec"
+    WORD2VEC_FEATURIZER_ALIAS: "pypipe/data/corpus/word2vec",
+    HASHINGVEC_FEATURIZER_ALIAS: "pypipe/data/corpus/hashingvec"
 }
 
 
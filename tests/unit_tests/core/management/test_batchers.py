@@ -0,0 +1,104 @@
+import os
+import pickle
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from pypipe.core.management.batchers import AsyncMicroBatcher, WorkerState
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+class BatchFunctionSpy:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = []
+        self.fail = fail
+        
+    def __call__(self, batch):
+        self.calls.append(list(batch))
+        if self.fail:
+            raise RuntimeError("failed")
+        return [text.upper() for text in batch]
+
+
+def get_state_in_worker(state, _):
+    return state, os.getpid(), id(state)
+
+
+async def async_iterable(data):
+    for element in data:
+        await asyncio.sleep(0)
+        yield element
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+def test_submit_method_when_requests_are_concurrent_expected_one_batch_call():
+    fn = BatchFunctionSpy()
+    batcher = AsyncMicroBatcher(fn, max_delay=0.01)
+    
+    async def submit_requests():
+        return await asyncio.gather(
+            batcher.submit(["a", "b"]), 
+            batcher.submit([]), 
+            batcher.submit(["c"])
+        )
+    
+    assert asyncio.run(submit_requests()) == [["A", "B"], [], ["C"]]
+    assert fn.calls == [["a", "b", "c"]]
+    
+    
+def test_submit_method_when_max_batch_size_is_reached_expected_batch_processed_without_delay():
+    fn = BatchFunctionSpy()
+    batcher = AsyncMicroBatcher(fn, max_batch_size=2, max_delay=60)
+    
+    async def submit_requests():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit(["a"]), batcher.submit(["b", "c"])), 
+            timeout=5
+        )
+    
+    assert asyncio.run(submit_requests()) == [["A"], ["B", "C"]]
+    
+    
+def test_submit_method_when_data_is_async_iterable_expected_chunks_concatenated():
+    fn = BatchFunctionSpy()
+    batcher = AsyncMicroBatcher(fn, max_batch_size=2, max_delay=0)
+    
+    output = asyncio.run(batcher.submit(async_iterable(["a", "b", "c", "d", "e"])))
+    
+    assert output == ["A", "B", "C", "D", "E"]
+    assert [len(call) for call in fn.calls] == [2, 2, 1]
+    
+    
+def test_submit_method_when_batch_function_fails_expected_error_raised_to_every_request():
+    batcher = AsyncMicroBatcher(BatchFunctionSpy(fail=True), max_delay=0.01)
+    
+    async def submit_requests():
+        return await asyncio.gather(
+            batcher.submit(["a"]), 
+            batcher.submit(["b"]), 
+            return_exceptions=True
+        )
+    
+    assert all(isinstance(e, RuntimeError) for e in asyncio.run(submit_requests()))
+    
+    
+def test_WorkerState_when_sent_to_worker_processes_expected_state_built_once_per_worker():
+    state = WorkerState(sorted, [3, 1, 2])
+    
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        outputs = list(executor.map(get_state_in_worker, [state] * 8, range(8)))
+    
+    states_by_worker = {}
+    for _, pid, state_id in outputs:
+        states_by_worker.setdefault(pid, set()).add(state_id)
+    
+    assert pickle.loads(pickle.dumps(state)) == [1, 2, 3]
+    assert all(output == [1, 2, 3] for output, _, _ in outputs)
+    assert all(len(state_ids) == 1 for state_ids in states_by_worker.values())
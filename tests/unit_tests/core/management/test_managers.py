@@ -0,0 +1,401 @@
+import os
+import gzip
+from typing import List
+
+import pytest
+from omegaconf import OmegaConf
+
+from tests import utils
+
+from pypipe.core.management.managers import (
+    DataLazyManager, 
+    VocabularyManager, 
+    StageCacheManager,
+    TokenizedCorpusManager
+)
+from pypipe.core.management.readers import LineOffsetIndex
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_dummy_corpus_for_testing() -> List[str]:
+    return [f"sentence number {i}" for i in range(50)]
+
+
+@pytest.fixture
+def get_temp_txt_file_for_testing(get_dummy_corpus_for_testing) -> str:
+    tmp_txt_file = utils.create_temp_txt_file_from_list(
+        obj=get_dummy_corpus_for_testing,
+        delete=False
+    )
+    yield tmp_txt_file
+    os.remove(tmp_txt_file)
+    if os.path.exists(tmp_txt_file + LineOffsetIndex.sidecar_suffix):
+        os.remove(tmp_txt_file + LineOffsetIndex.sidecar_suffix)
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+################## DataLazyManager ##################
+
+
+def test_DataLazyManager_iteration_when_path_is_given_expected_stripped_lines(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    assert list(DataLazyManager(get_temp_txt_file_for_testing)) == get_dummy_corpus_for_testing
+
+
+def test_split_method_when_path_is_given_expected_DataLazyManager_parts_with_all_lines(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    parts = DataLazyManager(get_temp_txt_file_for_testing).split(4)
+    
+    assert len(parts) == 4
+    assert all(isinstance(part, DataLazyManager) for part in parts)
+    assert [line for part in parts for line in part] == get_dummy_corpus_for_testing
+    
+
+def test_split_method_when_list_is_given_expected_ValueError(
+    get_dummy_corpus_for_testing
+):
+    with pytest.raises(ValueError):
+        DataLazyManager(get_dummy_corpus_for_testing).split(2)
+
+
+def test_len_method_when_path_is_given_expected_number_of_lines_and_persisted_line_index(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    path = get_temp_txt_file_for_testing
+    
+    assert len(DataLazyManager(path)) == len(get_dummy_corpus_for_testing)
+    assert os.path.exists(path + LineOffsetIndex.sidecar_suffix)
+    
+    
+def test_len_method_when_file_changes_expected_line_index_rebuilt(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    path = get_temp_txt_file_for_testing
+    
+    assert len(DataLazyManager(path)) == len(get_dummy_corpus_for_testing)
+    
+    with open(path, "a") as f:
+        f.write("\nnew sentence")
+    
+    assert len(DataLazyManager(path)) == len(get_dummy_corpus_for_testing) + 1
+
+
+def test_getitem_method_when_path_and_index_or_slice_are_given_expected_same_as_list(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    corpus = get_dummy_corpus_for_testing
+    data = DataLazyManager(get_temp_txt_file_for_testing)
+    
+    assert data[0] == corpus[0]
+    assert data[-1] == corpus[-1]
+    assert data[10:20:3] == corpus[10:20:3]
+    
+    shard = data[10:20]
+    
+    assert isinstance(shard, DataLazyManager)
+    assert len(shard) == 10
+    assert list(shard) == corpus[10:20]
+    assert shard[-1] == corpus[19]
+    
+    with pytest.raises(IndexError):
+        data[len(corpus)]
+
+
+def test_DataLazyManager_iteration_when_gzip_path_is_given_expected_decompressed_lines_and_no_length(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    compressed_path = get_temp_txt_file_for_testing + ".gz"
+    
+    with gzip.open(compressed_path, "wt") as f:
+        f.write("\n".join(get_dummy_corpus_for_testing))
+    
+    data = DataLazyManager(compressed_path)
+    
+    assert list(data) == get_dummy_corpus_for_testing
+    
+    with pytest.raises(TypeError):
+        len(data)
+    
+    with pytest.raises(ValueError):
+        data.split(2)
+    
+    os.remove(compressed_path)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_iter_batches_method_when_list_path_or_generator_is_given_expected_batches_of_batch_size(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing,
+    batch_size
+):
+    corpus = get_dummy_corpus_for_testing
+    
+    for data in (
+        corpus, 
+        get_temp_txt_file_for_testing, 
+        (sent for sent in corpus)
+    ):
+        batches = list(DataLazyManager(data).iter_batches(batch_size=batch_size))
+        
+        assert all(len(batch) <= batch_size for batch in batches)
+        assert sum(batches, []) == corpus
+        
+        
+################## VocabularyManager ##################
+
+
+def test_add_texts_method_expected_same_vocabulary_as_add_text(
+    get_dummy_corpus_for_testing
+):
+    texts = ["b", "a", "b", "c", "a", "d"] + get_dummy_corpus_for_testing
+    
+    vocab = VocabularyManager(data=[], lower_case=True)
+    vocab.add_texts(texts)
+    
+    expected_vocab = VocabularyManager(data=[], lower_case=True)
+    for text in texts:
+        expected_vocab.add_text(text)
+        
+    assert vocab._text2idx == expected_vocab._text2idx
+    assert vocab._idx2text == expected_vocab._idx2text
+
+
+def test_get_idx_by_text_method_expected_unk_idx_for_unknown_text():
+    vocab = VocabularyManager(data=["a b", "c"])
+    
+    assert vocab.unk_idx == 0
+    assert vocab.get_idx_by_text("z") == vocab.unk_idx
+    assert vocab.get_text_by_index(vocab.get_idx_by_text("c")) == "c"
+    with pytest.raises(KeyError):
+        vocab.get_text_by_index(len(vocab))
+        
+        
+def test_text2idx_arg_expected_dense_idx2text():
+    vocab = VocabularyManager(data=[], text2idx={"b": 1, "a": 0}, unk_text=None)
+    
+    assert [vocab.get_text_by_index(i) for i in range(len(vocab))] == ["a", "b"]
+    with pytest.raises(ValueError):
+        VocabularyManager(data=[], text2idx={"a": 0, "b": 2})
+
+
+@pytest.mark.parametrize("texts", [
+    ["sentence number 1", "", "sentence number 2"],
+    ["canción número 1", "", "ñandú 🙂"]
+])
+def test_save_and_load_methods_expected_same_vocabulary(tmp_path, texts):
+    vocab = VocabularyManager(data=texts, data2sent=True, lower_case=True)
+    path = str(tmp_path / "vocab.npz")
+    
+    vocab.save(path)
+    loaded_vocab = VocabularyManager.load(path)
+    
+    assert loaded_vocab._text2idx == vocab._text2idx
+    assert loaded_vocab._idx2text == vocab._idx2text
+    assert list(loaded_vocab) == list(vocab)
+    assert loaded_vocab.unk_idx == vocab.unk_idx
+    assert loaded_vocab.add_text("Nueva") == len(vocab)
+    
+    
+def test_merge_method_expected_same_vocabulary_as_serial_build():
+    texts = ["a", "b", "a", "c", "d", "b", "e"]
+    
+    vocab = VocabularyManager(data=texts[:3])
+    vocab.merge(VocabularyManager(data=texts[3:], unk_text=None))
+    
+    expected_vocab = VocabularyManager(data=texts)
+    
+    assert vocab._text2idx == expected_vocab._text2idx
+    assert vocab._idx2text == expected_vocab._idx2text
+    
+    
+@pytest.mark.parametrize("workers", [2, 3])
+def test_workers_arg_expected_same_vocabulary_as_serial_build(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing,
+    workers
+):
+    corpus = get_dummy_corpus_for_testing * 2 + ["Sentence Number 7"]
+    
+    for data in (corpus, get_temp_txt_file_for_testing):
+        vocab = VocabularyManager(data=data, lower_case=True, workers=workers)
+        expected_vocab = VocabularyManager(data=data, lower_case=True)
+        
+        assert vocab._idx2text == expected_vocab._idx2text
+        assert vocab._text2idx == expected_vocab._text2idx
+    
+    
+def test_count_freq_arg_expected_frequency_of_each_text():
+    texts = ["a", "b", "a", "c", "a", "b"]
+    
+    vocab = VocabularyManager(data=texts[:2], count_freq=True)
+    vocab.add_texts(texts[2:])
+    vocab.add_text("c")
+    
+    assert vocab.get_text2freq() == {"<<UNK>>": 0, "a": 3, "b": 2, "c": 2}
+    assert vocab.get_freq_by_text("z") == 0
+    with pytest.raises(ValueError):
+        VocabularyManager(data=texts).get_text2freq()
+        
+        
+def test_prune_method_expected_min_count_and_top_k_texts_in_first_seen_order():
+    texts = ["a", "b", "b", "c", "c", "c", "d", "d", "d", "e"]
+    
+    vocab = VocabularyManager(data=texts, count_freq=True)
+    vocab.prune(min_count=2, top_k=2)
+    
+    assert vocab.get_text2freq() == {"<<UNK>>": 0, "c": 3, "d": 3}
+    assert vocab.get_idx_by_text("b") == vocab.unk_idx == 0
+    assert vocab.get_text_by_index(2) == "d"
+
+
+def test_max_size_arg_expected_most_frequent_texts_kept():
+    texts = ["a", "b"] * 50 + [f"rare {i}" for i in range(30)] + ["a", "b"]
+    
+    vocab = VocabularyManager(data=texts, count_freq=True, unk_text=None, max_size=8)
+    
+    assert len(vocab) <= 8
+    assert vocab.get_freq_by_text("a") == vocab.get_freq_by_text("b") == 51
+    
+    
+def test_merge_and_save_methods_expected_frequencies_kept(tmp_path):
+    vocab = VocabularyManager(data=["a", "b", "a"], count_freq=True)
+    vocab.merge(VocabularyManager(data=["c", "a"], count_freq=True, unk_text=None))
+    path = str(tmp_path / "vocab.npz")
+    
+    vocab.save(path)
+    
+    expected = {"<<UNK>>": 0, "a": 3, "b": 1, "c": 1}
+    assert vocab.get_text2freq() == expected
+    assert VocabularyManager.load(path).get_text2freq() == expected
+
+
+################## TokenizedCorpusManager ##################
+
+
+def test_TokenizedCorpusManager_build_and_load_methods_expected_same_tokens_and_counts(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing,
+    tmp_path
+):
+    corpus = get_dummy_corpus_for_testing + ["", "sentence number 1"]
+    expected = [sent.split() for sent in corpus]
+    
+    tokenized = TokenizedCorpusManager.build(corpus, path=str(tmp_path), batch_size=7)
+    
+    assert len(tokenized) == len(corpus)
+    assert tokenized.n_tokens == 3 * (len(corpus) - 1)
+    assert list(tokenized) == list(tokenized) == expected
+    assert tokenized.vocab.get_freq_by_text("sentence") == len(corpus) - 1
+    assert list(TokenizedCorpusManager.load(str(tmp_path), batch_size=3)) == expected
+    
+    from_file = TokenizedCorpusManager.build(DataLazyManager(get_temp_txt_file_for_testing))
+    
+    assert list(from_file) == expected[:-2]
+    from_file.remove()
+    assert not os.path.exists(from_file.path)
+    
+    
+def test_TokenizedCorpusManager_build_method_when_data_is_empty_expected_no_sentences(tmp_path):
+    tokenized = TokenizedCorpusManager.build([], path=str(tmp_path))
+    
+    assert len(tokenized) == tokenized.n_tokens == 0
+    assert list(tokenized) == []
+
+
+
+################## StageCacheManager ##################
+
+
+def test_fingerprint_data_method_expected_same_hash_for_same_content(
+    get_temp_txt_file_for_testing,
+    get_dummy_corpus_for_testing
+):
+    corpus = get_dummy_corpus_for_testing
+    fingerprint = StageCacheManager.fingerprint_data(get_temp_txt_file_for_testing)
+    
+    assert fingerprint == StageCacheManager.fingerprint_data(get_temp_txt_file_for_testing)
+    assert StageCacheManager.fingerprint_data(corpus) == StageCacheManager.fingerprint_data(list(corpus))
+    assert StageCacheManager.fingerprint_data(corpus) != StageCacheManager.fingerprint_data(corpus[1:])
+    assert StageCacheManager.fingerprint_data(iter(corpus)) is None
+    
+    with open(get_temp_txt_file_for_testing, "a") as f:
+        f.write("\nnew sentence")
+    
+    assert StageCacheManager.fingerprint_data(get_temp_txt_file_for_testing) != fingerprint
+    
+
+def test_get_key_method_expected_key_changes_only_with_input_alias_or_configs():
+    configs = OmegaConf.create({"window": 5, "handlers": {"a": {"active": True}}})
+    key = StageCacheManager.get_key("input", "word2vec", configs)
+    
+    assert key == StageCacheManager.get_key(
+        "input", "word2vec", OmegaConf.create({"handlers": {"a": {"active": True}}, "window": 5})
+    )
+    assert key != StageCacheManager.get_key("other input", "word2vec", configs)
+    assert key != StageCacheManager.get_key("input", "countvec", configs)
+    configs.window = 3
+    assert key != StageCacheManager.get_key("input", "word2vec", configs)
+    
+    
+def test_get_key_method_when_referenced_files_are_replaced_expected_other_key(tmp_path):
+    model_path = tmp_path / "word2vec_model.model"
+    model_path.write_text("model")
+    index_path = tmp_path / "index"
+    index_path.mkdir()
+    (index_path / "ids.npy").write_text("ids")
+    configs = OmegaConf.create({
+        "window": 5,
+        "path_to_get_trained_model": str(model_path),
+        "path_to_get_vector_index": str(index_path),
+        "path_to_get_stored_vocabulary": None
+    })
+    key = StageCacheManager.get_key("input", "word2vec", configs)
+    
+    assert key == StageCacheManager.get_key("input", "word2vec", configs)
+    
+    model_path.write_text("retrained model")
+    retrained_key = StageCacheManager.get_key("input", "word2vec", configs)
+    
+    assert retrained_key != key
+    
+    (tmp_path / "word2vec_model.model.wv.vectors.npy").write_text("vectors")
+    
+    assert StageCacheManager.get_key("input", "word2vec", configs) != retrained_key
+    
+    retrained_key = StageCacheManager.get_key("input", "word2vec", configs)
+    os.utime(index_path / "ids.npy", ns=(0, 0))
+    
+    assert StageCacheManager.get_key("input", "word2vec", configs) != retrained_key
+    
+    
+def test_save_and_load_methods_expected_stored_corpus_and_model(tmp_path):
+    stage_cache = StageCacheManager(str(tmp_path / "stage_cache"))
+    corpus = ["normalized sentence", "", "ñandú"]
+    
+    assert not stage_cache.contains_corpus("a")
+    
+    stored = stage_cache.save_corpus("a", (sent for sent in corpus))
+    stage_cache.save_model("b", {"model": [1, 2]})
+    
+    assert stage_cache.contains_corpus("a") and not stage_cache.contains_model("a")
+    assert stage_cache.contains_model("b")
+    assert list(stored) == list(stage_cache.load_corpus("a")) == corpus
+    assert stage_cache.load_model("b") == {"model": [1, 2]}
+    assert sorted(os.listdir(stage_cache.path)) == ["a", "b"]
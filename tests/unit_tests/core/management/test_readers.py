@@ -0,0 +1,133 @@
+import os
+import bz2
+import gzip
+import lzma
+from typing import List
+
+import pytest
+
+from tests import utils
+
+from pypipe.core.management.readers import MmapLineReader, CompressedLineReader
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_dummy_lines_for_testing() -> List[str]:
+    return [
+        "hola gente linda",
+        "",
+        "  el nombre es MENTION  ",
+        "mi correo es EMAIL",
+        "su página es URL",
+    ]
+
+
+@pytest.fixture
+def get_temp_txt_file_for_testing(get_dummy_lines_for_testing) -> str:
+    tmp_txt_file = utils.create_temp_txt_file_from_list(
+        obj=get_dummy_lines_for_testing,
+        delete=False
+    )
+    yield tmp_txt_file
+    os.remove(tmp_txt_file)
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+################## MmapLineReader ##################
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 22])
+def test_MmapLineReader_iteration_when_block_size_is_given_expected_same_lines_as_text_mode_open(
+    get_temp_txt_file_for_testing,
+    block_size
+):
+    path = get_temp_txt_file_for_testing
+    
+    with open(path, "r") as f:
+        expected = [line.strip() for line in f]
+    
+    assert list(MmapLineReader(path, block_size=block_size)) == expected
+    
+
+@pytest.mark.parametrize("n", [1, 2, 3, 10])
+def test_split_ranges_static_method_when_n_is_given_expected_every_line_read_once(
+    get_temp_txt_file_for_testing,
+    get_dummy_lines_for_testing,
+    n
+):
+    path = get_temp_txt_file_for_testing
+    
+    ranges = MmapLineReader.split_ranges(path, n)
+    
+    lines = []
+    for start, end in ranges:
+        lines.extend(MmapLineReader(path, start=start, end=end, block_size=4))
+    
+    assert len(ranges) == n
+    assert lines == [line.strip() for line in get_dummy_lines_for_testing]
+    
+    
+def test_iter_batches_method_expected_lists_of_lines(
+    get_temp_txt_file_for_testing,
+    get_dummy_lines_for_testing
+):
+    batches = list(
+        MmapLineReader(get_temp_txt_file_for_testing, block_size=20).iter_batches()
+    )
+    
+    assert len(batches) > 1
+    assert sum(batches, []) == [line.strip() for line in get_dummy_lines_for_testing]
+
+
+################## CompressedLineReader ##################
+
+
+@pytest.mark.parametrize("extension, compress", [
+    (".gz", gzip.compress), 
+    (".bz2", bz2.compress), 
+    (".xz", lzma.compress)
+])
+def test_CompressedLineReader_iteration_when_compressed_file_is_given_expected_same_lines_as_plain_file(
+    get_temp_txt_file_for_testing,
+    extension,
+    compress
+):
+    path = get_temp_txt_file_for_testing
+    
+    with open(path, "rb") as f:
+        compressed_path = path + extension
+        with open(compressed_path, "wb") as g:
+            g.write(compress(f.read()))
+    
+    lines = list(CompressedLineReader(compressed_path, block_size=8, read_ahead=2))
+    
+    assert CompressedLineReader.supports(compressed_path)
+    assert lines == list(MmapLineReader(path))
+    
+    os.remove(compressed_path)
+    
+
+def test_CompressedLineReader_iteration_when_closed_early_expected_producer_thread_stopped(
+    get_temp_txt_file_for_testing
+):
+    compressed_path = get_temp_txt_file_for_testing + ".gz"
+    
+    with gzip.open(compressed_path, "wt") as f:
+        f.write("\n".join(str(i) for i in range(10000)))
+    
+    lines = iter(CompressedLineReader(compressed_path, block_size=16, read_ahead=1))
+    
+    assert next(lines) == "0"
+    
+    lines.close()
+    
+    os.remove(compressed_path)
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+from pytest_mock import mocker
+
+from omegaconf import OmegaConf, DictConfig
+
+from pypipe.core.pipeline.pipeline import Pipeline
+from pypipe.core.management.managers import DataLazyManager
+from pypipe.core.processes.normalization.normalizers import RegexNormalizer
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_pipeline_configs_for_testing() -> DictConfig:
+    configs = OmegaConf.load("configs/prepro1.yml")
+    configs.pipeline.regex_norm.path_to_save_normcorpus = None
+    configs.pipeline.word2vec.epochs = 1
+    configs.pipeline.word2vec.embeddings_size = 8
+    configs.pipeline.word2vec.workers = 1
+    configs.pipeline.hashingvec.active = True
+    return configs
+
+
+@pytest.fixture
+def get_pipeline_instance_for_testing(get_pipeline_configs_for_testing, tmp_path) -> Pipeline:
+    path = str(tmp_path / "configs.yml")
+    OmegaConf.save(get_pipeline_configs_for_testing, path)
+    return Pipeline(path)
+
+
+@pytest.fixture
+def get_dummy_corpus_for_testing():
+    return ["hola que tal esto", "otra frase mas larga"] * 10
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+def test__get_process_graph_method_expected_featurizers_read_last_normalizer(
+    get_pipeline_instance_for_testing
+):
+    assert get_pipeline_instance_for_testing._get_process_graph() == {
+        "regex_norm": None, 
+        "countvec": "regex_norm", 
+        "word2vec": "regex_norm", 
+        "hashingvec": "regex_norm"
+    }
+
+
+def test__get_process_graph_method_when_input_is_not_a_normalizer_expected_ValueError(
+    get_pipeline_instance_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    pipeline._config.pipeline.word2vec.input = "countvec"
+    
+    with pytest.raises(ValueError):
+        pipeline._get_process_graph()
+
+
+def test_run_processes_as_dag_method_expected_one_normalization_and_all_featurizers_trained(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing,
+    mocker
+):
+    pipeline = get_pipeline_instance_for_testing
+    spy_normalize = mocker.spy(RegexNormalizer, "normalize_text")
+    spy_spill = mocker.spy(Pipeline, "_spill_data")
+    
+    outputs = pipeline.run_processes_as_dag(data=(sent for sent in get_dummy_corpus_for_testing))
+    
+    assert outputs == {"countvec": None, "word2vec": None, "hashingvec": None}
+    assert spy_normalize.call_count == 1
+    assert spy_spill.call_count == 1
+    assert "larga" in pipeline.processes["countvec"].featurizer.vocabulary_
+    assert pipeline.processes["word2vec"].featurizer.corpus_count == len(get_dummy_corpus_for_testing)
+    assert pipeline.processes["hashingvec"].featurizer is not None
+    
+    
+def test_run_processes_sequentially_method_expected_featurizer_after_featurizer_not_trained(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    
+    pipeline.run_processes_sequentially(data=get_dummy_corpus_for_testing)
+    pipeline.run_processes_sequentially(data=get_dummy_corpus_for_testing)
+    
+    assert pipeline.processes["countvec"].featurizer is not None
+    assert pipeline.processes["word2vec"].featurizer is None
+    
+    
+def test_run_processes_concurrently_method_expected_same_featurizer_as_sequential_execution(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    pipeline._config.pipeline.word2vec.active = False
+    pipeline._config.pipeline.hashingvec.active = False
+    
+    pipeline.run_processes_sequentially(data=get_dummy_corpus_for_testing)
+    expected = pipeline.processes["countvec"].featurizer.vocabulary_
+    pipeline.run_processes_concurrently(
+        data=(sent for sent in get_dummy_corpus_for_testing), 
+        queue_size=1, 
+        batch_size=3
+    )
+    
+    assert pipeline.processes["countvec"].featurizer.vocabulary_ == expected
+    
+    
+def test_run_processes_concurrently_method_when_normalizer_fails_expected_error_raised(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing,
+    mocker
+):
+    pipeline = get_pipeline_instance_for_testing
+    mocker.patch.object(RegexNormalizer, "_normalize_batch", side_effect=RuntimeError("failed"))
+    
+    with pytest.raises(RuntimeError, match="failed"):
+        pipeline.run_processes_concurrently(data=get_dummy_corpus_for_testing)
+        
+        
+def test_run_processes_concurrently_method_when_last_stage_is_normalizer_expected_lazy_output(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    for alias in ("countvec", "word2vec", "hashingvec"):
+        pipeline._config.pipeline[alias].active = False
+    
+    output = pipeline.run_processes_concurrently(data=get_dummy_corpus_for_testing, batch_size=4)
+    
+    assert isinstance(output, DataLazyManager)
+    assert list(output) == list(pipeline.run_processes_sequentially(data=get_dummy_corpus_for_testing))
+    
+    
+def test_arun_method_when_requests_are_concurrent_expected_same_outputs_as_synchronous_processes(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    pipeline._config.pipeline.word2vec.active = False
+    pipeline.run_processes_sequentially(data=get_dummy_corpus_for_testing)
+    normalizer = pipeline.processes["regex_norm"]
+    featurizer = pipeline.processes["countvec"]
+    requests = [get_dummy_corpus_for_testing[i:i + 3] for i in range(0, 12, 3)]
+    
+    async def run_requests():
+        return await asyncio.gather(*(pipeline.arun(request) for request in requests))
+    
+    outputs = asyncio.run(run_requests())
+    
+    assert set(outputs[0]) == {"countvec", "hashingvec"}
+    for request, output in zip(requests, outputs):
+        expected = featurizer.process(normalizer.normalize_text(request))
+        assert (output["countvec"] != expected).nnz == 0
+        assert output["hashingvec"].shape[0] == len(request)
+    
+    
+def test_run_processes_sequentially_method_when_token_cache_is_active_and_normalized_data_is_single_pass_expected_featurizer_trained(
+    get_pipeline_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    pipeline = get_pipeline_instance_for_testing
+    pipeline._config.token_cache.active = True
+    pipeline._config.pipeline.countvec.active = False
+    pipeline._config.pipeline.word2vec.training_mode = "corpus_file"
+    
+    pipeline.run_processes_sequentially(data=(sent for sent in get_dummy_corpus_for_testing))
+    
+    featurizer = pipeline.processes["word2vec"].featurizer
+    assert featurizer.corpus_count == len(get_dummy_corpus_for_testing)
+    assert "larga" in featurizer.wv.key_to_index
@@ -0,0 +1,132 @@
+import io
+import json
+import asyncio
+import threading
+
+import pytest
+
+from omegaconf import OmegaConf, DictConfig
+
+from pypipe.core.pipeline.pipeline import Pipeline
+from pypipe.core.pipeline.server import PipelineServer
+from pypipe.core.pipeline.client import PipelineClient
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_pipeline_configs_for_testing() -> DictConfig:
+    configs = OmegaConf.load("configs/prepro1.yml")
+    configs.pipeline.regex_norm.path_to_save_normcorpus = None
+    configs.pipeline.countvec.active = False
+    configs.pipeline.word2vec.active = False
+    configs.pipeline.hashingvec.active = True
+    configs.pipeline.hashingvec.n_features = 16
+    return configs
+
+
+@pytest.fixture
+def get_server_instance_for_testing(get_pipeline_configs_for_testing, tmp_path) -> PipelineServer:
+    path = str(tmp_path / "configs.yml")
+    OmegaConf.save(get_pipeline_configs_for_testing, path)
+    return PipelineServer(Pipeline(path))
+
+
+@pytest.fixture
+def get_running_server_for_testing(get_server_instance_for_testing, tmp_path):
+    path = str(tmp_path / "pypipe.sock")
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(get_server_instance_for_testing.serve_unix_socket(path))
+    
+    def run_server():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            loop.close()
+    
+    thread = threading.Thread(target=run_server, daemon=True)
+    thread.start()
+    while not (tmp_path / "pypipe.sock").exists():
+        pass
+    yield path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+
+
+def handle_request(server: PipelineServer, request: dict) -> dict:
+    return asyncio.run(server.handle_request(json.dumps(request).encode("utf-8")))
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+def test_handle_request_method_when_method_is_normalize_expected_normalized_texts(
+    get_server_instance_for_testing
+):
+    response = handle_request(
+        get_server_instance_for_testing, 
+        {"id": 7, "method": "normalize", "data": ["HOLAAA que tal!!"]}
+    )
+    
+    assert response == {"id": 7, "result": {"regex_norm": ["hola que tal"]}}
+    
+    
+def test_handle_request_method_when_method_is_featurize_expected_serialized_sparse_matrix(
+    get_server_instance_for_testing
+):
+    response = handle_request(
+        get_server_instance_for_testing, 
+        {"id": 1, "method": "featurize", "data": ["hola que tal", "hola"]}
+    )
+    
+    matrix = response["result"]["hashingvec"]
+    assert matrix["shape"] == [2, 16]
+    assert matrix["indptr"][-1] == len(matrix["indices"]) == len(matrix["data"])
+    
+    
+def test_handle_request_method_when_request_is_invalid_expected_error_response(
+    get_server_instance_for_testing
+):
+    server = get_server_instance_for_testing
+    
+    assert "error" in handle_request(server, {"id": 1, "method": "train", "data": []})
+    assert "error" in handle_request(server, {"id": 2, "method": "featurize", "data": [], "stages": ["word2vec"]})
+    
+    
+def test_request_batches_method_expected_results_in_batches_order(
+    get_server_instance_for_testing,
+    get_running_server_for_testing
+):
+    normalizer = get_server_instance_for_testing.pipeline.processes["regex_norm"]
+    batches = [[f"HOLA {i}", f"que tal {i}x"] for i in range(20)]
+    
+    with PipelineClient(get_running_server_for_testing, timeout=10) as client:
+        results = list(client.request_batches("normalize", batches, window=4))
+        with pytest.raises(RuntimeError):
+            client.request("train", ["hola"])
+    
+    assert [result["regex_norm"] for result in results] == list(map(normalizer.normalize_text, batches))
+    
+    
+def test_serve_stdio_method_expected_one_response_line_per_request_line(
+    get_server_instance_for_testing,
+    monkeypatch
+):
+    requests = b'{"id": 1, "method": "normalize", "data": ["HOLA"]}\n\n{"id": 2, "method": "train", "data": []}\n'
+    stdin, stdout = io.TextIOWrapper(io.BytesIO(requests)), io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr("sys.stdin", stdin)
+    monkeypatch.setattr("sys.stdout", stdout)
+    
+    asyncio.run(get_server_instance_for_testing.serve_stdio())
+    
+    responses = {
+        response["id"]: response 
+        for response in map(json.loads, stdout.buffer.getvalue().splitlines())
+    }
+    assert responses[1]["result"] == {"regex_norm": ["hola"]}
+    assert "error" in responses[2]
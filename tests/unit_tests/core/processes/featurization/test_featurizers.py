@@ -1,17 +1,27 @@
 import os
+import asyncio
 from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
 from pytest_mock import mocker
+import numpy as np
 
 from omegaconf import OmegaConf, DictConfig
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from gensim.models import Word2Vec
 
 from tests import utils
 
 from pypipe.core.management.managers import VocabularyManager
 from pypipe.core.processes.featurization.base import TextFeaturizer
-from pypipe.core.processes.featurization.featurizers import CountVecFeaturizer
+from pypipe.core.management.managers import DataLazyManager, TokenizedCorpusManager
+from pypipe.core.processes.featurization.featurizers import (
+    CountVecFeaturizer, 
+    HashingVecFeaturizer,
+    Word2VecFeaturizer
+)
+from pypipe.core.processes.featurization.indexes import IVFVectorIndex
 
 
 ############################################################################
@@ -847,3 +857,640 @@ def test_process_method_when_corpus_is_given_and_featurizer_is_not_None_expected
     assert isinstance(x, np.ndarray)
     mocked_transform_method.assert_called_once_with(get_dummy_list_vocab_for_testing)
 
+    
+    
+def test_process_batches_method_when_batches_are_given_expected_one_matrix_per_batch(
+    get_CountVecFeaturizer_instance_for_testing,
+    get_dummy_list_vocab_for_testing
+):
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer().fit(get_dummy_list_vocab_for_testing)
+    
+    batches = [["file for", "testing"], ["for testing file"]]
+    
+    matrices = list(countvec.process_batches(batches))
+    
+    assert [matrix.shape[0] for matrix in matrices] == [2, 1]
+    assert (matrices[1].toarray() == countvec.process(batches[1]).toarray()).all()
+
+    
+    
+def test_aprocess_method_when_executor_is_a_process_pool_expected_same_matrix_as_process(
+    get_CountVecFeaturizer_instance_for_testing,
+    get_dummy_list_vocab_for_testing
+):
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer().fit(get_dummy_list_vocab_for_testing)
+    corpus = ["file for", "testing", "for testing file"]
+    
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        countvec.set_executor(executor)
+        x = asyncio.run(countvec.aprocess(corpus))
+    
+    assert (x != countvec.process(corpus)).nnz == 0
+
+
+
+################## HashingVecFeaturizer ##################
+
+
+@pytest.fixture
+def get_HashingVecFeaturizer_instance_for_testing() -> HashingVecFeaturizer:
+    configs = HashingVecFeaturizer.get_default_configs()
+    configs.n_features = 64
+    configs.chunk_size = 2
+    configs.vocabulary_sample_size = 3
+    return HashingVecFeaturizer(configs=configs)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_hashingvec_process_method_expected_same_matrix_as_HashingVectorizer(
+    get_HashingVecFeaturizer_instance_for_testing,
+    workers
+):
+    hashingvec = get_HashingVecFeaturizer_instance_for_testing
+    corpus = ["file for testing", "testing", "for file file", "", "more testing"]
+    
+    expected = HashingVectorizer(
+        n_features=64, alternate_sign=False, norm=None, lowercase=False
+    ).transform(corpus)
+    
+    for data in (corpus, DataLazyManager(corpus), iter(corpus)):
+        x = hashingvec.process(data, workers=workers)
+        assert (x != expected).nnz == 0
+    assert hashingvec.process([]).shape == (0, 64)
+    
+    
+def test_hashingvec_aprocess_method_when_executor_is_a_process_pool_expected_same_matrix_as_process(
+    get_HashingVecFeaturizer_instance_for_testing
+):
+    hashingvec = get_HashingVecFeaturizer_instance_for_testing
+    corpus = ["file for testing", "testing", "for file file", "", "more testing"]
+    
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        hashingvec.set_executor(executor)
+        x = asyncio.run(hashingvec.aprocess(corpus))
+    
+    assert (x != hashingvec.process(corpus)).nnz == 0
+
+
+def test_hashingvec_train_method_expected_sampled_vocabulary_for_inverse_lookup(
+    get_HashingVecFeaturizer_instance_for_testing
+):
+    hashingvec = get_HashingVecFeaturizer_instance_for_testing
+    corpus = ["file for testing", "more testing"]
+    
+    hashingvec.train(corpus)
+    
+    x = hashingvec.process(["testing"])
+    
+    assert sorted(sum(hashingvec.vocab.values(), [])) == ["file", "for", "testing"]
+    assert "testing" in hashingvec.get_texts_by_index(x.indices[0])
+
+
+def test_hashingvec_train_method_when_token_cache_is_set_expected_same_vocabulary_sample(
+    get_HashingVecFeaturizer_instance_for_testing,
+    tmp_path
+):
+    corpus = ["file for testing", "a testing", "for file file", "", "more testing"]
+    hashingvec = get_HashingVecFeaturizer_instance_for_testing
+    hashingvec.train(corpus)
+    expected = hashingvec.vocab
+    
+    hashingvec.set_token_cache(TokenizedCorpusManager.build(corpus, str(tmp_path)))
+    hashingvec.train(iter([]))
+    
+    assert hashingvec.vocab == expected
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"max_features": 3},
+    {"min_df": 2},
+    {"max_df": 0.5, "ngram_range": (1, 2)},
+    {"binary": True, "max_features": 2}
+])
+def test__fit_streaming_method_expected_same_vocabulary_as_fit(
+    get_CountVecFeaturizer_instance_for_testing,
+    params
+):
+    corpus = [
+        "bb aa cc", "cc cc dd", "aa bb", "", "ee ee ee ee", "dd aa", "ff", 
+        "bb bb", "cc aa dd ee"
+    ]
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer(**params)
+    countvec._trainset = DataLazyManager(corpus)
+    countvec._chunk_size = 2
+    
+    countvec._fit_streaming()
+    
+    expected = CountVectorizer(**params).fit(corpus)
+    assert countvec.featurizer.vocabulary_ == expected.vocabulary_
+    assert countvec.featurizer.stop_words_ == expected.stop_words_
+    assert (countvec.featurizer.transform(corpus) != expected.transform(corpus)).nnz == 0
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"max_features": 3, "lowercase": True},
+    {"min_df": 2, "stop_words": ["bb"]},
+    {"max_df": 0.5, "ngram_range": (1, 2)},
+    {"binary": True, "max_features": 2}
+])
+def test_train_method_when_token_cache_is_set_expected_same_vocabulary_as_fit(
+    get_CountVecFeaturizer_instance_for_testing,
+    params,
+    tmp_path
+):
+    corpus = [
+        "bb aa Cc", "cc cc dd", "aa bb", "", "ee-ee ee e ee", "dd aa", "ff's", 
+        "bb bb", "cc aa dd ee"
+    ]
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer(**params)
+    countvec.set_token_cache(TokenizedCorpusManager.build(corpus, str(tmp_path), batch_size=2))
+    
+    countvec.train(corpus)
+    
+    expected = CountVectorizer(**params).fit(corpus)
+    assert countvec.featurizer.vocabulary_ == expected.vocabulary_
+    assert countvec.featurizer.stop_words_ == expected.stop_words_
+    
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_method_when_chunked_expected_same_matrix_as_transform(
+    get_CountVecFeaturizer_instance_for_testing,
+    workers
+):
+    corpus = ["file for testing", "testing", "for file file", "", "more testing"]
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer().fit(corpus)
+    countvec._chunk_size = 2
+    
+    expected = countvec.featurizer.transform(corpus)
+    
+    for data in (corpus, DataLazyManager(corpus), iter(corpus)):
+        x = countvec.process(data, workers=workers)
+        assert (x != expected).nnz == 0
+        
+    blocks = list(countvec.process(DataLazyManager(corpus), workers=workers, lazy=True))
+    assert [block.shape[0] for block in blocks] == [2, 2, 1]
+    assert countvec.process(iter([]), workers=workers).shape == (0, expected.shape[1])
+
+
+def test_partial_fit_method_expected_stable_indices_and_persisted_delta(
+    get_CountVecFeaturizer_instance_for_testing,
+    tmp_path
+):
+    countvec = get_CountVecFeaturizer_instance_for_testing
+    countvec.featurizer = CountVectorizer().fit(["file for testing"])
+    countvec.path_to_save_vocabulary = str(tmp_path)
+    vocabulary = dict(countvec.featurizer.vocabulary_)
+    
+    first_delta = countvec.partial_fit(["more testing", "for more data"], persist=True)
+    second_delta = countvec.partial_fit(DataLazyManager(["data here"]), persist=True)
+    
+    assert first_delta == {"more": 3, "data": 4}
+    assert second_delta == {"here": 5}
+    assert countvec.featurizer.vocabulary_ == {**vocabulary, **first_delta, **second_delta}
+    assert countvec.process(["here file"]).toarray().tolist() == [[1, 0, 0, 0, 0, 1]]
+    
+    model_path = utils.create_temp_pickle_file(
+        obj=CountVectorizer().fit(["file for testing"]), 
+        suffix=".pkl"
+    )
+    countvec.featurizer = None
+    countvec._path_to_get_trained_model = model_path
+    countvec._path_to_get_vocabulary_delta = str(tmp_path / "vocab_delta.jsonl")
+    
+    countvec.load()
+    os.remove(model_path)
+    
+    assert countvec.featurizer.vocabulary_ == {**vocabulary, **first_delta, **second_delta}
+
+
+################## Word2VecFeaturizer ##################
+
+
+@pytest.fixture
+def get_Word2VecFeaturizer_configs_for_testing() -> DictConfig:
+    configs = Word2VecFeaturizer.get_default_configs()
+    configs.embeddings_size = 8
+    configs.epochs = 1
+    configs.workers = 2
+    return configs
+
+
+@pytest.fixture
+def get_dummy_corpus_for_word2vec_testing() -> List[str]:
+    return [f"word{i % 7} word{i % 3} common word{i % 5}" for i in range(60)]
+
+
+def test_word2vec_train_method_when_corpus_file_mode_expected_vocabulary_from_corpus_file(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    mocker
+):
+    corpus = get_dummy_corpus_for_word2vec_testing
+    path = utils.create_temp_txt_file_from_list(obj=corpus)
+    
+    word2vec = Word2VecFeaturizer(configs=get_Word2VecFeaturizer_configs_for_testing)
+    spy_train = mocker.spy(Word2Vec, "train")
+    
+    word2vec.train(DataLazyManager(path))
+    os.remove(path)
+    
+    expected = Word2Vec(vector_size=8, min_count=1)
+    expected.build_vocab(corpus_iterable=[sent.split() for sent in corpus])
+    
+    assert spy_train.call_args.kwargs["corpus_file"] == path
+    assert spy_train.call_args.kwargs["total_words"] == 4 * len(corpus)
+    assert word2vec.featurizer.workers == 2
+    assert word2vec.featurizer.corpus_count == len(corpus)
+    assert word2vec.featurizer.wv.index_to_key == expected.wv.index_to_key + ["<<UNK>>"]
+    
+    
+def test_word2vec_train_method_when_corpus_is_not_file_backed_expected_spilled_corpus_file_removed(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    mocker
+):
+    word2vec = Word2VecFeaturizer(configs=get_Word2VecFeaturizer_configs_for_testing)
+    spy_train = mocker.spy(Word2Vec, "train")
+    
+    word2vec.train(iter(get_dummy_corpus_for_word2vec_testing))
+    
+    corpus_file = spy_train.call_args.kwargs["corpus_file"]
+    assert not os.path.exists(corpus_file)
+    assert "common" in word2vec.featurizer.wv
+    
+    
+def test_word2vec_train_method_when_streaming_mode_expected_exact_corpus_count_and_cache_removed(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    mocker
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.training_mode = "streaming"
+    configs.epochs = 2
+    corpus = get_dummy_corpus_for_word2vec_testing
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    spy_train = mocker.spy(Word2Vec, "train")
+    spy_iter = mocker.spy(TokenizedCorpusManager, "__iter__")
+    
+    word2vec.train(DataLazyManager(corpus))
+    
+    expected = Word2Vec(vector_size=8, min_count=1)
+    expected.build_vocab(corpus_iterable=[sent.split() for sent in corpus])
+    
+    tokenized_corpus = spy_train.call_args.kwargs["corpus_iterable"]
+    assert spy_train.call_args.kwargs["total_examples"] == len(corpus)
+    assert spy_iter.call_count == 2
+    assert word2vec.featurizer.corpus_count == len(corpus)
+    assert word2vec._corpus_total_words == 4 * len(corpus)
+    assert word2vec.featurizer.wv.index_to_key == expected.wv.index_to_key + ["<<UNK>>"]
+    assert not os.path.exists(tokenized_corpus.path)
+    
+    
+def test_word2vec_init_when_training_mode_is_unknown_expected_ValueError(
+    get_Word2VecFeaturizer_configs_for_testing
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.training_mode = "unknown"
+    
+    with pytest.raises(ValueError):
+        Word2VecFeaturizer(configs=configs)
+
+    
+def test_word2vec_train_method_when_streaming_mode_and_token_cache_is_set_expected_token_cache_kept(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    mocker,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.training_mode = "streaming"
+    token_cache = TokenizedCorpusManager.build(get_dummy_corpus_for_word2vec_testing, str(tmp_path))
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.set_token_cache(token_cache)
+    spy_build = mocker.spy(TokenizedCorpusManager, "build")
+    spy_train = mocker.spy(Word2Vec, "train")
+    
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    
+    assert spy_build.call_count == 0
+    assert spy_train.call_args.kwargs["corpus_iterable"] is token_cache
+    assert word2vec.featurizer.corpus_count == len(token_cache)
+    assert os.path.exists(token_cache.path)
+    
+    
+def test_word2vec_persist_and_load_vectors_methods_expected_memory_mapped_vectors(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.path_to_save_vectors = str(tmp_path)
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    word2vec.persist(model=False, vectors=True)
+    
+    path = str(tmp_path / "word2vec_vectors.kv")
+    wv = word2vec.load_vectors(path)
+    
+    assert os.path.exists(path + ".vectors.npy")
+    assert isinstance(wv.vectors, np.memmap)
+    assert not wv.vectors.flags.writeable
+    assert np.array_equal(wv["common"], word2vec.get_vector_by_key("common"))
+    assert not isinstance(word2vec.load_vectors(path, mmap=False).vectors, np.memmap)
+    
+    
+def test_word2vec_load_method_when_only_vectors_are_set_expected_lookups_from_memory_mapped_vectors(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.path_to_save_vectors = str(tmp_path)
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    word2vec.persist(model=False, vectors=True)
+    
+    configs.path_to_get_trained_vectors = str(tmp_path / "word2vec_vectors.kv")
+    loaded = Word2VecFeaturizer(configs=configs)
+    loaded.load()
+    
+    assert isinstance(loaded.get_word_vector_object().vectors, np.memmap)
+    assert np.array_equal(loaded.get_vector_by_key("common"), word2vec.get_vector_by_key("common"))
+    assert np.allclose(
+        loaded.embed_documents(["common word1"]), 
+        word2vec.embed_documents(["common word1"])
+    )
+    
+    
+def test_word2vec_load_method_when_trained_model_is_set_expected_memory_mapped_arrays_trained_in_memory(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    corpus = get_dummy_corpus_for_word2vec_testing
+    path = str(tmp_path / "word2vec_model.model")
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(corpus)
+    word2vec.featurizer.save(path, sep_limit=0)
+    
+    configs.path_to_get_trained_model = path
+    loaded = Word2VecFeaturizer(configs=configs)
+    loaded.load()
+    
+    assert isinstance(loaded.get_word_vector_object().vectors, np.memmap)
+    assert np.array_equal(loaded.get_vector_by_key("common"), word2vec.get_vector_by_key("common"))
+    
+    loaded.train(corpus)
+    
+    assert not isinstance(loaded.get_word_vector_object().vectors, np.memmap)
+    
+    
+def test_word2vec_nearest_method_when_all_lists_are_probed_expected_same_as_most_similar(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.index_n_lists = 2
+    configs.index_n_probe = 2
+    configs.path_to_save_vectors = str(tmp_path)
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    wv = word2vec.get_word_vector_object()
+    
+    neighbours = word2vec.nearest(["common", "word1"], k=3)
+    
+    for key, key_neighbours in zip(["common", "word1"], neighbours):
+        expected = wv.most_similar(key, topn=3)
+        assert [word for word, _ in key_neighbours] == [word for word, _ in expected]
+        assert np.allclose([s for _, s in key_neighbours], [s for _, s in expected], atol=1e-5)
+    assert word2vec.nearest("common", k=3) == neighbours[0]
+    
+    word2vec.persist(model=False, vectors=True, index=True)
+    
+    loaded = Word2VecFeaturizer(configs=configs)
+    loaded.featurizer = word2vec.featurizer
+    loaded._path_to_get_vector_index = str(tmp_path / "word2vec_vectors.ann")
+    
+    assert isinstance(loaded.get_vector_index().vectors, np.memmap)
+    assert loaded.nearest("common", k=3) == neighbours[0]
+    
+    n_words = len(wv)
+    word2vec._update_stored_vocabulary = True
+    word2vec.train(get_dummy_corpus_for_word2vec_testing + ["new words here"])
+    
+    assert word2vec.vector_index is None
+    assert "here" in dict(word2vec.nearest("new", k=20))
+    
+    loaded.vector_index = None
+    assert len(loaded.get_vector_index()) == n_words + 3
+    assert not isinstance(loaded.get_vector_index().vectors, np.memmap)
+    
+    
+def test_word2vec_persist_method_when_index_is_not_requested_expected_no_index_built(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path,
+    mocker
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.path_to_save_vectors = str(tmp_path)
+    spy_build = mocker.spy(IVFVectorIndex, "build")
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    word2vec.persist(model=False, vectors=True)
+    
+    assert spy_build.call_count == 0
+    assert os.path.exists(str(tmp_path / "word2vec_vectors.kv"))
+    assert not os.path.exists(str(tmp_path / "word2vec_vectors.ann"))
+    
+    
+def test_get_vector_index_method_when_stored_index_has_same_shape_but_other_vectors_expected_rebuilt_index(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.path_to_save_vectors = str(tmp_path)
+    configs.persist_vector_index = True
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    word2vec.persist(model=False, vectors=True)
+    
+    loaded = Word2VecFeaturizer(configs=configs)
+    loaded.featurizer = word2vec.featurizer
+    loaded._path_to_get_vector_index = str(tmp_path / "word2vec_vectors.ann")
+    assert isinstance(loaded.get_vector_index().vectors, np.memmap)
+    
+    word2vec.featurizer.wv.vectors = word2vec.featurizer.wv.vectors[::-1].copy()
+    loaded.vector_index = None
+    
+    assert not isinstance(loaded.get_vector_index().vectors, np.memmap)
+    assert loaded.vector_index.fingerprint == IVFVectorIndex.fingerprint_vectors(
+        word2vec.featurizer.wv.vectors
+    )
+    
+    
+def test_get_vector_index_method_when_vectors_and_index_are_loaded_expected_stored_fingerprint_not_hashed_again(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    tmp_path,
+    mocker
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.path_to_save_vectors = str(tmp_path)
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    word2vec.persist(model=False, vectors=True, index=True)
+    
+    configs.path_to_get_trained_vectors = str(tmp_path / "word2vec_vectors.kv")
+    configs.path_to_get_vector_index = str(tmp_path / "word2vec_vectors.ann")
+    spy_fingerprint = mocker.spy(IVFVectorIndex, "fingerprint_vectors")
+    
+    loaded = Word2VecFeaturizer(configs=configs)
+    loaded.load()
+    
+    assert isinstance(loaded.get_vector_index().vectors, np.memmap)
+    assert loaded.nearest("common", k=3) == word2vec.nearest("common", k=3)
+    assert spy_fingerprint.call_count == 0
+    
+    
+def test_word2vec_nearest_method_when_featurizer_is_None_expected_warning_and_None(
+    get_Word2VecFeaturizer_configs_for_testing,
+    caplog
+):
+    word2vec = Word2VecFeaturizer(configs=get_Word2VecFeaturizer_configs_for_testing)
+    
+    assert word2vec.nearest("common") is None
+    assert "no trained model" in caplog.text
+    
+    
+def test_word2vec_embed_documents_method_when_featurizer_is_None_expected_warning_and_None(
+    get_Word2VecFeaturizer_configs_for_testing,
+    caplog
+):
+    word2vec = Word2VecFeaturizer(configs=get_Word2VecFeaturizer_configs_for_testing)
+    
+    assert word2vec.embed_documents(["common word1"]) is None
+    assert "no trained model" in caplog.text
+    
+    
+@pytest.mark.parametrize("pooling", ["mean", "sum", "tfidf"])
+def test_word2vec_embed_documents_method_expected_pooled_token_vectors(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    pooling
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.chunk_size = 2
+    corpus = get_dummy_corpus_for_word2vec_testing
+    docs = ["common word1 common", "unknown word2", "", "unknown", "word3"]
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(corpus)
+    wv = word2vec.get_word_vector_object()
+    idf = word2vec.fit_idf(corpus + docs)
+    
+    expected = []
+    for doc in docs:
+        tokens = [token if token in wv else configs.unk_token for token in doc.split()]
+        weights = [
+            idf[wv.key_to_index[token]] if pooling == "tfidf" else 1.0 
+            for token in tokens
+        ]
+        vector = np.zeros(wv.vector_size)
+        for token, weight in zip(tokens, weights):
+            vector += weight * wv[token]
+        if pooling != "sum" and tokens:
+            vector /= sum(weights)
+        expected.append(vector)
+    
+    embeddings = word2vec.embed_documents(docs, pooling=pooling)
+    chunks = list(word2vec.embed_documents(DataLazyManager(docs), pooling=pooling, lazy=True))
+    
+    assert embeddings.shape == (len(docs), wv.vector_size)
+    assert np.allclose(embeddings, expected, atol=1e-5)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert np.array_equal(np.concatenate(chunks), embeddings)
+    
+    
+@pytest.mark.parametrize("training_mode", ["corpus_file", "streaming"])
+def test_word2vec_train_method_when_unk_token_is_not_in_corpus_expected_unk_vector_as_mean_vector(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    training_mode
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.training_mode = training_mode
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    wv = word2vec.get_word_vector_object()
+    known = [key for key in wv.index_to_key if key != configs.unk_token]
+    
+    embeddings = word2vec.embed_documents(["unknown", "common unknown"])
+    
+    assert np.allclose(wv[configs.unk_token], wv[known].mean(axis=0), atol=1e-6)
+    assert np.allclose(embeddings[0], wv[configs.unk_token])
+    assert np.allclose(embeddings[1], (wv["common"] + wv[configs.unk_token]) / 2)
+    
+    
+@pytest.mark.parametrize("pooling", ["mean", "tfidf"])
+def test_word2vec_aprocess_method_when_executor_is_a_process_pool_expected_same_embeddings_and_spilled_vectors_removed(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing,
+    pooling
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.pooling = pooling
+    docs = ["common word1 common", "unknown word2", ""]
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        word2vec.set_executor(executor)
+        embeddings = asyncio.run(word2vec.aprocess(docs))
+    
+    spilled_vectors_dir = word2vec._spilled_vectors_dir
+    assert np.allclose(embeddings, word2vec.embed_documents(docs), atol=1e-6)
+    
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    
+    assert not os.path.exists(spilled_vectors_dir)
+    
+    
+def test_word2vec_embed_documents_method_when_unk_token_was_learned_expected_unk_vector(
+    get_Word2VecFeaturizer_configs_for_testing,
+    get_dummy_corpus_for_word2vec_testing
+):
+    configs = get_Word2VecFeaturizer_configs_for_testing
+    configs.training_mode = "vocabulary"
+    
+    word2vec = Word2VecFeaturizer(configs=configs)
+    word2vec.train(get_dummy_corpus_for_word2vec_testing)
+    wv = word2vec.get_word_vector_object()
+    
+    embeddings = word2vec.embed_documents(["unknown", "common unknown"])
+    
+    assert np.allclose(embeddings[0], wv[configs.unk_token])
+    assert np.allclose(embeddings[1], (wv["common"] + wv[configs.unk_token]) / 2)
+    with pytest.raises(ValueError):
+        word2vec.embed_documents(["common"], pooling="max", lazy=True)
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+
+from pypipe.core.processes.featurization.indexes import IVFVectorIndex
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_dummy_vectors_for_testing() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(8, 16))
+    return np.repeat(centers, 50, axis=0) + rng.normal(scale=0.1, size=(400, 16))
+
+
+def brute_force_search(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ vectors.T), axis=1, kind="stable")[:, :k]
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+def test_search_method_when_all_lists_are_probed_expected_exact_neighbours(
+    get_dummy_vectors_for_testing
+):
+    vectors = get_dummy_vectors_for_testing
+    index = IVFVectorIndex.build(vectors, n_lists=8, n_probe=8)
+
+    rows, scores = index.search(vectors[:20], k=5)
+
+    assert len(index) == len(vectors)
+    assert sorted(index.ids.tolist()) == list(range(len(vectors)))
+    assert (rows == brute_force_search(vectors, vectors[:20], k=5)).all()
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_search_method_when_one_list_is_probed_expected_high_recall(
+    get_dummy_vectors_for_testing
+):
+    vectors = get_dummy_vectors_for_testing
+    index = IVFVectorIndex.build(vectors, n_lists=8, n_probe=1)
+
+    rows, _ = index.search(vectors, k=10)
+    expected = brute_force_search(vectors, vectors, k=10)
+
+    recall = np.mean([len(set(r) & set(e)) / 10 for r, e in zip(rows, expected)])
+    assert recall > 0.9
+    assert IVFVectorIndex.build(vectors).n_lists == int(4 * np.sqrt(len(vectors)))
+
+
+def test_search_method_when_k_exceeds_candidates_expected_padded_rows():
+    index = IVFVectorIndex.build(np.eye(3), n_lists=1)
+
+    rows, scores = index.search(np.eye(3)[:1], k=5)
+
+    assert rows[0].tolist()[:3] == [0, 1, 2] and rows[0].tolist()[3:] == [-1, -1]
+    assert np.isneginf(scores[0, 3:]).all()
+
+
+def test_save_and_load_methods_expected_memory_mapped_index(
+    get_dummy_vectors_for_testing,
+    tmp_path
+):
+    vectors = get_dummy_vectors_for_testing
+    index = IVFVectorIndex.build(vectors, n_lists=8, n_probe=3)
+
+    index.save(str(tmp_path / "index"))
+    loaded = IVFVectorIndex.load(str(tmp_path / "index"), n_probe=3)
+
+    assert isinstance(loaded.vectors, np.memmap)
+    for expected, result in zip(index.search(vectors[:10], 4), loaded.search(vectors[:10], 4)):
+        assert np.array_equal(expected, result)
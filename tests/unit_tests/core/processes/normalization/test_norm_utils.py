@@ -0,0 +1,105 @@
+from functools import reduce
+from typing import List
+
+import pytest
+
+from pypipe.core.processes.normalization import norm_utils
+from pypipe.core.processes.normalization.norm_utils import RegexNormalizationPlan
+from pypipe.core.processes.normalization.normalizers import RegexNormalizer
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_dummy_sentences_for_testing() -> List[str]:
+    return [
+        "HOLA!!1111 gente lindaaaaa!!!",
+        "el nombre essssss @Pedro re loco jjajajajjja",
+        "mi correo es pedrito@gmail.com",
+        "su página es www.pedrito.com ....",
+        "heheejajaja q kiero ir http://a@b.com #tema",
+        "ÁRBOL canción  sbl x 2023 jijiji jojojo jujuju",
+        "",
+    ]
+
+
+@pytest.fixture
+def get_compile_handlers_from_default_configs_for_testing() -> List:
+    regex_norm = RegexNormalizer.get_isolated_process(
+        RegexNormalizer.get_default_configs()
+    )
+    regex_norm._compile_regex_handlers()
+    return regex_norm.compile_handlers
+
+
+def apply_handlers_sequentially(text: str, compile_handlers: List) -> str:
+    return reduce(
+        lambda text, spec: spec[0](text=text, repl=spec[1]),
+        compile_handlers,
+        text
+    )
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+################## RegexNormalizationPlan ##################
+
+
+def test_RegexNormalizationPlan_when_default_handlers_are_given_expected_same_output_as_sequential_handlers(
+    get_dummy_sentences_for_testing,
+    get_compile_handlers_from_default_configs_for_testing
+):
+    compile_handlers = get_compile_handlers_from_default_configs_for_testing
+    
+    plan = RegexNormalizationPlan(compile_handlers)
+    
+    for sent in get_dummy_sentences_for_testing:
+        assert plan(sent) == apply_handlers_sequentially(sent, compile_handlers)
+
+
+def test_RegexNormalizationPlan_when_disjoint_char_class_handlers_are_adjacent_expected_single_fused_pass(
+    get_dummy_sentences_for_testing
+):
+    compile_handlers = [
+        (norm_utils.whitespaces_handler, " "),
+        (norm_utils.digit_handler, "NUM"),
+        (norm_utils.punctuaction_handler, "")
+    ]
+    
+    plan = RegexNormalizationPlan(compile_handlers)
+    
+    assert len(plan) == 1
+    for sent in get_dummy_sentences_for_testing + ["1!2 3.,4  5"]:
+        assert plan(sent) == apply_handlers_sequentially(sent, compile_handlers)
+
+
+def test_RegexNormalizationPlan_when_deletion_can_join_replaced_runs_expected_handlers_not_fused():
+    compile_handlers = [
+        (norm_utils.punctuaction_handler, ""),
+        (norm_utils.digit_handler, "<<NUM>>")
+    ]
+    
+    plan = RegexNormalizationPlan(compile_handlers)
+    
+    assert len(plan) == 2
+    assert plan("1!2") == "<<NUM>>"
+
+
+def test_RegexNormalizationPlan_when_custom_handler_is_given_expected_handler_called_in_order():
+    compile_handlers = [
+        (norm_utils.digit_handler, ""),
+        (lambda text, repl: text.replace("a", repl), "o"),
+        (norm_utils.laught_handler, None)
+    ]
+    
+    plan = RegexNormalizationPlan(compile_handlers)
+    
+    assert plan("jajaja 123 casa") == apply_handlers_sequentially(
+        "jajaja 123 casa", compile_handlers
+    )
@@ -0,0 +1,183 @@
+import os
+import asyncio
+import tempfile
+from typing import List
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from omegaconf import DictConfig
+
+from pypipe.core.management.managers import DataLazyManager
+from pypipe.core.processes.normalization.normalizers import RegexNormalizer
+
+
+############################################################################
+############################# Fixtures #####################################
+############################################################################
+
+
+@pytest.fixture
+def get_dummy_corpus_for_testing() -> List[str]:
+    return [
+        "HOLA!!1111 gente lindaaaaa!!!",
+        "el nombre essssss @Pedro re loco jjajajajjja",
+        "mi correo es pedrito@gmail.com",
+        "su página es www.pedrito.com ....",
+    ] * 25
+
+
+@pytest.fixture
+def get_OmegaConf_instance_for_test_RegexNormalizer() -> DictConfig:
+    config = RegexNormalizer.get_default_configs()
+    config.chunk_size = 7
+    return config
+
+
+@pytest.fixture
+def get_RegexNormalizer_instance_for_testing(
+    get_OmegaConf_instance_for_test_RegexNormalizer
+) -> RegexNormalizer:
+    config = get_OmegaConf_instance_for_test_RegexNormalizer
+    return RegexNormalizer.get_isolated_process(configs=config)
+
+
+############################################################################
+################################ Tests #####################################
+############################################################################
+
+
+################## RegexNormalizer ##################
+
+
+def test_normalize_text_method_when_list_and_workers_are_given_expected_same_list_as_serial_normalization(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    assert regex_norm.normalize_text(corpus, workers=2) == expected
+    
+
+def test_normalize_text_method_when_DataLazyManager_and_workers_are_given_expected_same_order_as_serial_normalization(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    norm_data = regex_norm.normalize_text(DataLazyManager(corpus), workers=2)
+    
+    assert isinstance(norm_data, DataLazyManager)
+    assert list(norm_data) == expected
+    
+
+def test_normalize_text_method_when_persist_and_workers_are_given_expected_normcorpus_file_in_original_order(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        regex_norm._path_to_save_normcorpus = tmp_dir
+        
+        norm_data = list(
+            regex_norm.normalize_text(DataLazyManager(corpus), persist=True, workers=2)
+        )
+        
+        with open(os.path.join(tmp_dir, "normcorpus.txt")) as f:
+            assert f.read().split("\n")[:-1] == expected == norm_data
+
+
+def test_normalize_text_method_when_cache_size_is_given_expected_duplicates_counted_as_cache_hits(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    regex_norm._cache_size = 2
+    corpus = get_dummy_corpus_for_testing
+    
+    norm_data = regex_norm.normalize_text(corpus[:8])
+    
+    assert norm_data[:4] == norm_data[4:]
+    assert regex_norm.cache_misses == 8
+    assert regex_norm.cache_hits == 0
+    
+    regex_norm._plan = None
+    regex_norm._cache_size = 4
+    
+    regex_norm.normalize_text(corpus[:8])
+    
+    assert regex_norm.cache_misses == 4
+    assert regex_norm.cache_hits == 4
+    
+
+def test_normalize_text_method_when_cache_size_and_workers_are_given_expected_worker_cache_counters(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    regex_norm._cache_size = 4
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    assert regex_norm.normalize_text(corpus, workers=2) == expected
+    assert regex_norm.cache_hits + regex_norm.cache_misses == 2 * len(corpus)
+    
+    
+def test_cache_hits_and_cache_misses_properties_when_cache_size_is_0_expected_0(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    
+    regex_norm.normalize_text(get_dummy_corpus_for_testing)
+    
+    assert regex_norm.cache_hits == 0
+    assert regex_norm.cache_misses == 0
+
+
+def test_normalize_batches_method_when_batches_are_given_expected_same_texts_as_normalize_text(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    batches = DataLazyManager(corpus).iter_batches(batch_size=9)
+    norm_batches = list(regex_norm.normalize_batches(batches))
+    
+    assert [len(batch) for batch in norm_batches][:-1] == [9] * (len(norm_batches) - 1)
+    assert sum(norm_batches, []) == expected
+    
+    
+def test_anormalize_method_when_executor_is_a_process_pool_expected_same_texts_as_normalize_text(
+    get_RegexNormalizer_instance_for_testing,
+    get_dummy_corpus_for_testing
+):
+    regex_norm = get_RegexNormalizer_instance_for_testing
+    corpus = get_dummy_corpus_for_testing
+    
+    expected = regex_norm.normalize_text(corpus)
+    
+    async def normalize_concurrently():
+        return await asyncio.gather(
+            regex_norm.anormalize(corpus[:10]), 
+            regex_norm.anormalize(corpus[10:])
+        )
+    
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        regex_norm.set_executor(executor)
+        norm_data = asyncio.run(normalize_concurrently())
+    
+    assert sum(norm_data, []) == expected